@@ -0,0 +1,66 @@
+"""
+SPI traffic for a scripted display session, measured on the emulated ST7789.
+
+Run with `python benchmarks/bench_display_bus.py [snapshot_dir]`. Frames are
+rendered back to back (no frame pacing), so fps is the render-side ceiling
+(including the emulator's own decoding), and the bus time assumes the board's
+100 MHz SPI clock. If a directory is given, the
+final frame of each run is saved there as PNG.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from whisplay_chatbot.hardware.display import DisplayController, DisplayState  # noqa: E402
+from whisplay_chatbot.hardware.st7789 import EmulatedBoard  # noqa: E402
+
+SPI_HZ = 100_000_000
+ANSWER = " ".join(
+    f"Sentence {i} of a longer spoken answer, wrapped and scrolled on the panel." for i in range(20)
+)
+
+
+def session(label: str, snapshot_dir: Path | None, **options) -> None:
+    board = EmulatedBoard()
+    controller = DisplayController(board, **options)
+    state = DisplayState()
+    started = time.perf_counter()
+    for status, emoji in (("idle", "😴"), ("listening", "👂"), ("thinking", "🤔")):
+        state = replace(state, status=status, emoji=emoji)
+        controller._render_frame(state)
+    state = replace(state, status="answering", emoji="💬", text=ANSWER, scroll_speed=2)
+    frames = 3
+    controller._render_frame(state)
+    frames += 1
+    while controller.animating:
+        controller._render_frame(state)
+        frames += 1
+    elapsed = time.perf_counter() - started
+
+    stats = board.stats()
+    print(
+        f"{label:<22} {frames} frames: {stats.bytes / 1024:8.1f} KiB "
+        f"({stats.bytes / frames / 1024:5.1f} KiB/frame), {stats.transactions} transactions, "
+        f"bus {stats.bytes * 8 / SPI_HZ * 1000:6.1f} ms, render {frames / elapsed:5.0f} fps"
+    )
+    if snapshot_dir is not None:
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        board.save_snapshot(snapshot_dir / f"{label.replace(' ', '-')}.png")
+
+
+def main() -> None:
+    snapshot_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+    session("redraw", snapshot_dir)
+    session("redraw rgb444", snapshot_dir, pixel_format="rgb444")
+    session("hardware scroll", snapshot_dir, hardware_scroll=True)
+    session("hardware scroll rgb444", snapshot_dir, hardware_scroll=True, pixel_format="rgb444")
+
+
+if __name__ == "__main__":
+    main()
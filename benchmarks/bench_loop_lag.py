@@ -0,0 +1,87 @@
+"""
+Event-loop lag while the answer text scrolls: inline rendering vs the render thread.
+
+Run with `python benchmarks/bench_loop_lag.py`. The board stand-in blocks for the
+time the payload would take on a 62.5 MHz SPI clock, mirroring how spidev's
+writebytes2 blocks (with the GIL released) on the Pi.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from whisplay_chatbot.hardware.board import MockBoard  # noqa: E402
+from whisplay_chatbot.hardware.display import DisplayController  # noqa: E402
+
+SPI_BYTES_PER_SECOND = 62_500_000 / 8
+DURATION = 3.0
+PROBE_INTERVAL = 0.005
+LONG_TEXT = " ".join(["Scrolling text keeps the renderer busy 💬"] * 40)
+
+
+class SpiTimedBoard(MockBoard):
+    def draw_image(self, x, y, width, height, pixel_data) -> None:
+        time.sleep(memoryview(pixel_data).nbytes / SPI_BYTES_PER_SECOND)
+
+    def set_backlight(self, brightness: int) -> None:
+        pass
+
+
+async def probe_lag() -> list[float]:
+    loop = asyncio.get_running_loop()
+    samples: list[float] = []
+    end = loop.time() + DURATION
+    while loop.time() < end:
+        before = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append((loop.time() - before - PROBE_INTERVAL) * 1000)
+    return samples
+
+
+async def run_inline() -> list[float]:
+    controller = DisplayController(SpiTimedBoard(), logo_path=None)
+    controller.state = replace(controller.state, text=LONG_TEXT, scroll_speed=1)
+
+    async def render() -> None:
+        while True:
+            controller._render_frame(controller.state)
+            await asyncio.sleep(controller.frame_interval)
+
+    task = asyncio.create_task(render())
+    samples = await probe_lag()
+    task.cancel()
+    return samples
+
+
+async def run_worker() -> list[float]:
+    controller = DisplayController(SpiTimedBoard(), logo_path=None)
+    await controller.start()
+    await controller.update(text=LONG_TEXT, scroll_speed=1)
+    samples = await probe_lag()
+    await controller.stop()
+    return samples
+
+
+def report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95)]
+    print(
+        f"{label:<14} lag mean {statistics.mean(samples):6.2f} ms, "
+        f"p95 {p95:6.2f} ms, max {max(samples):6.2f} ms"
+    )
+
+
+def main() -> None:
+    report("inline render", asyncio.run(run_inline()))
+    report("render thread", asyncio.run(run_worker()))
+
+
+if __name__ == "__main__":
+    main()
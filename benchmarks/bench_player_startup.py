@@ -0,0 +1,69 @@
+"""
+Latency from "reply audio ready" to the player accepting it: spawn per reply vs warm player.
+
+Run with `python benchmarks/bench_player_startup.py [player command...]`. The
+default player is `cat` with its output discarded, which only measures
+fork/exec and pipe setup; pass the real `aplay` command line on the Pi to
+include opening the ALSA device. Neither run waits for real-time playback.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from whisplay_chatbot.hardware.player import PcmPlayer, chime_pcm  # noqa: E402
+
+ROUNDS = 20
+
+
+async def spawn_per_reply(cmd: list[str], clip: bytes) -> list[float]:
+    latencies = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.DEVNULL
+        )
+        process.stdin.write(clip[:4096])
+        await process.stdin.drain()
+        latencies.append(time.perf_counter() - started)
+        process.stdin.write(clip[4096:])
+        process.stdin.close()
+        await process.wait()
+    return latencies
+
+
+async def warm_player(cmd: list[str], clip: bytes) -> list[float]:
+    player = PcmPlayer(cmd)
+    await player.start()
+    latencies = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        await player.write(clip[:4096])
+        await player._queue.join()
+        latencies.append(time.perf_counter() - started)
+        await player.write(clip[4096:], continues=True)
+        await player._queue.join()
+    await player.stop()
+    return latencies
+
+
+def main() -> None:
+    cmd = sys.argv[1:] or ["cat"]
+    clip = chime_pcm(duration=1.0)
+    print(f"player: {' '.join(cmd)}, {ROUNDS} clips")
+    for label, run in (("spawn per reply", spawn_per_reply), ("warm player", warm_player)):
+        latencies = asyncio.run(run(cmd, clip))
+        print(
+            f"{label:<16} first chunk accepted after median "
+            f"{statistics.median(latencies) * 1000:6.2f} ms, max {max(latencies) * 1000:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
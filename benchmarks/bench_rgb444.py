@@ -0,0 +1,81 @@
+"""
+RGB565 vs packed RGB444 for the answer text area: bytes, encode time and fidelity.
+
+Run with `python benchmarks/bench_rgb444.py`. PSNR compares what the panel would
+show (RGB444 widened back to 565, then both expanded to 8 bits per channel) with
+the RGB565 frame; bus time assumes the board's 100 MHz SPI clock.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from whisplay_chatbot.config import FONT_PATH  # noqa: E402
+from whisplay_chatbot.ui_utils import ImageUtils, TextUtils  # noqa: E402
+
+SPI_HZ = 100_000_000
+ANSWER = (
+    "The quick brown fox jumps over the lazy dog. Pack my box with five dozen "
+    "liquor jugs! How vexingly quick daft zebras jump; sphinx of black quartz, "
+    "judge my vow. " * 3
+)
+
+
+def rgb565_to_rgb888(pixels: np.ndarray) -> np.ndarray:
+    pixels = pixels.astype(np.uint32)
+    return np.stack(
+        (
+            ((pixels >> 11) & 0x1F) * 255 // 31,
+            ((pixels >> 5) & 0x3F) * 255 // 63,
+            (pixels & 0x1F) * 255 // 31,
+        ),
+        axis=-1,
+    ).astype(np.float64)
+
+
+def psnr(reference: np.ndarray, candidate: np.ndarray) -> float:
+    mse = np.mean((rgb565_to_rgb888(reference) - rgb565_to_rgb888(candidate)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255**2 / mse)
+
+
+def bench(fn, region: np.ndarray, rounds: int = 200) -> tuple[float, int]:
+    size = memoryview(fn(region)).nbytes
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(region)
+    return (time.perf_counter() - start) / rounds * 1000, size
+
+
+def main() -> None:
+    text_utils = TextUtils(FONT_PATH, 20)
+    region = text_utils.render_strip(text_utils.layout_text(ANSWER, 216), 240, 182).viewport(0)
+    grey_levels = len(np.unique(region))
+
+    encoders = (
+        ("rgb565", ImageUtils.rgb565_array_to_pixel_data),
+        ("rgb444", ImageUtils.rgb565_array_to_rgb444_pixel_data),
+    )
+    print(f"text area 240x182, {grey_levels} distinct colours")
+    baseline = None
+    for label, encoder in encoders:
+        encode_ms, size = bench(encoder, region)
+        baseline = baseline or size
+        bus_ms = size * 8 / SPI_HZ * 1000
+        print(
+            f"{label}: {size:6d} bytes ({size / baseline:4.0%}), encode {encode_ms:5.3f} ms, "
+            f"bus {bus_ms:5.2f} ms"
+        )
+    shown = ImageUtils.rgb444_pixel_data_to_rgb565_array(
+        ImageUtils.rgb565_array_to_rgb444_pixel_data(region)
+    ).reshape(region.shape)
+    print(f"rgb444 PSNR vs rgb565: {psnr(region, shown):.1f} dB")
+
+
+if __name__ == "__main__":
+    main()
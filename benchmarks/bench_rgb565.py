@@ -0,0 +1,75 @@
+"""
+Per-frame RGB565 conversion + SPI hand-off cost, legacy list path vs buffer path.
+
+Run with `python benchmarks/bench_rgb565.py`. No hardware is needed: the SPI
+driver is replaced by a stand-in that copies each chunk into a C buffer the way
+spidev does before issuing the ioctl.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from whisplay_chatbot.ui_utils import ImageUtils  # noqa: E402
+
+SPI_BUFSIZ = 4096
+
+
+class FakeSpi:
+    def writebytes(self, chunk: list[int]) -> None:
+        bytes(chunk)
+
+    def writebytes2(self, data) -> None:
+        view = memoryview(data).cast("B")
+        for i in range(0, view.nbytes, SPI_BUFSIZ):
+            bytes(view[i : i + SPI_BUFSIZ])
+
+
+def legacy_frame(image: Image.Image, spi: FakeSpi) -> None:
+    np_img = np.array(image.convert("RGB"))
+    r = (np_img[:, :, 0] >> 3).astype(np.uint16)
+    g = (np_img[:, :, 1] >> 2).astype(np.uint16)
+    b = (np_img[:, :, 2] >> 3).astype(np.uint16)
+    rgb565 = (r << 11) | (g << 5) | b
+    high_byte = (rgb565 >> 8).astype(np.uint8)
+    low_byte = (rgb565 & 0xFF).astype(np.uint8)
+    data = np.dstack((high_byte, low_byte)).flatten().tolist()
+    for i in range(0, len(data), SPI_BUFSIZ):
+        spi.writebytes(data[i : i + SPI_BUFSIZ])
+
+
+def buffer_frame(image: Image.Image, spi: FakeSpi) -> None:
+    spi.writebytes2(ImageUtils.rgb565_array_to_pixel_data(ImageUtils.image_to_rgb565_array(image)))
+
+
+def bench(fn, image: Image.Image, rounds: int = 50) -> float:
+    spi = FakeSpi()
+    fn(image, spi)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(image, spi)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for label, size in (("header", (240, 98)), ("text area", (240, 182)), ("full", (240, 280))):
+        pixels = rng.integers(0, 256, size=(size[1], size[0], 3), dtype=np.uint8)
+        image = Image.fromarray(pixels, "RGB")
+        legacy = bench(legacy_frame, image)
+        current = bench(buffer_frame, image)
+        print(
+            f"{label:<10} {size[0]}x{size[1]}: legacy {legacy:6.2f} ms/frame, "
+            f"buffer {current:6.2f} ms/frame ({legacy / current:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
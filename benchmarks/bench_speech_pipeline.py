@@ -0,0 +1,146 @@
+"""
+Time to first audio, end of playback and peak buffered audio for a spoken reply.
+
+Run with `python benchmarks/bench_speech_pipeline.py`. The LLM, TTS and player
+are simulated with latencies in the range the cloud APIs show on a Pi over
+Wi-Fi, so the numbers reflect how the stages overlap rather than any one API.
+"Buffered" TTS hands over each clip once it is fully downloaded; "streamed"
+forwards it as it arrives.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from whisplay_chatbot.core.speech import SentenceSplitter, SpeechPipeline  # noqa: E402
+
+REPLY = (
+    "Great question! The first home console with swappable cartridges was the "
+    "Fairchild Channel F, released in 1976. It even had a pause button, which "
+    "was a big deal back then. Want another retro fact? 🎮"
+)
+LLM_FIRST_TOKEN_S = 0.6
+LLM_CHARS_PER_S = 120
+TTS_BASE_S = 0.35
+TTS_S_PER_CHAR = 0.004
+SPEECH_CHARS_PER_S = 15
+MP3_BYTES_PER_S = 6000  # 48 kbit/s
+CHUNK_BYTES = 4096
+
+
+class Meter:
+    """Audio bytes downloaded but not yet handed to the player."""
+
+    def __init__(self):
+        self.buffered = self.peak = 0
+
+    def add(self, count: int) -> None:
+        self.buffered += count
+        self.peak = max(self.peak, self.buffered)
+
+
+async def llm_deltas():
+    await asyncio.sleep(LLM_FIRST_TOKEN_S)
+    for i in range(0, len(REPLY), 4):
+        await asyncio.sleep(4 / LLM_CHARS_PER_S)
+        yield REPLY[i : i + 4]
+
+
+class Tts:
+    def __init__(self, meter: Meter, streamed: bool):
+        self.meter = meter
+        self.streamed = streamed
+
+    async def stream(self, text: str):
+        size = int(len(text) / SPEECH_CHARS_PER_S * MP3_BYTES_PER_S)
+        await asyncio.sleep(TTS_BASE_S)
+        chunks = -(-size // CHUNK_BYTES)
+        per_chunk_s = TTS_S_PER_CHAR * len(text) / chunks
+        if not self.streamed:
+            await asyncio.sleep(per_chunk_s * chunks)
+            self.meter.add(size)
+            yield bytes(size)
+            return
+        for start in range(0, size, CHUNK_BYTES):
+            await asyncio.sleep(per_chunk_s)
+            chunk = bytes(min(CHUNK_BYTES, size - start))
+            self.meter.add(len(chunk))
+            yield chunk
+
+
+class Player:
+    def __init__(self, started: float, meter: Meter):
+        self.started = started
+        self.meter = meter
+        self.first_audio = None
+
+    async def write(self, audio_bytes: bytes) -> None:
+        if self.first_audio is None:
+            self.first_audio = time.perf_counter() - self.started
+        self.meter.add(-len(audio_bytes))
+        # The pipe accepts a chunk once the player has room, i.e. at playback speed.
+        await asyncio.sleep(len(audio_bytes) / MP3_BYTES_PER_S)
+
+    async def close(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        pass
+
+
+class Audio:
+    def __init__(self, player: Player):
+        self.player = player
+
+    async def open_playback_stream(self) -> Player:
+        return self.player
+
+
+async def sequential(meter: Meter, streamed: bool) -> tuple[float, float]:
+    started = time.perf_counter()
+    player = Player(started, meter)
+    answer = "".join([delta async for delta in llm_deltas()])
+    async for chunk in Tts(meter, streamed).stream(answer):
+        await player.write(chunk)
+    return player.first_audio, time.perf_counter() - started
+
+
+async def pipelined(meter: Meter, streamed: bool) -> tuple[float, float]:
+    started = time.perf_counter()
+    player = Player(started, meter)
+    splitter = SentenceSplitter()
+    speech = SpeechPipeline(Tts(meter, streamed), Audio(player))
+    async for delta in llm_deltas():
+        for sentence in splitter.feed(delta):
+            speech.say(sentence)
+    rest = splitter.flush()
+    if rest:
+        speech.say(rest)
+    await speech.finish()
+    return player.first_audio, time.perf_counter() - started
+
+
+def main() -> None:
+    print(f"{len(REPLY)}-char reply")
+    runs = (
+        ("sequential buffered", lambda meter: sequential(meter, streamed=False)),
+        ("sequential streamed", lambda meter: sequential(meter, streamed=True)),
+        ("pipelined buffered", lambda meter: pipelined(meter, streamed=False)),
+        ("pipelined streamed", lambda meter: pipelined(meter, streamed=True)),
+    )
+    for label, run in runs:
+        meter = Meter()
+        first_audio, done = asyncio.run(run(meter))
+        print(
+            f"{label:<19} first audio {first_audio:5.2f} s, playback done {done:5.2f} s, "
+            f"peak buffered {meter.peak / 1024:5.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
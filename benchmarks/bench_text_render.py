@@ -0,0 +1,74 @@
+"""
+Text strip rendering cost, per-character PIL path vs glyph atlas blits.
+
+Run with `python benchmarks/bench_text_render.py`. "cold" rebuilds the renderer
+(empty caches) for every round; "warm" re-renders a different reply with every
+glyph already cached, which is the steady state while chatting.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from whisplay_chatbot.hardware.display import FONT_PATH  # noqa: E402
+from whisplay_chatbot.ui_utils import ImageUtils, TextLayout, TextUtils  # noqa: E402
+
+WIDTH, VIEWPORT, MARGIN = 240, 182, 12
+REPLY = (
+    "Sure! Here's a quick summary: the weather today is mild with light winds, "
+    "around 18 degrees in the afternoon. Bring a light jacket if you're heading "
+    "out this evening, since it cools down quickly after sunset. Anything else "
+    "you'd like to know about the week ahead?"
+)
+
+
+def pil_strip(text_utils: TextUtils, layout: TextLayout) -> np.ndarray:
+    loop_height = max(layout.total_height, VIEWPORT, 1)
+    canvas = Image.new("RGBA", (WIDTH, loop_height), (0, 0, 0, 255))
+    for index, line in enumerate(layout.lines):
+        if line:
+            line_image = text_utils.get_line_image(line)
+            canvas.paste(line_image, (MARGIN, index * layout.line_height), line_image)
+    content = ImageUtils.image_to_rgb565_array(canvas)
+    return np.concatenate((content, content[:VIEWPORT]))
+
+
+def atlas_strip(text_utils: TextUtils, layout: TextLayout) -> np.ndarray:
+    return text_utils.render_strip(layout, WIDTH, VIEWPORT, MARGIN).pixels
+
+
+def bench(fn, cold: bool, rounds: int = 20) -> float:
+    text_utils = TextUtils(FONT_PATH, 20)
+    fn(text_utils, text_utils.layout_text(REPLY, WIDTH - 2 * MARGIN))
+    total = 0.0
+    for i in range(rounds):
+        if cold:
+            text_utils = TextUtils(FONT_PATH, 20)
+        # A fresh string each round so per-line caches cannot serve the whole reply.
+        layout = text_utils.layout_text(f"{REPLY} #{i}", WIDTH - 2 * MARGIN)
+        start = time.perf_counter()
+        fn(text_utils, layout)
+        total += time.perf_counter() - start
+    return total / rounds * 1000
+
+
+def main() -> None:
+    print(f"{len(REPLY)}-char reply into a {WIDTH}px strip")
+    for label, cold in (("cold", True), ("warm", False)):
+        legacy = bench(pil_strip, cold)
+        current = bench(atlas_strip, cold)
+        print(
+            f"{label}: PIL {legacy:6.2f} ms/strip, glyph atlas {current:6.2f} ms/strip "
+            f"({legacy / current:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
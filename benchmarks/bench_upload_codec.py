@@ -0,0 +1,90 @@
+"""
+Upload size and encode cost of each speech codec.
+
+Run with `python benchmarks/bench_upload_codec.py [speech.wav]` (16 kHz mono
+16-bit). Without a file, a few seconds of synthetic voiced/unvoiced "speech"
+are used, which compresses differently from a real voice; record a sample
+with `arecord -f S16_LE -r 16000 -c 1 speech.wav` on the Pi for real numbers.
+CPU time is user+system time of this process and the encoder together, i.e.
+what the Pi spends per second of speech. Codecs whose encoder is not
+installed are skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import resource
+import shutil
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from whisplay_chatbot.hardware.capture import (  # noqa: E402
+    CAPTURE_BYTES_PER_SECOND,
+    CAPTURE_CHUNK_BYTES,
+)
+from whisplay_chatbot.services.upload_codec import CODECS, UPLOAD_RATE, encode_stream  # noqa: E402
+
+
+def synthetic_speech(seconds: float = 6.0) -> bytes:
+    """Alternating voiced (harmonic, wobbling pitch) and noisy syllables with short gaps."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * UPLOAD_RATE)) / UPLOAD_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / UPLOAD_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    noise = rng.standard_normal(t.size) * 0.3
+    syllable = (t * 4).astype(int) % 4
+    signal = np.where(syllable == 3, noise, voiced) * (syllable != 2)
+    signal += rng.standard_normal(t.size) * 0.005
+    return (signal / np.abs(signal).max() * 0.5 * 32767).astype("<i2").tobytes()
+
+
+def load_wav(path: Path) -> bytes:
+    with wave.open(str(path), "rb") as wav:
+        if (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) != (1, 2, UPLOAD_RATE):
+            raise SystemExit(f"{path} must be 16 kHz mono 16-bit")
+        return wav.readframes(wav.getnframes())
+
+
+async def encode(name: str, pcm: bytes) -> int:
+    async def chunks():
+        for offset in range(0, len(pcm), CAPTURE_CHUNK_BYTES):
+            yield pcm[offset : offset + CAPTURE_CHUNK_BYTES]
+
+    size = 0
+    async for chunk in encode_stream(CODECS[name], chunks()):
+        size += len(chunk)
+    return size
+
+
+def cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def main() -> None:
+    pcm = load_wav(Path(sys.argv[1])) if len(sys.argv) > 1 else synthetic_speech()
+    seconds = len(pcm) / CAPTURE_BYTES_PER_SECOND
+    print(f"{seconds:.1f} s of speech")
+    for name, codec in CODECS.items():
+        if codec.cmd is not None and shutil.which(codec.cmd[0]) is None:
+            print(f"{name:<5} skipped ({codec.cmd[0]} not installed)")
+            continue
+        cpu, started = cpu_seconds(), time.perf_counter()
+        size = asyncio.run(encode(name, pcm))
+        cpu, wall = cpu_seconds() - cpu, time.perf_counter() - started
+        print(
+            f"{name:<5} {size / seconds / 1024:6.1f} KiB per second of speech, "
+            f"CPU {cpu / seconds * 1000:6.1f} ms per second of speech, wall {wall * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import asyncio
+import shutil
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+from whisplay_chatbot.config import get_settings
+from whisplay_chatbot.hardware.capture import Recording
+from whisplay_chatbot.services import asr, get_async_openai_client, get_openai_client
+from whisplay_chatbot.services.upload_codec import CODECS, UploadCodec, encode_stream
+
+# A stand-in FLAC encoder that passes its input through as soon as it arrives.
+PASSTHROUGH = "import sys\nwhile data := sys.stdin.buffer.read1(4096):\n"
+PASSTHROUGH += "    sys.stdout.buffer.write(data)\n    sys.stdout.buffer.flush()"
+
+
+def test_transcribe_stream_uploads_audio_while_still_recording(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    for cached in (get_settings, get_openai_client, get_async_openai_client):
+        cached.cache_clear()
+
+    preroll, speech = b"\x01\x00" * 160, b"\x02\x00" * 160
+    recording = Recording(preroll, max_bytes=1 << 20)
+    seen = {}
+
+    class StandInApi(httpx.AsyncBaseTransport):
+        # Unlike httpx.MockTransport, reads the body as it is sent.
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            body = b""
+            async for part in request.stream:
+                body += part
+                if speech in body and "while_recording" not in seen:
+                    seen["while_recording"] = recording.active
+            seen["body"] = body
+            seen["headers"] = request.headers
+            return httpx.Response(200, text="hello there\n")
+
+    async def scenario():
+        transcriber = asr.OpenAITranscriber(transport=StandInApi())
+        transcriber.stream_codec = UploadCodec(
+            "flac", "speech.flac", "audio/flac", (sys.executable, "-c", PASSTHROUGH)
+        )
+        task = asyncio.create_task(transcriber.transcribe_stream(recording.stream()))
+        await asyncio.sleep(0.01)
+        recording.append(speech)
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if "while_recording" in seen:
+                break
+        recording.stop()
+        text = await task
+        await transcriber.aclose()
+        return text
+
+    assert asyncio.run(scenario()) == "hello there"
+    assert seen["while_recording"] is True
+    assert seen["headers"]["authorization"] == "Bearer sk-test"
+    body = seen["body"]
+    assert b'name="model"' in body and b'filename="speech.flac"' in body
+    assert b"Content-Type: audio/flac\r\n\r\n" + preroll + speech in body
+    assert body.endswith(b"--\r\n")
+
+
+def test_encoder_pipe_streams_pcm_through_external_command():
+    # A stand-in encoder that upper-cases its input.
+    script = "import sys; sys.stdout.buffer.write(sys.stdin.buffer.read().upper())"
+    codec = UploadCodec("opus", "speech.ogg", "audio/ogg", (sys.executable, "-c", script))
+
+    async def pcm():
+        yield b"abc"
+        yield b"def"
+
+    async def scenario():
+        return b"".join([chunk async for chunk in encode_stream(codec, pcm())])
+
+    assert asyncio.run(scenario()) == b"ABCDEF"
+
+
+def test_wav_and_missing_encoders_upload_after_release(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    get_settings.cache_clear()
+    assert not asr.OpenAITranscriber(upload_format="wav").can_stream
+    monkeypatch.setattr("shutil.which", lambda name: None)
+    assert not asr.OpenAITranscriber(upload_format="flac").can_stream
+    assert not asr.OpenAITranscriber(upload_format="opus").can_stream
+
+
+def test_streamed_flac_decodes_back_to_the_captured_pcm():
+    if shutil.which("flac") is None:
+        pytest.skip("flac is not installed")
+    pcm = bytes(range(256)) * 250
+
+    async def chunks():
+        for start in range(0, len(pcm), 3200):
+            yield pcm[start : start + 3200]
+
+    async def scenario():
+        return b"".join([chunk async for chunk in encode_stream(CODECS["flac"], chunks())])
+
+    stream = asyncio.run(scenario())
+    assert stream.startswith(b"fLaC")
+    decoded = subprocess.run(
+        ["flac", "--silent", "--decode", "--stdout", "--force-raw-format",
+         "--endian=little", "--sign=signed", "-"],
+        input=stream, capture_output=True, check=True,
+    ).stdout  # fmt: skip
+    assert decoded == pcm
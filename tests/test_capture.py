@@ -0,0 +1,35 @@
+from whisplay_chatbot.hardware.capture import (
+    CAPTURE_BYTES_PER_SECOND,
+    CAPTURE_CHUNK_BYTES,
+    PcmCapture,
+)
+
+
+def _chunk(value: int) -> bytes:
+    return bytes([value]) * CAPTURE_CHUNK_BYTES
+
+
+def test_recording_starts_with_bounded_preroll():
+    capture = PcmCapture(preroll_seconds=0.1)
+    preroll_chunks = capture.preroll_bytes // CAPTURE_CHUNK_BYTES
+    for value in range(20):
+        capture.feed(_chunk(value))
+    assert len(capture._ring) == capture.preroll_bytes
+
+    recording = capture.start_recording(max_seconds=5)
+    capture.feed(_chunk(100))
+    capture.feed(_chunk(101))
+    pcm = recording.stop()
+    capture.feed(_chunk(102))
+
+    expected = [*range(20 - preroll_chunks, 20), 100, 101]
+    assert pcm == b"".join(_chunk(value) for value in expected)
+    assert recording.preroll_bytes == capture.preroll_bytes
+
+
+def test_recording_is_capped_at_max_seconds():
+    capture = PcmCapture(preroll_seconds=0.1)
+    recording = capture.start_recording(max_seconds=0.5)
+    for _ in range(100):
+        capture.feed(_chunk(1))
+    assert len(recording.stop()) == CAPTURE_BYTES_PER_SECOND // 2
@@ -0,0 +1,43 @@
+import asyncio
+import threading
+
+from whisplay_chatbot.hardware.channel import LatestValueChannel
+
+
+def test_burst_of_updates_is_coalesced_to_latest():
+    channel: LatestValueChannel[int] = LatestValueChannel()
+    for value in range(5):
+        channel.publish(value)
+
+    assert channel.take() == 4
+    assert channel.take() is None
+    stats = channel.stats()
+    assert (stats.published, stats.delivered, stats.coalesced) == (5, 1, 4)
+
+
+def test_thread_wait_times_out_without_value():
+    channel: LatestValueChannel[str] = LatestValueChannel()
+    assert channel.wait(0.01) is False
+    channel.publish("ready")
+    assert channel.wait(0.01) is True
+
+
+def test_async_waiter_is_woken_from_another_thread():
+    channel: LatestValueChannel[str] = LatestValueChannel()
+
+    async def scenario() -> bool:
+        timer = threading.Timer(0.02, channel.publish, args=("listening",))
+        timer.start()
+        woke = await channel.wait_async(1.0)
+        timer.join()
+        return woke
+
+    assert asyncio.run(scenario()) is True
+    assert channel.take() == "listening"
+
+
+def test_close_releases_waiters():
+    channel: LatestValueChannel[int] = LatestValueChannel()
+    channel.close()
+    assert channel.wait(1.0) is True
+    assert asyncio.run(channel.wait_async(1.0)) is True
@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+
+from whisplay_chatbot.core.state_machine import ChatFlow
+
+
+class _Recorder:
+    """Async stand-in that logs every call as `<name>.<method>`."""
+
+    def __init__(self, name, calls):
+        self._name, self._calls = name, calls
+
+    def __getattr__(self, method):
+        async def call(*args, **kwargs):
+            self._calls.append(f"{self._name}.{method}")
+
+        return call
+
+
+def test_boot_logo_is_shown_before_canned_screens_load():
+    calls = []
+
+    class SlowDisplay(_Recorder):
+        async def load_screens(self, states):
+            calls.append("display.load_screens")
+            await self.release.wait()
+            calls.append("display.screens_loaded")
+
+    async def scenario():
+        display = SlowDisplay("display", calls)
+        display.release = asyncio.Event()
+        components = SimpleNamespace(
+            display=display,
+            led=_Recorder("led", calls),
+            controls=_Recorder("controls", calls),
+            audio=_Recorder("audio", calls),
+            transcriber=_Recorder("transcriber", calls),
+            persona_manager=SimpleNamespace(personas=[]),
+        )
+        flow = ChatFlow(components)
+        await asyncio.wait_for(flow.start(), timeout=1)
+        started = list(calls)
+        display.release.set()
+        await asyncio.sleep(0)
+        await flow.stop()
+        return started
+
+    started = asyncio.run(scenario())
+    assert started.index("display.start") < started.index("display.load_screens")
+    assert "display.screens_loaded" not in started
+    assert "audio.start" in started
+    assert "display.screens_loaded" in calls
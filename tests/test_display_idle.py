@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import time
+
+from whisplay_chatbot.hardware.board import MockBoard
+from whisplay_chatbot.hardware.display import DisplayController, FrameTimer
+
+
+def test_display_stops_rendering_once_scrolling_settles():
+    board = MockBoard()
+    controller = DisplayController(board, fps=200, logo_path=None)
+
+    async def wait_until_at_rest():
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if not controller.states.has_pending() and not controller.animating:
+                return
+        raise AssertionError("display never came to rest")
+
+    async def scenario():
+        await controller.start()
+        await controller.update(text="A short answer.", scroll_speed=60)
+        await wait_until_at_rest()
+        await asyncio.sleep(0.05)
+        frames, written = controller.stats().frames, board.bytes_written
+        await asyncio.sleep(0.2)
+        idle = controller.stats().frames - frames, board.bytes_written - written
+
+        await controller.update(status="Listening")
+        await wait_until_at_rest()
+        await asyncio.sleep(0.05)
+        woken = controller.stats().frames - frames
+        await controller.stop()
+        return frames, idle, woken
+
+    frames, idle, woken = asyncio.run(scenario())
+    # The text scrolled through its loop (182 rows at 60 per frame) before resting.
+    assert frames >= 4
+    assert idle == (0, 0)
+    # An update wakes the worker for its frame; static text does not restart scrolling.
+    assert woken == 1
+
+
+def test_frame_timer_reports_timed_frames():
+    timer = FrameTimer(window=1.0)
+    now = time.monotonic()
+    timer.record(now - 0.2, 0.010)
+    timer.record(now - 0.1, 0.020)
+    timer.record(now, 0.030)
+
+    stats = timer.snapshot()
+    assert stats.frames == 3
+    assert abs(stats.fps - 10.0) < 1e-6
+    assert abs(stats.mean_frame_ms - 20.0) < 1e-6
+    assert abs(stats.max_frame_ms - 30.0) < 1e-6
+
+    timer.restart_window()
+    idle = timer.snapshot()
+    assert (idle.frames, idle.fps, idle.max_frame_ms) == (3, 0.0, 0.0)
+
+
+def test_frame_timer_snapshots_while_another_thread_records():
+    timer = FrameTimer(window=0.001)
+
+    def render():
+        for _ in range(50_000):
+            timer.record(time.monotonic(), 0.001)
+
+    worker = threading.Thread(target=render)
+    worker.start()
+    while worker.is_alive():
+        timer.snapshot()
+    worker.join()
+    assert timer.snapshot().frames == 50_000
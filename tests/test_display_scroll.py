@@ -0,0 +1,54 @@
+from dataclasses import replace
+
+from whisplay_chatbot.hardware.board import MockBoard
+from whisplay_chatbot.hardware.display import DisplayController, DisplayState
+
+TEXT = " ".join(f"Line {i} of a long answer that keeps scrolling." for i in range(12))
+
+
+def test_hardware_scroll_matches_redrawn_frames_with_few_bytes():
+    scrolled_board, redrawn_board = MockBoard(), MockBoard()
+    scrolled = DisplayController(scrolled_board, hardware_scroll=True)
+    redrawn = DisplayController(redrawn_board)
+    state = DisplayState(text=TEXT, scroll_speed=7)
+    top = DisplayController.HEADER_HEIGHT
+
+    for controller in (scrolled, redrawn):
+        controller._render_frame(state)
+    for _ in range(60):
+        before = scrolled_board.bytes_written
+        scrolled._render_frame(state)
+        redrawn._render_frame(state)
+        assert (scrolled_board.screen() == redrawn_board.screen()).all()
+        assert scrolled_board.bytes_written - before <= 7 * 240 * 2
+
+    assert scrolled_board.scroll_area == (top, scrolled_board.LCD_HEIGHT - top)
+    assert scrolled_board.scroll_start != 0
+
+    # New text realigns the scroll region and is drawn through the framebuffer.
+    state = replace(state, text="Short reply.")
+    scrolled._scroll_offset = redrawn._scroll_offset = 0
+    scrolled._render_frame(state)
+    redrawn._render_frame(state)
+    assert scrolled_board.scroll_start == 0
+    assert (scrolled_board.screen() == redrawn_board.screen()).all()
+
+
+def test_typewriter_text_keeps_its_tail_in_view_then_scrolls():
+    controller = DisplayController(MockBoard())
+    text_area = controller.board.LCD_HEIGHT - DisplayController.HEADER_HEIGHT
+    state = DisplayState(text="", typewriter=True)
+    for end in range(20, len(TEXT), 20):
+        state = replace(state, text=TEXT[:end])
+        controller._accept_state(state)
+        controller._render_frame(state)
+        layout = controller._strip.layout
+        assert controller._scroll_offset == max(0, layout.total_height - text_area)
+        assert not controller.animating
+
+    state = replace(state, typewriter=False)
+    controller._accept_state(state)
+    tail = controller._scroll_offset
+    assert tail > 0 and controller.animating
+    controller._render_frame(state)
+    assert controller._scroll_offset == tail + state.scroll_speed
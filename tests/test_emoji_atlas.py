@@ -0,0 +1,55 @@
+from PIL import Image
+
+from whisplay_chatbot.emoji_atlas import (
+    ATLAS_INDEX_FILE,
+    EmojiAtlas,
+    emoji_key,
+    write_emoji_atlas,
+)
+
+GLYPHS = {
+    emoji_key("😀"): (255, 200, 0, 255),
+    emoji_key("❤"): (220, 20, 60, 128),
+}
+
+
+def _render(key, size):
+    if key == "broken":
+        raise ValueError("not an SVG")
+    return Image.new("RGBA", (size, size), GLYPHS[key])
+
+
+def test_atlas_round_trip(tmp_path):
+    nbytes = write_emoji_atlas([*GLYPHS, "broken"], _render, tmp_path, sizes=(4, 8))
+    assert nbytes == 2 * (4 * 4 + 8 * 8) * 4
+
+    atlas = EmojiAtlas.load(tmp_path)
+    assert atlas is not None and atlas.sizes == (4, 8)
+
+    smile = atlas.image("😀", 8)
+    assert smile.size == (8, 8)
+    assert smile.getpixel((3, 5)) == (255, 200, 0, 255)
+    # Stored without the variation selector; looked up with and without it.
+    assert atlas.image("❤️", 4).getpixel((0, 0)) == (220, 20, 60, 128)
+    # Sizes outside the atlas are scaled from the next larger one.
+    assert atlas.image("😀", 6).getpixel((2, 2)) == (255, 200, 0, 255)
+
+    assert atlas.lookup("🙃", 8) is None
+    assert atlas.image("🙃", 4) is None
+    assert atlas.lookup("😀", 16) is None and atlas.image("😀", 16) is not None
+
+
+def test_missing_atlas_loads_as_none(tmp_path):
+    assert EmojiAtlas.load(tmp_path) is None
+
+
+def test_rebuilt_atlas_with_new_pixels_changes_its_index(tmp_path):
+    write_emoji_atlas(list(GLYPHS), _render, tmp_path, sizes=(4,))
+    index = (tmp_path / ATLAS_INDEX_FILE).read_text()
+
+    def recoloured(key, size):
+        return Image.new("RGBA", (size, size), (0, 0, 255, 255))
+
+    write_emoji_atlas(list(GLYPHS), recoloured, tmp_path, sizes=(4,))
+    # Same glyphs at the same offsets: only the data digest tells the builds apart.
+    assert (tmp_path / ATLAS_INDEX_FILE).read_text() != index
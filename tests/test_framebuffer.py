@@ -0,0 +1,93 @@
+from dataclasses import replace
+
+import numpy as np
+
+from whisplay_chatbot.hardware.board import MockBoard
+from whisplay_chatbot.hardware.framebuffer import FrameBuffer, Rect
+
+
+class RecordingBoard(MockBoard):
+    def __init__(self):
+        super().__init__()
+        self.draws = []
+
+    def draw_image(self, x, y, width, height, pixel_data):
+        self.draws.append((Rect(x, y, width, height), len(pixel_data)))
+
+
+def test_unchanged_region_sends_nothing():
+    board = RecordingBoard()
+    fb = FrameBuffer(board.LCD_WIDTH, board.LCD_HEIGHT)
+    region = np.zeros((98, 240), dtype=np.uint16)
+    assert fb.flush(board, region, 0, 0) == []
+    assert board.draws == []
+
+
+def test_damage_is_trimmed_to_changed_pixels():
+    board = RecordingBoard()
+    fb = FrameBuffer(board.LCD_WIDTH, board.LCD_HEIGHT)
+    region = np.zeros((182, 240), dtype=np.uint16)
+    region[10:20, 30:50] = 0xFFFF
+    region[150:160, 0:5] = 0x07E0
+
+    rects = fb.flush(board, region, 0, 98)
+
+    assert rects == [Rect(30, 108, 20, 10), Rect(0, 248, 5, 10)]
+    assert [payload for _, payload in board.draws] == [20 * 10 * 2, 5 * 10 * 2]
+    assert fb.flush(board, region, 0, 98) == []
+
+
+def test_invalidate_forces_full_redraw():
+    board = RecordingBoard()
+    fb = FrameBuffer(board.LCD_WIDTH, board.LCD_HEIGHT)
+    region = np.zeros((98, 240), dtype=np.uint16)
+    fb.invalidate()
+    assert fb.flush(board, region, 0, 0) == [Rect(0, 0, 240, 98)]
+
+
+def test_fill_clears_only_rows_that_differ():
+    board = MockBoard()
+    fb = FrameBuffer(board.LCD_WIDTH, board.LCD_HEIGHT)
+    region = np.zeros((182, 240), dtype=np.uint16)
+    region[40:60, 10:200] = 0xFFFF
+    fb.flush(board, region, 0, 98)
+    sent = board.bytes_written
+
+    assert fb.fill(board, 0, 98, 240, 182) == [Rect(10, 138, 190, 20)]
+    assert board.bytes_written - sent == 190 * 20 * 2
+    assert not board.memory.any()
+    assert not fb.pixels.any()
+    assert fb.fill(board, 0, 98, 240, 182) == []
+
+
+def test_display_repaints_everything_after_a_failed_frame():
+    from whisplay_chatbot.hardware.display import DisplayController, DisplayState
+
+    class FlakyBoard(MockBoard):
+        fail_next = False
+
+        def draw_image(self, x, y, width, height, pixel_data, pixel_format="rgb565"):
+            super().draw_image(x, y, width, height, pixel_data, pixel_format)
+            if self.fail_next:
+                self.fail_next = False
+                raise OSError("SPI transfer failed")
+
+    board, reference = FlakyBoard(), MockBoard()
+    controller = DisplayController(board, logo_path=None)
+    expected = DisplayController(reference, logo_path=None)
+    first = DisplayState(status="Listening", text="First answer", scroll_speed=0)
+    second = replace(first, status="Answering", emoji="💬", text="A different answer")
+
+    controller._render_frame(first)
+    board.fail_next = True
+    try:
+        controller._render_frame(second)
+    except OSError:
+        controller._repaint_all()
+    else:
+        raise AssertionError("the frame should have failed")
+    board.memory[:] = 0x1234  # whatever the panel holds now, the mirror can't know
+    controller._render_frame(second)
+    expected._render_frame(second)
+
+    assert (board.screen() == reference.screen()).all()
@@ -0,0 +1,93 @@
+import asyncio
+import sys
+import types
+
+from whisplay_chatbot.hardware.led import LedAnimator, LedCurve, LedState, build_curve, build_fade
+
+
+class _RecordingBoard:
+    def __init__(self):
+        self.writes = []
+
+    def set_rgb(self, r, g, b):
+        self.writes.append((r, g, b))
+
+
+def test_curves_are_precomputed_tables():
+    solid = build_curve("solid", (10, 20, 30))
+    assert solid.frames == ((10, 20, 30),) and not solid.loop
+
+    pulse = build_curve("pulse", (200, 100, 0))
+    assert pulse.frames[0] == (40, 20, 0)  # starts at 20%
+    assert max(pulse.frames) == (200, 100, 0)
+    assert pulse.step == 0.05 and pulse.loop
+
+    breathing = build_curve("breathing", (255, 255, 255))
+    assert len(breathing.frames) == 150
+    assert breathing.frames[0] == (25, 25, 25)  # 10% floor
+    assert breathing.frames[75] == (255, 255, 255)
+    assert build_curve("breathing", (255, 255, 255)) is breathing
+
+    assert build_fade((0, 0, 0), (100, 50, 10), duration=0.08, step=0.02).frames == (
+        (25, 12, 2),
+        (50, 25, 5),
+        (75, 37, 7),
+        (100, 50, 10),
+    )
+
+
+def test_animator_plays_curve_on_schedule_and_skips_repeated_colours():
+    board = _RecordingBoard()
+    animator = LedAnimator(board)
+    curve = LedCurve(frames=((1, 1, 1), (1, 1, 1), (2, 2, 2), (2, 2, 2)), step=0.01, loop=False)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        interrupted = await animator._play(curve)
+        return interrupted, loop.time() - started
+
+    interrupted, elapsed = asyncio.run(scenario())
+    assert not interrupted
+    assert elapsed >= 0.035
+    assert board.writes == [(1, 1, 1), (2, 2, 2)]
+
+
+def test_new_state_interrupts_a_running_curve():
+    animator = LedAnimator(_RecordingBoard())
+    curve = LedCurve(frames=tuple((i, i, i) for i in range(100)), step=0.01)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.03, animator.states.publish, LedState((9, 9, 9)))
+        return await animator._play(curve)
+
+    assert asyncio.run(scenario()) is True
+    assert len(animator.board.writes) < 10
+
+
+def test_whisplay_board_skips_repeated_duty_cycles(monkeypatch):
+    # The real board module needs the Pi's GPIO/SPI modules only at import time.
+    rpi, gpio = types.ModuleType("RPi"), types.ModuleType("RPi.GPIO")
+    rpi.GPIO = gpio
+    monkeypatch.setitem(sys.modules, "RPi", rpi)
+    monkeypatch.setitem(sys.modules, "RPi.GPIO", gpio)
+    monkeypatch.setitem(sys.modules, "spidev", types.ModuleType("spidev"))
+    monkeypatch.delitem(sys.modules, "whisplay_chatbot.hardware._whisplay_impl", raising=False)
+    from whisplay_chatbot.hardware._whisplay_impl import WhisplayBoard
+
+    class _Pwm:
+        def __init__(self):
+            self.duties = []
+
+        def ChangeDutyCycle(self, duty):  # noqa: N802
+            self.duties.append(duty)
+
+    board = WhisplayBoard.__new__(WhisplayBoard)
+    board._duty_cycles = {}
+    board.red_pwm, board.green_pwm, board.blue_pwm = _Pwm(), _Pwm(), _Pwm()
+    for color in ((255, 0, 0), (255, 0, 0), (0, 0, 0), (0, 0, 0)):
+        board.set_rgb(*color)
+
+    assert board.red_pwm.duties == [0.0, 100.0]
+    assert board.green_pwm.duties == board.blue_pwm.duties == [100.0]
@@ -0,0 +1,94 @@
+import asyncio
+import wave
+
+from whisplay_chatbot.hardware.player import PCM_RATE, PcmPlayer, chime_pcm
+
+
+def test_simulated_player_writes_queued_clips_to_one_wav(tmp_path):
+    sink = tmp_path / "out.wav"
+    chime = chime_pcm()
+
+    async def scenario():
+        player = PcmPlayer(sink_path=sink)
+        await player.start()
+        await player.write(chime)
+        await player.write(b"\x01\x00" * 100)
+        await player.wait_idle()
+        stats = player.stats()
+        await player.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+    with wave.open(str(sink), "rb") as wav:
+        assert (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) == (PCM_RATE, 1, 2)
+        assert wav.readframes(wav.getnframes()) == chime + b"\x01\x00" * 100
+    assert stats.queued_chunks == 0
+    assert stats.seconds_played == (len(chime) + 200) / (2 * PCM_RATE)
+
+
+def test_player_counts_underruns_only_within_a_clip(tmp_path):
+    ten_ms = bytes(2 * PCM_RATE // 100)
+
+    async def scenario():
+        player = PcmPlayer(sink_path=tmp_path / "out.wav")
+        await player.write(ten_ms)
+        await player.wait_idle()
+        await asyncio.sleep(0.05)
+        await player.write(ten_ms)  # a new clip after a pause is fine
+        await player.wait_idle()
+        await asyncio.sleep(0.05)
+        await player.write(ten_ms, continues=True)  # the clip's next chunk came too late
+        await player.wait_idle()
+        stats = player.stats()
+        await player.stop()
+        return stats
+
+    assert asyncio.run(scenario()).underruns == 1
+
+
+def test_player_keeps_draining_when_a_restart_fails():
+    async def scenario():
+        player = PcmPlayer(["cat"], max_chunks=2)
+        await player.start()
+        await player.write(b"\x00\x00" * 10)
+        await player.wait_idle()
+
+        async def refuse():
+            raise PermissionError("no audio device")
+
+        player._spawn = refuse
+        player.flush()
+        for _ in range(5):
+            await asyncio.wait_for(player.write(b"\x00\x00" * 10), timeout=1)
+        await asyncio.wait_for(player.wait_idle(), timeout=1)
+        await player.stop()
+        return player.stats()
+
+    assert asyncio.run(scenario()).restarts >= 2
+
+
+def test_flush_drops_a_chunk_waiting_for_the_restart(tmp_path):
+    heard = tmp_path / "heard.raw"
+
+    class SlowStartPlayer(PcmPlayer):
+        async def _spawn(self):
+            await asyncio.sleep(0.05)
+            await super()._spawn()
+
+    async def scenario():
+        player = SlowStartPlayer(["sh", "-c", f"cat >> {heard}"])
+        await player.start()
+        player.flush()  # barge-in: the player restarts in the background
+        await player.write(b"stale" * 10)
+        await asyncio.sleep(0.01)  # the writer now waits on the restart with that chunk
+        player.flush()  # a second barge-in before the restart finished
+        await player.write(b"fresh" * 10)
+        await player.wait_idle()
+        for _ in range(100):
+            if heard.exists() and b"fresh" in heard.read_bytes():
+                break
+            await asyncio.sleep(0.01)
+        await player.stop()
+
+    asyncio.run(scenario())
+    assert heard.read_bytes() == b"fresh" * 10
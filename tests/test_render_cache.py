@@ -0,0 +1,26 @@
+import numpy as np
+
+from whisplay_chatbot.render_cache import BoundedCache
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    cache: BoundedCache[str, np.ndarray] = BoundedCache(max_bytes=3000)
+    for key in ("a", "b", "c"):
+        cache.put(key, np.zeros(1000, dtype=np.uint8))
+    assert cache.get("a") is not None
+
+    cache.put("d", np.zeros(1000, dtype=np.uint8))
+
+    assert "b" not in cache
+    assert {"a", "c", "d"} <= {key for key in ("a", "b", "c", "d") if key in cache}
+    stats = cache.stats()
+    assert stats.bytes == 3000
+    assert stats.evictions == 1
+    assert stats.hits == 1
+
+
+def test_oversized_values_are_not_stored():
+    cache: BoundedCache[str, bytes] = BoundedCache(max_bytes=10)
+    assert cache.get_or_create("big", lambda: b"x" * 64) == b"x" * 64
+    assert len(cache) == 0
+    assert cache.stats().misses == 1
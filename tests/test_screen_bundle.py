@@ -0,0 +1,70 @@
+import asyncio
+
+from whisplay_chatbot.hardware.display import DisplayController, DisplayState
+from whisplay_chatbot.hardware.st7789 import EmulatedBoard
+
+STATES = [
+    DisplayState(status="Listening", emoji="🎤", text="Hold the button and speak..."),
+    DisplayState(
+        status="Idle", text="Pro tip: short questions get snappier replies.", persona_name="Ally"
+    ),
+]
+
+
+def test_canned_screens_match_live_frames(tmp_path):
+    canned_board, live_board = EmulatedBoard(), EmulatedBoard()
+    canned = DisplayController(canned_board)
+    live = DisplayController(live_board)
+    bundle = canned.prepare_screens(STATES, tmp_path)
+    assert len(bundle) == len(STATES) + (canned.logo_image is not None)
+
+    for state in STATES:
+        for controller in (canned, live):
+            controller._accept_state(state)
+            controller._render_frame(state)
+        assert (canned_board.screen() == live_board.screen()).all()
+        # Scrolling continues from the canned frame like it does from a live one.
+        for controller in (canned, live):
+            controller._render_frame(state)
+        assert (canned_board.screen() == live_board.screen()).all()
+
+
+def test_screen_bundle_is_reused_until_inputs_change(tmp_path):
+    controller = DisplayController(EmulatedBoard())
+    controller.prepare_screens(STATES, tmp_path)
+    files = sorted(path.name for path in tmp_path.iterdir())
+    mtimes = [path.stat().st_mtime_ns for path in sorted(tmp_path.iterdir())]
+
+    reloaded = DisplayController(EmulatedBoard()).prepare_screens(STATES, tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == files
+    assert [path.stat().st_mtime_ns for path in sorted(tmp_path.iterdir())] == mtimes
+    assert reloaded.get(controller.screen_key(STATES[0])) is not None
+
+    extra = DisplayState(status="Complete", emoji="✅", text="Another round?")
+    grown = controller.prepare_screens([*STATES, extra], tmp_path)
+    assert controller.screen_key(extra) in grown
+
+
+def test_screens_build_in_the_background_while_the_display_runs(tmp_path):
+    alone = DisplayController(EmulatedBoard()).prepare_screens(STATES, tmp_path / "alone")
+    controller = DisplayController(EmulatedBoard(), fps=200, boot_duration=0)
+
+    async def scenario():
+        await controller.start()
+        building = asyncio.create_task(
+            asyncio.to_thread(controller.prepare_screens, STATES, tmp_path / "shared")
+        )
+        turn = 0
+        while not building.done():
+            turn += 1
+            await controller.update(text=f"Live answer number {turn} while screens build")
+            await asyncio.sleep(0.002)
+        bundle = await building
+        await controller.stop()
+        return bundle
+
+    bundle = asyncio.run(scenario())
+    assert controller.stats().frames > 0
+    for state in STATES:
+        key = controller.screen_key(state)
+        assert (bundle.get(key) == alone.get(key)).all()
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from whisplay_chatbot.core.speech import SentenceSplitter, SpeechPipeline
+
+
+def _split(deltas, **options):
+    splitter = SentenceSplitter(**options)
+    chunks = [chunk for delta in deltas for chunk in splitter.feed(delta)]
+    rest = splitter.flush()
+    return chunks + ([rest] if rest else [])
+
+
+def test_splitter_cuts_streamed_text_into_sentences():
+    text = "Hi! I'm your retro buddy. Pi is 3.14, roughly.\nWant a game fact? Sure thing"
+    deltas = [text[i : i + 3] for i in range(0, len(text), 3)]
+
+    assert _split(deltas) == [
+        "Hi! I'm your retro buddy.",
+        "Pi is 3.14, roughly.",
+        "Want a game fact?",
+        "Sure thing",
+    ]
+
+
+def test_splitter_falls_back_to_clauses_in_long_sentences():
+    text = "First of all, the weather is great today, " + "really " * 10 + "nice."
+    chunks = _split([text], clause_chars=40)
+
+    assert chunks[0] == "First of all, the weather is great today,"
+    assert " ".join(chunks) == text
+
+
+class _FakeTts:
+    def __init__(self):
+        self.active = self.peak = 0
+
+    async def stream(self, text):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            for char in text:
+                # Later sentences finish first, so ordering is up to the pipeline.
+                await asyncio.sleep(0.01 / len(text))
+                yield char.encode()
+        finally:
+            self.active -= 1
+
+
+class _FakeStream:
+    def __init__(self):
+        self.clips = []
+        self.closed = False
+
+    async def write(self, audio_bytes):
+        self.clips.append(audio_bytes)
+
+    async def close(self):
+        self.closed = True
+
+    def abort(self):
+        pass
+
+
+class _FakeAudio:
+    def __init__(self):
+        self.stream = _FakeStream()
+
+    async def open_playback_stream(self):
+        return self.stream
+
+
+def test_pipeline_plays_clips_in_order_with_bounded_synthesis():
+    tts, audio = _FakeTts(), _FakeAudio()
+
+    async def scenario():
+        speech = SpeechPipeline(tts, audio, max_concurrency=2, buffer_chunks=2)
+        for sentence in ("a", "bb", "ccc", "dddd", "eeeee"):
+            speech.say(sentence)
+        await speech.finish()
+
+    asyncio.run(scenario())
+    assert b"".join(audio.stream.clips) == b"abbcccddddeeeee"
+    assert audio.stream.closed
+    assert tts.peak == 2
+
+
+def test_pipeline_failure_surfaces_from_finish():
+    class _FailingTts(_FakeTts):
+        async def stream(self, text):
+            if text == "bad":
+                raise RuntimeError("voice unavailable")
+            async for chunk in super().stream(text):
+                yield chunk
+
+    audio = _FakeAudio()
+
+    async def scenario():
+        speech = SpeechPipeline(_FailingTts(), audio, buffer_chunks=1)
+        for sentence in ("good", "bad", "never played"):
+            speech.say(sentence)
+        await speech.finish()
+
+    with pytest.raises(RuntimeError, match="voice unavailable"):
+        asyncio.run(scenario())
+    assert b"".join(audio.stream.clips) == b"good"
+
+
+def test_pipeline_failure_leaves_no_synthesis_running():
+    class _FailingTts(_FakeTts):
+        async def stream(self, text):
+            if text == "bad":
+                raise RuntimeError("voice unavailable")
+            async for chunk in super().stream(text * 100):
+                yield chunk
+
+    tts = _FailingTts()
+
+    async def scenario():
+        speech = SpeechPipeline(tts, _FakeAudio(), buffer_chunks=4)
+        speech.say("bad")
+        speech.say("queued behind it")
+        await asyncio.sleep(0.05)
+        speech.say("after the failure")
+        with pytest.raises(RuntimeError, match="voice unavailable"):
+            await speech.finish()
+        await asyncio.sleep(0)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(scenario()) == []
+    assert tts.active == 0
+
+
+def test_pipeline_cancel_after_failure_does_not_raise():
+    class _FailingTts(_FakeTts):
+        async def stream(self, text):
+            raise RuntimeError("boom")
+            yield b""
+
+    async def scenario():
+        speech = SpeechPipeline(_FailingTts(), _FakeAudio())
+        speech.say("never played")
+        await asyncio.sleep(0.01)
+        await speech.cancel()
+
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+import asyncio
+
+import numpy as np
+
+from whisplay_chatbot.hardware.display import DisplayController, DisplayState
+from whisplay_chatbot.hardware.st7789 import EmulatedBoard
+from whisplay_chatbot.ui_utils import ImageUtils
+
+
+def test_emulated_board_decodes_windows_and_counts_traffic(tmp_path):
+    board = EmulatedBoard()
+    patch = np.arange(30 * 16, dtype=np.uint16).reshape(16, 30)
+    pixel_data = ImageUtils.rgb565_array_to_pixel_data(patch)
+    # Split mid-pixel, as a driver chunking the transfer would.
+    board.set_window(5, 7, 34, 22)
+    board._send_data(pixel_data[:101])
+    board._send_data(pixel_data[101:])
+
+    assert (board.screen()[7:23, 5:35] == patch).all()
+    stats = board.stats()
+    assert stats.data_bytes == patch.nbytes
+    assert stats.command_bytes == 3 + 8
+    assert stats.transactions == 7
+    assert stats.ram_writes == 1
+
+    snapshot = board.save_snapshot(tmp_path / "frame.png")
+    assert snapshot.exists()
+
+
+def test_display_controller_frames_match_framebuffer_with_hardware_scroll():
+    board = EmulatedBoard()
+    controller = DisplayController(board, hardware_scroll=True)
+    state = DisplayState(text=" ".join(["A scrolling answer."] * 40), scroll_speed=5)
+
+    controller._render_frame(state)
+    full_frame = board.stats().data_bytes
+    for _ in range(50):
+        controller._render_frame(state)
+
+    top = controller.HEADER_HEIGHT
+    strip = controller._strip
+    assert (board.screen()[:top] == controller.framebuffer.pixels[:top]).all()
+    assert (board.screen()[top:] == strip.viewport(controller._scroll_offset)).all()
+    assert board.stats().data_bytes - full_frame <= 50 * 5 * 240 * 2
+
+
+def test_madctl_mirrors_memory_and_scroll_registers_count_memory_rows():
+    board = EmulatedBoard()
+    assert board.emulator.madctl == 0xC0  # MY | MX
+    board.draw_image(0, 0, 1, 1, ImageUtils.rgb565_array_to_pixel_data(np.array([[0x1234]])))
+    assert board.emulator.memory[299, 239] == 0x1234
+    assert board.screen()[0, 0] == 0x1234
+
+    # Header fixed at the top of the glass is the bottom fixed area in frame memory.
+    board.define_scroll_area(98, 182)
+    assert board.emulator.scroll == (20, 182, 118)
+    board.set_scroll_start(5)
+    assert board.emulator.scroll_start == 20 + 182 - 5
+
+
+def test_hardware_scroll_keeps_header_still_while_text_moves():
+    board = EmulatedBoard()
+    controller = DisplayController(board, fps=100, hardware_scroll=True, logo_path=None)
+    top = controller.HEADER_HEIGHT
+
+    async def scenario():
+        await controller.start()
+        text = " ".join(f"Line {i} of an answer long enough to scroll." for i in range(20))
+        await controller.update(status="Answering", text=text, scroll_speed=3)
+        await asyncio.sleep(0.1)
+        frames = []
+        for _ in range(5):
+            await asyncio.sleep(0.05)
+            frames.append(board.screen().copy())
+        await controller.stop()
+        return frames
+
+    frames = asyncio.run(scenario())
+    assert board.emulator.scroll_start != board.emulator.scroll[0]
+    for frame in frames[1:]:
+        assert (frame[:top] == frames[0][:top]).all()
+        assert not (frame[top:] == frames[0][top:]).all()
+    assert (board.screen()[:top] == controller.framebuffer.pixels[:top]).all()
+
+
+def test_rgb444_text_frames_use_fewer_bytes_and_decode_on_the_panel():
+    full, reduced = EmulatedBoard(), EmulatedBoard()
+    state = DisplayState(text="Plain answer text without any emoji in it at all.")
+    DisplayController(full)._render_frame(state)
+    controller = DisplayController(reduced, pixel_format="rgb444")
+    controller._render_frame(state)
+
+    assert reduced.stats().data_bytes < full.stats().data_bytes
+    assert reduced.emulator.colmod == 0x03
+    expected = ImageUtils.rgb444_pixel_data_to_rgb565_array(
+        ImageUtils.rgb565_array_to_rgb444_pixel_data(full.screen())
+    ).reshape(full.screen().shape)
+    top = controller.HEADER_HEIGHT
+    assert (reduced.screen()[top:] == expected[top:]).all()
+    assert (reduced.screen()[:top] == full.screen()[:top]).all()
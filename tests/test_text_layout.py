@@ -0,0 +1,87 @@
+from whisplay_chatbot.config import FONT_PATH
+from whisplay_chatbot.ui_utils import TextUtils
+
+
+def _utils() -> TextUtils:
+    return TextUtils(font_path=FONT_PATH, font_size=20)
+
+
+def test_layout_breaks_on_word_boundaries():
+    utils = _utils()
+    text = "Pro tip: short questions get snappier replies from the bot."
+    layout = utils.layout_text(text, 120)
+
+    assert len(layout.lines) > 1
+    assert " ".join(layout.lines) == text
+    assert all(width <= 120 for width in layout.line_widths)
+    assert layout.total_height == len(layout.lines) * utils.get_line_height()
+
+
+def test_layout_splits_overlong_words_and_keeps_paragraphs():
+    utils = _utils()
+    layout = utils.layout_text("Supercalifragilistic\n\nok", 60)
+
+    assert "".join(layout.lines[:-2]) == "Supercalifragilistic"
+    assert layout.lines[-2:] == ("", "ok")
+
+
+def test_layout_is_cached_per_text_and_width():
+    utils = _utils()
+    first = utils.layout_text("Hello there", 200)
+    assert utils.layout_text("Hello there", 200) is first
+    assert utils.layout_text("Hello there", 50) is not first
+
+
+def test_strip_viewport_follows_scroll_offset():
+    utils = _utils()
+    layout = utils.layout_text(" ".join(f"word{i}" for i in range(80)), 200)
+    strip = utils.render_strip(layout, 240, 60)
+    line_height = layout.line_height
+
+    # Scrolled by three lines, the viewport starts with the fourth line as drawn alone.
+    third = utils.layout_text(layout.lines[3], 200)
+    alone = utils.render_strip(third, 240, 60).viewport(0)[:line_height]
+    assert (strip.viewport(3 * line_height)[:line_height] == alone).all()
+    # Past the end the text starts over.
+    assert (strip.viewport(layout.total_height + 10) == strip.viewport(10)).all()
+
+
+def test_strip_viewport_wraps_without_copying():
+    utils = _utils()
+    layout = utils.layout_text(" ".join(["scroll"] * 60), 200)
+    strip = utils.render_strip(layout, 240, 100)
+
+    assert strip.loop_height == layout.total_height
+    tail = strip.viewport(strip.loop_height - 10)
+    assert tail.shape == (100, 240)
+    assert tail.base is strip.pixels
+    assert (tail[10:] == strip.viewport(0)[:90]).all()
+
+
+def test_text_caches_stay_within_their_byte_budgets():
+    utils = TextUtils(
+        font_path=FONT_PATH, font_size=20, glyph_cache_bytes=4096, line_cache_bytes=64 * 1024
+    )
+    for i in range(40):
+        utils.get_line_image(f"line number {i} with some text")
+    utils.layout_text("abcdefghijklmnopqrstuvwxyz0123456789", 200)
+
+    stats = utils.cache_stats()
+    assert stats["lines"].bytes <= 64 * 1024
+    assert stats["lines"].evictions > 0
+    assert stats["glyphs"].bytes <= 4096
+    assert stats["glyphs"].hits > 0
+    assert stats["layouts"].entries == 1
+
+
+def test_growing_text_is_wrapped_incrementally_like_from_scratch():
+    utils = _utils()
+    text = "Streaming replies arrive a few words at a time.\nSupercalifragilistic!  ok " * 3
+    for end in range(1, len(text) + 1):
+        layout = utils.layout_text(text[:end], 150)
+        fresh = _utils().layout_text(text[:end], 150)
+        assert (layout.lines, layout.line_widths, layout.line_starts) == (
+            fresh.lines,
+            fresh.line_widths,
+            fresh.line_starts,
+        )
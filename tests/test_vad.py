@@ -0,0 +1,75 @@
+import asyncio
+
+import numpy as np
+
+from whisplay_chatbot.hardware.capture import CAPTURE_RATE
+from whisplay_chatbot.hardware.vad import VoiceActivityDetector
+
+rng = np.random.default_rng(0)
+
+
+def _noise(seconds: float, db: float) -> np.ndarray:
+    return rng.normal(0, 10 ** (db / 20), int(seconds * CAPTURE_RATE))
+
+
+def _voiced(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * CAPTURE_RATE)) / CAPTURE_RATE
+    return 0.2 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+
+
+def _pcm(*parts: np.ndarray) -> bytes:
+    return (np.clip(np.concatenate(parts), -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def _gated(vad: VoiceActivityDetector, pcm: bytes) -> bytes:
+    async def chunks():
+        # Irregular chunk sizes, unlike the 20 ms frames the detector works in.
+        start = 0
+        for size in [100, 640, 1000, 333, 4000] * 1000:
+            if start >= len(pcm):
+                return
+            yield pcm[start : start + size]
+            start += size
+
+    async def collect():
+        return b"".join([chunk async for chunk in vad.gate(chunks())])
+
+    return asyncio.run(collect())
+
+
+def test_room_noise_alone_is_not_speech():
+    vad = VoiceActivityDetector()
+    pcm = _pcm(_noise(2, -60))
+
+    assert vad.trim(pcm) is None
+    assert _gated(vad, pcm) == b""
+
+
+def test_silence_is_trimmed_around_speech_and_quiet_fricatives_kept():
+    vad = VoiceActivityDetector(pad_ms=200)
+    pcm = _pcm(
+        _noise(1, -60),
+        _voiced(1) + _noise(1, -60),
+        _noise(0.3, -60),
+        _noise(0.3, -35),  # an "s": quiet but with a high zero-crossing rate
+        _noise(1, -60),
+    )
+    speech = vad.trim(pcm)
+
+    # 200 ms lead-in + 1 s voiced + 0.3 s pause + 0.3 s fricative + 200 ms tail.
+    assert len(speech) / (2 * CAPTURE_RATE) == 2.0
+    assert _gated(vad, pcm) == speech
+
+
+def test_speech_at_the_very_start_is_kept_without_preroll():
+    # First press after capture starts: no pre-roll, the user is already talking.
+    t = np.arange(int(0.6 * CAPTURE_RATE)) / CAPTURE_RATE
+    steady = 0.2 * np.sin(2 * np.pi * 180 * t)
+    vad = VoiceActivityDetector(pad_ms=200)
+    pcm = _pcm(steady, _noise(0.3, -60), steady, _noise(1, -60))
+    speech = vad.trim(pcm)
+
+    # Both words from the first sample on, plus the 200 ms tail.
+    assert speech is not None and speech == pcm[: len(speech)]
+    assert len(speech) / (2 * CAPTURE_RATE) == 1.7
+    assert _gated(vad, pcm) == speech
@@ -44,6 +44,8 @@ FONT_PATH = _resolve_first_existing(FONT_CANDIDATES)
 LOGO_PATH = _resolve_first_existing(LOGO_CANDIDATES)
 DATA_DIR = PROJECT_ROOT / "data"
 LOG_DIR = DATA_DIR / "logs"
+EMOJI_ATLAS_DIR = DATA_DIR / "emoji_atlas"
+SCREEN_CACHE_DIR = DATA_DIR / "screens"
 
 
 class PersonaConfig(BaseModel):
@@ -68,6 +70,7 @@ class ChatbotSettings(BaseSettings):
     openai_api_key: str = Field(alias="OPENAI_API_KEY")
     openai_base_url: Optional[str] = Field(default=None, alias="OPENAI_BASE_URL")
     tts_voice: str = Field(default="alloy", alias="WHISPLAY_TTS_VOICE")
+    tts_max_concurrency: PositiveInt = Field(default=2, alias="WHISPLAY_TTS_CONCURRENCY")
     persona_mode: Literal["random", "rotate", "fixed"] = Field(
         default="random", alias="WHISPLAY_PERSONA_MODE"
     )
@@ -75,10 +78,19 @@ class ChatbotSettings(BaseSettings):
     max_record_seconds: PositiveInt = Field(
         default=12, alias="WHISPLAY_MAX_RECORD_SECONDS"
     )
+    record_preroll_ms: PositiveInt = Field(default=400, alias="WHISPLAY_RECORD_PREROLL_MS")
+    upload_format: Literal["wav", "flac", "opus"] = Field(
+        default="flac", alias="WHISPLAY_UPLOAD_FORMAT"
+    )
     idle_timeout_seconds: PositiveInt = Field(
         default=180, alias="WHISPLAY_IDLE_TIMEOUT_SECONDS"
     )
     enable_simulation: bool = Field(default=False, alias="WHISPLAY_ENABLE_SIMULATION")
+    display_fps: PositiveInt = Field(default=25, alias="WHISPLAY_DISPLAY_FPS")
+    display_hardware_scroll: bool = Field(default=False, alias="WHISPLAY_HARDWARE_SCROLL")
+    display_text_pixel_format: Literal["rgb565", "rgb444"] = Field(
+        default="rgb565", alias="WHISPLAY_TEXT_PIXEL_FORMAT"
+    )
     persona_config_path: Optional[Path] = Field(
         default=None, alias="WHISPLAY_PERSONAS_PATH"
     )
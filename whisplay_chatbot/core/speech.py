@@ -0,0 +1,176 @@
+"""
+Speak a reply while it is still being generated.
+
+The streamed reply is cut into sentences (or clauses, once a sentence runs
+long); each is synthesised as soon as it is complete and played in order
+through a single player stream, so the next sentence's synthesis overlaps the
+current one's playback. Audio is forwarded chunk by chunk as the TTS response
+arrives. Each clip buffers at most `buffer_chunks` chunks before its download
+waits for the player, and at most `max_concurrency` clips are in flight.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..hardware import AudioManager
+from ..hardware.audio import PlaybackStream
+from ..services import OpenAITts
+
+logger = logging.getLogger(__name__)
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets) followed
+# by whitespace, or a line break. Requiring whitespace keeps "3.5" and "v1.2" whole.
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s+|\n+")
+_CLAUSE_END = re.compile(r"[,;:—]\s+")
+
+
+class SentenceSplitter:
+    """Incrementally cut streamed text into speakable chunks."""
+
+    def __init__(self, min_chars: int = 12, clause_chars: int = 80):
+        # Chunks shorter than `min_chars` are joined with what follows ("Hi! I'm...")
+        # so TTS isn't asked for a fragment; past `clause_chars` a sentence is cut
+        # at its last clause break rather than waiting for the full stop.
+        self.min_chars = min_chars
+        self.clause_chars = clause_chars
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list[str]:
+        self._buffer += delta
+        chunks: list[str] = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if len(self._buffer[start : match.end()].strip()) >= self.min_chars:
+                chunks.append(self._buffer[start : match.end()].strip())
+                start = match.end()
+        rest = self._buffer[start:]
+        if len(rest) >= self.clause_chars:
+            cuts = list(_CLAUSE_END.finditer(rest))
+            if cuts and cuts[-1].end() >= self.min_chars:
+                chunks.append(rest[: cuts[-1].end()].strip())
+                start += cuts[-1].end()
+        self._buffer = self._buffer[start:]
+        return chunks
+
+    def flush(self) -> Optional[str]:
+        """Whatever is left once the stream ends."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+
+@dataclass
+class _Clip:
+    text: str
+    chunks: asyncio.Queue[Optional[bytes]]
+    played: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional[asyncio.Task[None]] = None
+
+
+class SpeechPipeline:
+    """
+    Synthesise queued sentences with bounded concurrency and play them in order.
+
+    Call `say()` as sentences complete, then `finish()` to wait for playback (it
+    re-raises the first synthesis or playback failure), or `cancel()` to drop
+    everything still queued (it never raises, so it is safe in error handlers).
+    """
+
+    def __init__(
+        self,
+        tts: OpenAITts,
+        audio: AudioManager,
+        max_concurrency: int = 2,
+        buffer_chunks: int = 4,
+    ):
+        self.tts = tts
+        self.audio = audio
+        self.buffer_chunks = buffer_chunks
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._clips: asyncio.Queue[Optional[_Clip]] = asyncio.Queue()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._started = time.perf_counter()
+        self._stream: Optional[PlaybackStream] = None
+        self._player = asyncio.create_task(self._play())
+
+    def say(self, text: str) -> None:
+        text = text.strip()
+        # Once the player has stopped (on a failure) nothing would consume the clip.
+        if text and not self._player.done():
+            clip = _Clip(text, asyncio.Queue(self.buffer_chunks))
+            clip.task = asyncio.create_task(self._synthesize(clip))
+            self._tasks.add(clip.task)
+            clip.task.add_done_callback(self._tasks.discard)
+            self._clips.put_nowait(clip)
+
+    async def finish(self) -> None:
+        self._clips.put_nowait(None)
+        await self._player
+
+    async def cancel(self) -> None:
+        self._player.cancel()
+        try:
+            await self._player
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # Already failed; the caller is abandoning the reply anyway.
+            logger.warning("Speech playback had failed before it was cancelled", exc_info=True)
+
+    async def _synthesize(self, clip: _Clip) -> None:
+        # A clip keeps its slot until it has been played, which bounds both the
+        # open TTS requests and the audio buffered ahead of the player.
+        async with self._slots:
+            try:
+                async for chunk in self.tts.stream(clip.text):
+                    await clip.chunks.put(chunk)
+            except BaseException:
+                # Wake the player even if the buffer is full; this clip is lost anyway.
+                while clip.chunks.full():
+                    clip.chunks.get_nowait()
+                clip.chunks.put_nowait(None)
+                raise
+            await clip.chunks.put(None)
+            await clip.played.wait()
+
+    async def _play(self) -> None:
+        playing = False
+        clip: Optional[_Clip] = None
+        try:
+            # Start the player up front so it is ready by the time the first clip is.
+            self._stream = await self.audio.open_playback_stream()
+            while (clip := await self._clips.get()) is not None:
+                while (chunk := await clip.chunks.get()) is not None:
+                    if not playing:
+                        playing = True
+                        logger.info(
+                            "First audio %.2f s after the reply started",
+                            time.perf_counter() - self._started,
+                        )
+                    await self._stream.write(chunk)
+                clip.played.set()
+                await clip.task  # re-raises a failed synthesis
+            await self._stream.close()
+        except BaseException:
+            if self._stream is not None:
+                self._stream.abort()
+            tasks = set(self._tasks)
+            if clip is not None and clip.task is not None:
+                tasks.add(clip.task)
+            while not self._clips.empty():
+                if (pending := self._clips.get_nowait()) is not None and pending.task is not None:
+                    tasks.add(pending.task)
+            for task in tasks:
+                self._discard(task)
+            raise
+
+    @staticmethod
+    def _discard(task: asyncio.Task[None]) -> None:
+        if task.done() and not task.cancelled():
+            task.exception()  # already failed; retrieve it so it isn't logged again
+        task.cancel()
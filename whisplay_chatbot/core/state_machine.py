@@ -8,10 +8,10 @@ import asyncio
 import contextlib
 import logging
 import random
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from ..config import ChatbotSettings, DATA_DIR
 from ..hardware import (
@@ -21,9 +21,12 @@ from ..hardware import (
     DisplayState,
     LedAnimator,
 )
+from ..hardware.capture import CAPTURE_BYTES_PER_SECOND, Recording, write_wav
+from ..hardware.vad import VoiceActivityDetector
 from ..services import OpenAIChatModel, OpenAITranscriber, OpenAITts
 from .history import ConversationHistory, HistoryEntry
 from .persona import PersonaManager, PersonaState
+from .speech import SentenceSplitter, SpeechPipeline
 
 
 logger = logging.getLogger(__name__)
@@ -37,6 +40,53 @@ FUN_IDLE_LINES = [
     "Need ideas? Try 'tell me a retro game fact'.",
 ]
 
+THINKING_LINES = [
+    "Plotting a clever reply...",
+    "Crunching galactic data...",
+    "Cooking up something fun...",
+]
+
+ERROR_ACCENT = "#FF4F6D"
+
+# Screens with fixed content. Their first frames are prebuilt into the display's
+# screen bundle (see ChatFlow.canned_display_states), so keep them in sync by
+# always passing these to display.update().
+BOOT_SCREEN = {
+    "status": "Booting",
+    "emoji": "🤖",
+    "text": "Whisplay is warming up. Get ready to press the button!",
+    "accent_color": "#19C3FF",
+}
+LISTENING_SCREEN = {"status": "Listening", "emoji": "🎤", "text": "Hold the button and speak..."}
+TRANSCRIBING_SCREEN = {
+    "status": "Transcribing",
+    "emoji": "🧠",
+    "text": "Thinking about what you said...",
+}
+NOT_HEARD_SCREEN = {
+    "status": "Listening",
+    "emoji": "🤔",
+    "text": "I didn't catch anything. Hold the button and speak again!",
+}
+COMPLETE_SCREEN = {
+    "status": "Complete",
+    "emoji": "✅",
+    "text": "Hold the button when you're ready for another round!",
+}
+AUDIO_ERROR_SCREEN = {
+    "status": "Error",
+    "emoji": "⚠️",
+    "text": "Sorry, I couldn't understand that audio. Try again?",
+    "accent_color": ERROR_ACCENT,
+}
+
+
+@dataclass
+class UserTurn:
+    audio_path: Path
+    # Transcription started while the user was still speaking, if it can stream.
+    transcript: Optional[asyncio.Task[str]]
+
 
 @dataclass
 class ChatFlowComponents:
@@ -57,21 +107,18 @@ class ChatFlow:
         self.components = components
         self._running = False
         self._idle_hint_task: Optional[asyncio.Task] = None
+        self._screens_task: Optional[asyncio.Task] = None
+        self._vad = VoiceActivityDetector()
 
     async def start(self) -> None:
         if self._running:
             return
         self._running = True
 
+        # Logo first; the canned screens (rendered on first boot) load behind it.
         await self.components.display.start()
-        await self.components.display.update(
-            status="Booting",
-            emoji="🤖",
-            text="Whisplay is warming up. Get ready to press the button!",
-            accent_color="#19C3FF",
-            brightness=90,
-            scroll_speed=2,
-        )
+        await self.components.display.update(**BOOT_SCREEN, brightness=90, scroll_speed=2)
+        self._screens_task = asyncio.create_task(self._load_screens())
         await self.components.led.set_state((25, 120, 255), mode="pulse")
 
         await self.components.led.start()
@@ -80,12 +127,38 @@ class ChatFlow:
         await self._play_startup_chime()
         logger.info("Startup complete; waiting for button press")
 
+    async def _load_screens(self) -> None:
+        try:
+            await self.components.display.load_screens(self.canned_display_states())
+        except Exception:
+            logger.warning("Canned screens unavailable; rendering every screen live", exc_info=True)
+
     async def _play_startup_chime(self) -> None:
         try:
             await self.components.audio.play_startup_chime()
         except Exception:  # pragma: no cover - chime is best-effort
             logger.debug("Startup chime errored", exc_info=True)
 
+    def canned_display_states(self) -> list[DisplayState]:
+        """Every fixed-content screen this flow shows, for each persona."""
+        states = [DisplayState(**BOOT_SCREEN)]
+        for persona in self.components.persona_manager.personas:
+            base = DisplayState(accent_color=persona.accent_color, persona_name=persona.name)
+            for line in FUN_IDLE_LINES:
+                states.append(replace(base, status="Idle", emoji="😴", text=line))
+                states.append(replace(base, status="Ready", emoji="💡", text=line))
+            for line in THINKING_LINES:
+                states.append(replace(base, status="Thinking", emoji="🤖", text=line))
+            for screen in (
+                LISTENING_SCREEN,
+                TRANSCRIBING_SCREEN,
+                NOT_HEARD_SCREEN,
+                COMPLETE_SCREEN,
+                AUDIO_ERROR_SCREEN,
+            ):
+                states.append(replace(base, **screen))
+        return states
+
     async def run(self) -> None:
         await self.start()
 
@@ -93,10 +166,10 @@ class ChatFlow:
             while True:
                 persona_state = self.components.persona_manager.pick()
                 await self._enter_idle(persona_state)
-                audio_path = await self._record_interaction(persona_state)
-                if audio_path is None:
+                turn = await self._record_interaction(persona_state)
+                if turn is None:
                     continue
-                user_text = await self._transcribe_audio(audio_path, persona_state)
+                user_text = await self._transcribe_audio(turn, persona_state)
                 if not user_text:
                     await self._notify_user_speech_not_detected(persona_state)
                     continue
@@ -115,6 +188,14 @@ class ChatFlow:
             with contextlib.suppress(asyncio.CancelledError):
                 await self._idle_hint_task
             self._idle_hint_task = None
+        if self._screens_task:
+            self._screens_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._screens_task
+            self._screens_task = None
+        await self.components.display.stop()
+        await self.components.audio.stop()
+        await self.components.transcriber.aclose()
 
     async def _enter_idle(self, persona: PersonaState) -> None:
         display_state = DisplayState(
@@ -148,13 +229,11 @@ class ChatFlow:
         except asyncio.CancelledError:
             return
 
-    async def _record_interaction(self, persona: PersonaState) -> Optional[Path]:
+    async def _record_interaction(self, persona: PersonaState) -> Optional[UserTurn]:
         settings = self.components.settings
 
         await self.components.display.update(
-            status="Listening",
-            emoji="🎤",
-            text="Hold the button and speak...",
+            **LISTENING_SCREEN,
             accent_color=persona.config.accent_color,
             brightness=95,
             scroll_speed=2,
@@ -162,49 +241,71 @@ class ChatFlow:
         await self.components.led.set_state((0, 200, 70), mode="pulse")
 
         await self.components.controls.wait_for_press()
-
-        timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-        audio_path = DATA_DIR / f"user-{timestamp}.mp3"
-
-        recording = await self.components.audio.start_manual_recording(audio_path)
-
+        recording = self.components.audio.start_recording(settings.max_record_seconds)
+        # Upload speech while the button is held, so little is left to send after release.
+        transcript = None
+        if self.components.transcriber.can_stream:
+            transcript = asyncio.create_task(self._stream_transcript(recording))
         try:
             await self.components.controls.wait_for_release()
         finally:
-            recording.stop()
+            pcm = recording.stop()
+
+        # Same detector and frames as the upload, so both agree on whether there is speech.
+        speech = self._vad.trim(pcm)
+        logger.info(
+            "Recorded %.2f s (%.2f s pre-roll), %.2f s kept as speech",
+            recording.duration,
+            recording.preroll_bytes / CAPTURE_BYTES_PER_SECOND,
+            len(speech or b"") / CAPTURE_BYTES_PER_SECOND,
+        )
+        if speech is None:
+            if transcript is not None:
+                transcript.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await transcript
+            await self._notify_user_speech_not_detected(persona)
+            return None
 
-        try:
-            return await asyncio.wait_for(
-                recording.future, timeout=settings.max_record_seconds
-            )
-        except asyncio.TimeoutError:
-            return audio_path
+        timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        audio_path = await asyncio.to_thread(write_wav, DATA_DIR / f"user-{timestamp}.wav", speech)
+        return UserTurn(audio_path=audio_path, transcript=transcript)
+
+    async def _stream_transcript(self, recording: Recording) -> str:
+        speech = self._vad.gate(recording.stream())
+        # Open the request only once speech starts; an empty press never reaches the API.
+        first = await anext(speech, None)
+        if first is None:
+            return ""
+
+        async def audio() -> AsyncIterator[bytes]:
+            yield first
+            async for chunk in speech:
+                yield chunk
 
-    async def _transcribe_audio(self, audio_path: Path, persona: PersonaState) -> str:
+        return await self.components.transcriber.transcribe_stream(audio())
+
+    async def _transcribe_audio(self, turn: UserTurn, persona: PersonaState) -> str:
         await self.components.display.update(
-            status="Transcribing",
-            emoji="🧠",
-            text="Thinking about what you said...",
+            **TRANSCRIBING_SCREEN,
             accent_color=persona.config.accent_color,
             scroll_speed=3,
         )
         await self.components.led.set_state((255, 140, 0), mode="sparkle")
+        if turn.transcript is not None:
+            try:
+                return await turn.transcript
+            except Exception:
+                logger.warning("Streaming transcription failed; uploading the file", exc_info=True)
         try:
-            return await self.components.transcriber.transcribe(audio_path)
+            return await self.components.transcriber.transcribe(turn.audio_path)
         except Exception:
-            await self.components.display.update(
-                status="Error",
-                emoji="⚠️",
-                text="Sorry, I couldn't understand that audio. Try again?",
-                accent_color="#FF4F6D",
-            )
+            await self.components.display.update(**AUDIO_ERROR_SCREEN)
             return ""
 
     async def _notify_user_speech_not_detected(self, persona: PersonaState) -> None:
         await self.components.display.update(
-            status="Listening",
-            emoji="🤔",
-            text="I didn't catch anything. Hold the button and speak again!",
+            **NOT_HEARD_SCREEN,
             accent_color=persona.config.accent_color,
             scroll_speed=3,
         )
@@ -232,49 +333,75 @@ class ChatFlow:
         await self.components.display.update(
             status="Thinking",
             emoji="🤖",
-            text=random.choice(
-                [
-                    "Plotting a clever reply...",
-                    "Crunching galactic data...",
-                    "Cooking up something fun...",
-                ]
-            ),
+            text=random.choice(THINKING_LINES),
             accent_color=persona.config.accent_color,
             scroll_speed=4,
         )
         await self.components.led.set_state((255, 128, 0), mode="sparkle")
 
+        answer = ""
+        answering = False
+        splitter = SentenceSplitter()
+        speech = SpeechPipeline(
+            self.components.tts,
+            self.components.audio,
+            max_concurrency=self.components.settings.tts_max_concurrency,
+        )
         try:
-            bot_text = await self.components.llm.complete(messages)
+            async for delta in self.components.llm.stream(messages):
+                answer += delta
+                for sentence in splitter.feed(delta):
+                    speech.say(sentence)
+                if not answer.strip():
+                    continue
+                if not answering:
+                    answering = True
+                    await self.components.led.set_state(persona.led_color, mode="pulse")
+                await self.components.display.update(
+                    status="Answering",
+                    emoji="💬",
+                    text=answer.strip(),
+                    accent_color=persona.config.accent_color,
+                    scroll_speed=5,
+                    typewriter=True,
+                )
         except Exception as exc:
+            await speech.cancel()
             await self.components.display.update(
                 status="Error",
                 emoji="😵",
                 text=f"Oh no, I glitched: {exc}",
-                accent_color="#FF4F6D",
+                accent_color=ERROR_ACCENT,
+                typewriter=False,
             )
             await asyncio.sleep(3)
             return
+        except BaseException:
+            await speech.cancel()
+            raise
 
+        rest = splitter.flush()
+        if rest:
+            speech.say(rest)
+        bot_text = answer.strip()
         await self.components.display.update(
             status="Answering",
             emoji="💬",
             text=bot_text,
             accent_color=persona.config.accent_color,
             scroll_speed=5,
+            typewriter=False,
         )
 
-        await self.components.led.set_state(persona.led_color, mode="pulse")
-
         try:
-            audio_bytes = await self.components.tts.synthesize(bot_text)
-            await self.components.audio.play_audio(audio_bytes)
+            await speech.finish()
         except Exception:
+            logger.exception("Speech synthesis or playback failed")
             await self.components.display.update(
                 status="Mute Mode",
                 emoji="🔇",
                 text=f"{bot_text}\n\n(Voice synth failed, so text only!)",
-                accent_color="#FF4F6D",
+                accent_color=ERROR_ACCENT,
             )
 
         self.components.history.append(
@@ -286,9 +413,7 @@ class ChatFlow:
         )
 
         await self.components.display.update(
-            status="Complete",
-            emoji="✅",
-            text="Hold the button when you're ready for another round!",
+            **COMPLETE_SCREEN,
             accent_color=persona.config.accent_color,
             scroll_speed=3,
         )
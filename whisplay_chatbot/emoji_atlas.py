@@ -0,0 +1,187 @@
+"""
+Pre-rasterised emoji atlas built once from the SVG set and memory-mapped at runtime.
+
+`build_emoji_atlas` is the offline step (it is the only place cairosvg is imported);
+`EmojiAtlas` reads the packed RGBA glyphs straight out of the mapped file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import unicodedata
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from .config import EMOJI_ATLAS_DIR, EMOJI_DIR
+
+logger = logging.getLogger(__name__)
+
+ATLAS_VERSION = 1
+ATLAS_DATA_FILE = "emoji-atlas.rgba"
+ATLAS_INDEX_FILE = "emoji-atlas.json"
+# Text lines (TextUtils, 20px) and the header emoji (DisplayController, 40px).
+DEFAULT_ATLAS_SIZES = (20, 40)
+
+_VARIATION_SELECTOR = 0xFE0F
+
+
+def is_emoji(char: str) -> bool:
+    return unicodedata.category(char) in {"So", "Sk"} or ord(char) > 0x1F000
+
+
+def emoji_key(sequence: str) -> str:
+    return "-".join(f"{ord(c):x}" for c in sequence)
+
+
+class EmojiAtlas:
+    """Square RGBA glyphs packed back to back, indexed by codepoint key and size."""
+
+    def __init__(self, data: np.ndarray, index: dict[int, dict[str, int]]):
+        self._data = data
+        self._index = index
+
+    @property
+    def sizes(self) -> tuple[int, ...]:
+        return tuple(sorted(self._index))
+
+    @classmethod
+    def load(cls, atlas_dir: Path = EMOJI_ATLAS_DIR) -> Optional["EmojiAtlas"]:
+        index_path = atlas_dir / ATLAS_INDEX_FILE
+        data_path = atlas_dir / ATLAS_DATA_FILE
+        if not index_path.exists() or not data_path.exists():
+            return None
+        try:
+            raw = json.loads(index_path.read_text())
+        except json.JSONDecodeError:
+            logger.warning("Ignoring corrupt emoji atlas index at %s", index_path)
+            return None
+        if raw.get("version") != ATLAS_VERSION:
+            logger.warning("Emoji atlas at %s is outdated; rebuild it", atlas_dir)
+            return None
+        index = {int(size): entries for size, entries in raw["sizes"].items()}
+        data = np.memmap(data_path, dtype=np.uint8, mode="r")
+        return cls(data, index)
+
+    def lookup(self, sequence: str, size: int) -> Optional[np.ndarray]:
+        """Return the glyph as an (size, size, 4) read-only view, or None."""
+        entries = self._index.get(size)
+        if not entries:
+            return None
+        offset = entries.get(emoji_key(sequence))
+        if offset is None:
+            stripped = "".join(c for c in sequence if ord(c) != _VARIATION_SELECTOR)
+            if not stripped or stripped == sequence:
+                return None
+            offset = entries.get(emoji_key(stripped))
+            if offset is None:
+                return None
+        return self._data[offset : offset + size * size * 4].reshape(size, size, 4)
+
+    def image(self, sequence: str, size: int) -> Optional[Image.Image]:
+        if size in self._index:
+            glyph = self.lookup(sequence, size)
+            if glyph is None:
+                return None
+            return Image.frombuffer("RGBA", (size, size), glyph, "raw", "RGBA", 0, 1)
+        # Sizes outside the atlas are scaled from the closest larger (else largest) one.
+        larger = [s for s in self._index if s > size]
+        source = min(larger) if larger else max(self._index, default=0)
+        glyph = self.lookup(sequence, source) if source else None
+        if glyph is None:
+            return None
+        return Image.fromarray(np.asarray(glyph), "RGBA").resize((size, size), Image.LANCZOS)
+
+
+@lru_cache(maxsize=1)
+def get_emoji_atlas() -> Optional[EmojiAtlas]:
+    atlas = EmojiAtlas.load()
+    if atlas is None:
+        logger.info(
+            "No emoji atlas found in %s; run `whisplay-chatbot build-emoji-atlas` "
+            "to render emoji as images.",
+            EMOJI_ATLAS_DIR,
+        )
+    return atlas
+
+
+def write_emoji_atlas(
+    keys: Sequence[str],
+    render: Callable[[str, int], Image.Image],
+    output_dir: Path = EMOJI_ATLAS_DIR,
+    sizes: Iterable[int] = DEFAULT_ATLAS_SIZES,
+) -> int:
+    """
+    Pack `render(key, size)` for every key at each size into an atlas in `output_dir`.
+
+    Glyphs that fail to render are skipped. Returns the size of the atlas data in bytes.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    data_path = output_dir / ATLAS_DATA_FILE
+    tmp_path = data_path.with_suffix(".tmp")
+    index: dict[str, dict[str, int]] = {}
+    offset = 0
+    # Recorded in the index so anything fingerprinting the index sees glyph changes.
+    digest = hashlib.sha256()
+    with tmp_path.open("wb") as handle:
+        for size in sizes:
+            entries: dict[str, int] = {}
+            for key in keys:
+                try:
+                    glyph = render(key, size).convert("RGBA")
+                except Exception:
+                    logger.debug("Skipping unrenderable emoji %s", key, exc_info=True)
+                    continue
+                if glyph.size != (size, size):
+                    glyph = glyph.resize((size, size), Image.LANCZOS)
+                payload = glyph.tobytes()
+                handle.write(payload)
+                digest.update(payload)
+                entries[key] = offset
+                offset += len(payload)
+            index[str(size)] = entries
+
+    tmp_path.replace(data_path)
+    (output_dir / ATLAS_INDEX_FILE).write_text(
+        json.dumps({"version": ATLAS_VERSION, "sizes": index, "digest": digest.hexdigest()})
+    )
+    get_emoji_atlas.cache_clear()
+    return offset
+
+
+def build_emoji_atlas(
+    emoji_dir: Path = EMOJI_DIR,
+    output_dir: Path = EMOJI_ATLAS_DIR,
+    sizes: Iterable[int] = DEFAULT_ATLAS_SIZES,
+) -> Path:
+    """
+    Rasterise every SVG in `emoji_dir` at each size into a packed atlas.
+
+    Returns the directory holding the atlas data and index.
+    """
+
+    import cairosvg
+
+    svg_paths = {path.stem: path for path in sorted(emoji_dir.glob("*.svg"))}
+    if not svg_paths:
+        raise FileNotFoundError(f"No emoji SVGs found in {emoji_dir}")
+
+    def render(key: str, size: int) -> Image.Image:
+        png_bytes = cairosvg.svg2png(url=str(svg_paths[key]), output_width=size, output_height=size)
+        return Image.open(BytesIO(png_bytes))
+
+    sizes = tuple(sizes)
+    nbytes = write_emoji_atlas(list(svg_paths), render, output_dir, sizes)
+    logger.info(
+        "Built emoji atlas with %s glyphs at sizes %s (%s bytes)",
+        len(svg_paths),
+        list(sizes),
+        nbytes,
+    )
+    return output_dir
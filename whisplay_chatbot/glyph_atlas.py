@@ -0,0 +1,180 @@
+"""
+Glyph atlas text renderer: rasterise each glyph once, compose lines with numpy blits.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from .emoji_atlas import get_emoji_atlas, is_emoji
+from .render_cache import BoundedCache, CacheStats
+
+
+@dataclass(frozen=True, slots=True)
+class Glyph:
+    """
+    A rasterised character positioned relative to the pen and the line top.
+
+    Text glyphs carry an 8-bit coverage `mask`; emoji carry premultiplication-free
+    RGBA pixels in `rgba` instead.
+    """
+
+    advance: int
+    height: int
+    offset_x: int
+    offset_y: int
+    mask: Optional[np.ndarray] = None
+    rgba: Optional[np.ndarray] = None
+
+    @property
+    def nbytes(self) -> int:
+        size = 64
+        if self.mask is not None:
+            size += self.mask.nbytes
+        if self.rgba is not None:
+            size += self.rgba.nbytes
+        return size
+
+
+def rgb_to_rgb565(rgb: np.ndarray) -> np.ndarray:
+    r = (rgb[..., 0] >> 3).astype(np.uint16)
+    g = (rgb[..., 1] >> 2).astype(np.uint16)
+    b = (rgb[..., 2] >> 3).astype(np.uint16)
+    return (r << 11) | (g << 5) | b
+
+
+class GlyphAtlas:
+    """
+    Per-(font, size) cache of glyph masks and advances.
+
+    Lines are composed by blitting cached masks into a single 8-bit coverage canvas
+    which is then mapped to RGB565 through a 256-entry lookup table; emoji are
+    alpha-blended in afterwards. No PIL drawing happens once a glyph is cached.
+    """
+
+    def __init__(self, font_path: str | Path, font_size: int, cache_bytes: int = 256 * 1024):
+        self.font_path = Path(font_path)
+        self.font_size = font_size
+        self.font = ImageFont.truetype(str(self.font_path), font_size)
+        self.ascent, self.descent = self.font.getmetrics()
+        self.line_height = self.ascent + self.descent
+        self._glyphs: BoundedCache[str, Glyph] = BoundedCache(
+            cache_bytes, sizeof=lambda glyph: glyph.nbytes
+        )
+
+    def glyph(self, char: str) -> Glyph:
+        return self._glyphs.get_or_create(char, lambda: self._rasterise(char))
+
+    def cache_stats(self) -> CacheStats:
+        return self._glyphs.stats()
+
+    def char_size(self, char: str) -> tuple[int, int]:
+        glyph = self.glyph(char)
+        return glyph.advance, glyph.height
+
+    def _rasterise(self, char: str) -> Glyph:
+        if is_emoji(char):
+            atlas = get_emoji_atlas()
+            image = atlas.image(char, self.font_size) if atlas is not None else None
+            if image is not None:
+                pixels = np.asarray(image)
+                height, width = pixels.shape[:2]
+                return Glyph(
+                    advance=width,
+                    height=height,
+                    offset_x=0,
+                    offset_y=self.ascent - height,
+                    rgba=pixels,
+                )
+
+        left, top, right, bottom = self.font.getbbox(char)
+        advance, height = right - left, bottom - top
+        if right <= left or bottom <= top:
+            return Glyph(advance=max(advance, 0), height=max(height, 0), offset_x=0, offset_y=0)
+        canvas = Image.new("L", (right - min(left, 0), bottom), 0)
+        ImageDraw.Draw(canvas).text((-min(left, 0), 0), char, font=self.font, fill=255)
+        mask = np.asarray(canvas)[top:bottom, left - min(left, 0) :]
+        return Glyph(
+            advance=advance,
+            height=height,
+            offset_x=left,
+            offset_y=top,
+            mask=np.ascontiguousarray(mask),
+        )
+
+    def compose(
+        self,
+        lines: Iterable[tuple[str, int, int]],
+        width: int,
+        height: int,
+        color: tuple[int, int, int] = (255, 255, 255),
+    ) -> np.ndarray:
+        """
+        Render `(text, x, y)` lines into a black `height` x `width` RGB565 array.
+        """
+
+        lines = list(lines)
+        # One cache lookup per distinct character rather than per occurrence.
+        glyphs = {char: self.glyph(char) for char in set().union(*(text for text, _, _ in lines))}
+        coverage = np.zeros((height, width), dtype=np.uint8)
+        emoji: list[tuple[np.ndarray, int, int]] = []
+        for text, x, y in lines:
+            pen = x
+            for char in text:
+                glyph = glyphs[char]
+                if glyph.mask is not None:
+                    _blit_max(coverage, glyph.mask, pen + glyph.offset_x, y + glyph.offset_y)
+                elif glyph.rgba is not None:
+                    emoji.append((glyph.rgba, pen + glyph.offset_x, y + glyph.offset_y))
+                pen += glyph.advance
+
+        levels = np.arange(256, dtype=np.uint16)
+        lut = rgb_to_rgb565(
+            (np.outer(levels, np.asarray(color, dtype=np.uint16)) // 255).astype(np.uint8)
+        )
+        out = lut[coverage]
+        for rgba, x, y in emoji:
+            _blend_rgba(out, coverage, color, rgba, x, y)
+        return out
+
+
+def _clip(dst_shape: tuple[int, int], src_shape: tuple[int, int], x: int, y: int):
+    height, width = dst_shape
+    src_h, src_w = src_shape
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + src_w, width), min(y + src_h, height)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (slice(y0, y1), slice(x0, x1)), (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+
+
+def _blit_max(canvas: np.ndarray, mask: np.ndarray, x: int, y: int) -> None:
+    clipped = _clip(canvas.shape, mask.shape, x, y)
+    if clipped is None:
+        return
+    dst, src = clipped
+    np.maximum(canvas[dst], mask[src], out=canvas[dst])
+
+
+def _blend_rgba(
+    out: np.ndarray,
+    coverage: np.ndarray,
+    color: tuple[int, int, int],
+    rgba: np.ndarray,
+    x: int,
+    y: int,
+) -> None:
+    clipped = _clip(out.shape, rgba.shape[:2], x, y)
+    if clipped is None:
+        return
+    dst, src = clipped
+    pixels = rgba[src].astype(np.uint16)
+    alpha = pixels[..., 3:4]
+    under = (coverage[dst][..., None].astype(np.uint16) * np.asarray(color, dtype=np.uint16)) // 255
+    blended = (pixels[..., :3] * alpha + under * (255 - alpha)) // 255
+    out[dst] = rgb_to_rgb565(blended.astype(np.uint8))
@@ -16,13 +16,12 @@ try:
 except Exception as exc:  # pragma: no cover
     raise RuntimeError("RPi.GPIO and spidev must be installed on the Raspberry Pi") from exc
 
+from .st7789 import ST7789Commands
+
 logger = logging.getLogger(__name__)
 
 
-class WhisplayBoard:
-    LCD_WIDTH = 240
-    LCD_HEIGHT = 280
-    CornerHeight = 20
+class WhisplayBoard(ST7789Commands):
     DC_PIN = 13
     RST_PIN = 7
     LED_PIN = 15
@@ -42,6 +41,8 @@ class WhisplayBoard:
 
         self.backlight_pwm = GPIO.PWM(self.LED_PIN, 1000)
         self.backlight_pwm.start(100)
+        # Last duty cycle written per PWM channel; identical writes are skipped.
+        self._duty_cycles: dict[object, float] = {self.backlight_pwm: 100}
 
         GPIO.setup([self.RED_PIN, self.GREEN_PIN, self.BLUE_PIN], GPIO.OUT)
         self.red_pwm = GPIO.PWM(self.RED_PIN, 100)
@@ -53,6 +54,7 @@ class WhisplayBoard:
         self.red_pwm.start(0)
         self.green_pwm.start(0)
         self.blue_pwm.start(0)
+        self._duty_cycles.update({self.red_pwm: 0, self.green_pwm: 0, self.blue_pwm: 0})
 
         GPIO.setup(self.BUTTON_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
         self.button_press_callback = None
@@ -83,10 +85,17 @@ class WhisplayBoard:
         self._init_display()
         self.fill_screen(0)
 
+    def _change_duty_cycle(self, pwm, duty_cycle: float) -> None:
+        duty_cycle = round(duty_cycle, 1)
+        if self._duty_cycles.get(pwm) == duty_cycle:
+            return
+        pwm.ChangeDutyCycle(duty_cycle)
+        self._duty_cycles[pwm] = duty_cycle
+
     def set_backlight(self, brightness: int):
         if 0 <= brightness <= 100:
             duty_cycle = 100 - brightness
-            self.backlight_pwm.ChangeDutyCycle(duty_cycle)
+            self._change_duty_cycle(self.backlight_pwm, duty_cycle)
 
     def _reset_lcd(self):
         GPIO.output(self.RST_PIN, GPIO.HIGH)
@@ -96,103 +105,19 @@ class WhisplayBoard:
         GPIO.output(self.RST_PIN, GPIO.HIGH)
         time.sleep(0.12)
 
-    def _init_display(self):
-        self._send_command(0x11)
-        time.sleep(0.12)
-        USE_HORIZONTAL = 1
-        direction = {0: 0x00, 1: 0xC0, 2: 0x70, 3: 0xA0}.get(USE_HORIZONTAL, 0x00)
-        self._send_command(0x36, direction)
-        self._send_command(0x3A, 0x05)
-        self._send_command(0xB2, 0x0C, 0x0C, 0x00, 0x33, 0x33)
-        self._send_command(0xB7, 0x35)
-        self._send_command(0xBB, 0x32)
-        self._send_command(0xC2, 0x01)
-        self._send_command(0xC3, 0x15)
-        self._send_command(0xC4, 0x20)
-        self._send_command(0xC6, 0x0F)
-        self._send_command(0xD0, 0xA4, 0xA1)
-        self._send_command(
-            0xE0,
-            0xD0,
-            0x08,
-            0x0E,
-            0x09,
-            0x09,
-            0x05,
-            0x31,
-            0x33,
-            0x48,
-            0x17,
-            0x14,
-            0x15,
-            0x31,
-            0x34,
-        )
-        self._send_command(
-            0xE1,
-            0xD0,
-            0x08,
-            0x0E,
-            0x09,
-            0x09,
-            0x15,
-            0x31,
-            0x33,
-            0x48,
-            0x17,
-            0x14,
-            0x15,
-            0x31,
-            0x34,
-        )
-        self._send_command(0x21)
-        self._send_command(0x29)
-
-    def _send_command(self, cmd, *args):
+    def _write_command(self, cmd):
         GPIO.output(self.DC_PIN, GPIO.LOW)
         self.spi.xfer2([cmd])
-        if args:
-            GPIO.output(self.DC_PIN, GPIO.HIGH)
-            self._send_data(list(args))
 
     def _send_data(self, data):
         GPIO.output(self.DC_PIN, GPIO.HIGH)
-        max_chunk = 4096
-        for i in range(0, len(data), max_chunk):
-            self.spi.writebytes(data[i : i + max_chunk])
-
-    def set_window(self, x0, y0, x1, y1, use_horizontal=0):
-        if use_horizontal in (0, 1):
-            self._send_command(0x2A, x0 >> 8, x0 & 0xFF, x1 >> 8, x1 & 0xFF)
-            self._send_command(
-                0x2B, (y0 + 20) >> 8, (y0 + 20) & 0xFF, (y1 + 20) >> 8, (y1 + 20) & 0xFF
-            )
-        elif use_horizontal in (2, 3):
-            self._send_command(
-                0x2A, (x0 + 20) >> 8, (x0 + 20) & 0xFF, (x1 + 20) >> 8, (x1 + 20) & 0xFF
-            )
-            self._send_command(0x2B, y0 >> 8, y0 & 0xFF, y1 >> 8, y1 & 0xFF)
-        self._send_command(0x2C)
-
-    def draw_image(self, x, y, width, height, pixel_data):
-        if (x + width > self.LCD_WIDTH) or (y + height > self.LCD_HEIGHT):
-            raise ValueError("Image size exceeds screen bounds")
-        self.set_window(x, y, x + width - 1, y + height - 1)
-        self._send_data(pixel_data)
-
-    def fill_screen(self, color):
-        self.set_window(0, 0, self.LCD_WIDTH - 1, self.LCD_HEIGHT - 1)
-        buffer = []
-        high = (color >> 8) & 0xFF
-        low = color & 0xFF
-        for _ in range(self.LCD_WIDTH * self.LCD_HEIGHT):
-            buffer.extend([high, low])
-        self._send_data(buffer)
+        # writebytes2 takes any buffer and chunks it to the driver's bufsiz in C.
+        self.spi.writebytes2(data)
 
     def set_rgb(self, r, g, b):
-        self.red_pwm.ChangeDutyCycle(100 - (r / 255 * 100))
-        self.green_pwm.ChangeDutyCycle(100 - (g / 255 * 100))
-        self.blue_pwm.ChangeDutyCycle(100 - (b / 255 * 100))
+        self._change_duty_cycle(self.red_pwm, 100 - (r / 255 * 100))
+        self._change_duty_cycle(self.green_pwm, 100 - (g / 255 * 100))
+        self._change_duty_cycle(self.blue_pwm, 100 - (b / 255 * 100))
         self._current_r = r
         self._current_g = g
         self._current_b = b
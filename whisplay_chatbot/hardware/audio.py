@@ -1,37 +1,38 @@
 """
-Audio capture and playback helpers using SoX and mpg123.
+Audio capture and playback through persistent ALSA processes.
 """
 
 from __future__ import annotations
 
-import asyncio
 import logging
-from dataclasses import dataclass
-from pathlib import Path
 from typing import Optional
 
 from ..config import DATA_DIR
 from .board import MockBoard
+from .capture import PcmCapture, Recording
+from .player import PcmPlayer, PlayerStats, chime_pcm
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_RECORD_CMD = ["sox", "-t", "alsa", "default", "-t", "mp3"]
-DEFAULT_SILENCE_ARGS = ["silence", "1", "0.1", "60%", "1", "1.0", "60%"]
-DEFAULT_PLAY_CMD = ["mpg123", "-", "--scale", "2", "-o", "alsa"]
 
+class PlaybackStream:
+    """One reply's audio, queued into the shared player back to back with the rest."""
 
-@dataclass
-class ManualRecording:
-    process: asyncio.subprocess.Process
-    output_path: Path
-    future: asyncio.Future[Path]
+    def __init__(self, player: PcmPlayer):
+        self.player = player
+        self.bytes_written = 0
 
-    def stop(self) -> None:
-        if self.process.returncode is None:
-            logger.debug("Stopping recording process (pid=%s)", self.process.pid)
-            self.process.terminate()
-        if not self.future.done():
-            self.future.set_result(self.output_path)
+    async def write(self, audio_bytes: bytes) -> None:
+        await self.player.write(audio_bytes, continues=self.bytes_written > 0)
+        self.bytes_written += len(audio_bytes)
+
+    async def close(self) -> None:
+        """Wait for everything written so far to finish playing."""
+        await self.player.wait_idle()
+
+    def abort(self) -> None:
+        """Stop playback immediately."""
+        self.player.flush()
 
 
 class AudioManager:
@@ -40,117 +41,53 @@ class AudioManager:
         simulate: bool = False,
         record_cmd: Optional[list[str]] = None,
         play_cmd: Optional[list[str]] = None,
+        preroll_seconds: float = 0.4,
     ):
         self.simulate = simulate
-        self.record_cmd = record_cmd or DEFAULT_RECORD_CMD
-        self.play_cmd = play_cmd or DEFAULT_PLAY_CMD
-        self._current_recording: Optional[ManualRecording] = None
+        self.capture = PcmCapture(record_cmd, preroll_seconds)
+        # In simulation everything that would be played is written to one WAV file.
+        self.player = PcmPlayer(
+            play_cmd, sink_path=DATA_DIR / "tts-preview.wav" if simulate else None
+        )
 
     async def start(self) -> None:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
-
-    async def start_manual_recording(self, output_path: Path) -> ManualRecording:
-        if self._current_recording:
-            self._current_recording.stop()
-
-        loop = asyncio.get_running_loop()
-        future: asyncio.Future[Path] = loop.create_future()
-
-        cmd = [*self.record_cmd, str(output_path)]
-        logger.info("Starting recording: %s", " ".join(cmd))
-        process = await asyncio.create_subprocess_exec(
-            *cmd, stderr=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE
+        await self.player.start()
+        await self.capture.start()
+
+    async def stop(self) -> None:
+        stats = self.player.stats()
+        logger.info(
+            "Played %.1f s of audio (%s underruns, %s player restarts)",
+            stats.seconds_played,
+            stats.underruns,
+            stats.restarts,
         )
+        await self.player.stop()
+        await self.capture.stop()
 
-        # Monitor process completion
-        async def _watch():
-            await process.wait()
-            if process.returncode not in (0, None):
-                stderr = await process.stderr.read() if process.stderr else b""
-                logger.warning("Recording ended with code %s: %s", process.returncode, stderr)
-            if not future.done():
-                future.set_result(output_path)
+    def start_recording(self, max_seconds: float) -> Recording:
+        """Start keeping microphone audio, beginning with the pre-roll before this call."""
+        return self.capture.start_recording(max_seconds)
 
-        asyncio.create_task(_watch())
+    async def play_startup_chime(self) -> None:
+        await self.player.write(chime_pcm())
 
-        recording = ManualRecording(process=process, output_path=output_path, future=future)
-        self._current_recording = recording
-        return recording
+    async def open_playback_stream(self) -> PlaybackStream:
+        return PlaybackStream(self.player)
 
-    async def play_startup_chime(self) -> None:
-        if self.simulate:
-            logger.info("[SIM] Startup chime skipped (simulation mode)")
-            return
-
-        cmd = [
-            "sox",
-            "-n",
-            "-t",
-            "alsa",
-            "default",
-            "synth",
-            "0.35",
-            "sin",
-            "880",
-            "fade",
-            "q",
-            "0.02",
-            "0.35",
-            "0.1",
-        ]
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-        except FileNotFoundError:
-            logger.debug("SoX not available; skipping startup chime")
-            return
-
-        stdout, stderr = await process.communicate()
-        if process.returncode != 0:
-            logger.debug(
-                "Startup chime failed (code=%s): %s",
-                process.returncode,
-                (stderr or b"").decode(errors="ignore"),
-            )
-        else:
-            if stdout:
-                logger.debug("Startup chime stdout: %s", stdout.decode(errors="ignore"))
-
-    async def record_with_timeout(self, output_path: Path, max_duration: int) -> Path:
-        recording = await self.start_manual_recording(output_path)
-        try:
-            return await asyncio.wait_for(recording.future, timeout=max_duration)
-        except asyncio.TimeoutError:
-            recording.stop()
-            return output_path
-
-    async def play_audio(self, audio_bytes: bytes, simulate_dump: bool = True) -> None:
-        if self.simulate:
-            if simulate_dump:
-                outfile = DATA_DIR / "tts-preview.mp3"
-                outfile.write_bytes(audio_bytes)
-                logger.info("[SIM] Saved TTS preview to %s", outfile)
-            return
-
-        process = await asyncio.create_subprocess_exec(
-            *self.play_cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+    async def play_audio(self, pcm: bytes) -> None:
+        """Play 24 kHz 16-bit mono PCM and wait for it to finish."""
+        stream = await self.open_playback_stream()
+        await stream.write(pcm)
+        await stream.close()
 
-        assert process.stdin is not None
-        process.stdin.write(audio_bytes)
-        await process.stdin.drain()
-        process.stdin.close()
-        await process.wait()
+    def stop_playback(self) -> None:
+        """Cut off whatever is playing or queued."""
+        self.player.flush()
 
-        if process.returncode != 0:
-            stderr = await process.stderr.read() if process.stderr else b""
-            logger.warning("mpg123 exited with code %s: %s", process.returncode, stderr)
+    def playback_stats(self) -> PlayerStats:
+        return self.player.stats()
 
 
 def create_audio_manager(board, simulate: bool) -> AudioManager:
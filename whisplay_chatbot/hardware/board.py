@@ -6,18 +6,44 @@ from __future__ import annotations
 
 import logging
 import time
-from dataclasses import dataclass
-from typing import Optional, Protocol
+from dataclasses import dataclass, field
+from typing import Literal, Optional, Protocol, Union
+
+import numpy as np
+
+from ..ui_utils import ImageUtils
 
 logger = logging.getLogger(__name__)
 
+# Big-endian RGB565 bytes; buffers are passed straight through to spidev.
+PixelData = Union[bytes, bytearray, memoryview]
+# "rgb444" packs two pixels into three bytes (see ImageUtils.rgb565_array_to_rgb444_pixel_data).
+PixelFormat = Literal["rgb565", "rgb444"]
+
 
 class DisplayBoard(Protocol):
     LCD_WIDTH: int
     LCD_HEIGHT: int
     CornerHeight: int
 
-    def draw_image(self, x: int, y: int, width: int, height: int, pixel_data: list[int]) -> None: ...
+    def draw_image(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        pixel_data: PixelData,
+        pixel_format: PixelFormat = "rgb565",
+    ) -> None: ...
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, color: int) -> None:
+        """Fill a rectangle with one RGB565 colour."""
+
+    def define_scroll_area(self, top: int, height: int) -> None:
+        """Make rows [top, top + height) a vertically scrolling region."""
+
+    def set_scroll_start(self, line: int) -> None:
+        """Show scroll-area memory row `line` at the top of the scrolling region."""
 
     def set_backlight(self, brightness: int) -> None: ...
 
@@ -54,19 +80,79 @@ def _load_real_board() -> Optional["WhisplayBoard"]:
 
 @dataclass
 class MockBoard:
+    """
+    Stand-in board that keeps the panel's memory so drawing and scrolling can be inspected.
+
+    `memory` holds what was written through `draw_image`; `screen()` applies the
+    vertical scroll registers the way the ST7789 does when it refreshes.
+    """
+
     LCD_WIDTH: int = 240
     LCD_HEIGHT: int = 280
     CornerHeight: int = 20
-
-    def draw_image(self, x: int, y: int, width: int, height: int, pixel_data: list[int]) -> None:
+    memory: np.ndarray = field(init=False, repr=False, compare=False)
+    scroll_area: Optional[tuple[int, int]] = field(default=None, init=False)
+    scroll_start: int = field(default=0, init=False)
+    bytes_written: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.memory = np.zeros((self.LCD_HEIGHT, self.LCD_WIDTH), dtype=np.uint16)
+
+    def draw_image(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        pixel_data: PixelData,
+        pixel_format: PixelFormat = "rgb565",
+    ) -> None:
+        if (x + width > self.LCD_WIDTH) or (y + height > self.LCD_HEIGHT):
+            raise ValueError("Image size exceeds screen bounds")
+        payload = memoryview(pixel_data).cast("B")
         logger.debug(
-            "Mock draw image at x=%s y=%s w=%s h=%s (payload=%s bytes)",
+            "Mock draw image at x=%s y=%s w=%s h=%s (payload=%s bytes, %s)",
             x,
             y,
             width,
             height,
-            len(pixel_data),
+            payload.nbytes,
+            pixel_format,
         )
+        if pixel_format == "rgb444":
+            pixels = ImageUtils.rgb444_pixel_data_to_rgb565_array(payload).reshape(height, width)
+        else:
+            pixels = np.frombuffer(payload, dtype=">u2").reshape(height, width)
+        self.memory[y : y + height, x : x + width] = pixels
+        self.bytes_written += payload.nbytes
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, color: int) -> None:
+        if (x + width > self.LCD_WIDTH) or (y + height > self.LCD_HEIGHT):
+            raise ValueError("Fill exceeds screen bounds")
+        logger.debug("Mock fill at x=%s y=%s w=%s h=%s colour=0x%04x", x, y, width, height, color)
+        self.memory[y : y + height, x : x + width] = color
+        self.bytes_written += width * height * 2
+
+    def define_scroll_area(self, top: int, height: int) -> None:
+        if top < 0 or height <= 0 or top + height > self.LCD_HEIGHT:
+            raise ValueError("Scroll area exceeds screen bounds")
+        self.scroll_area = (top, height)
+        self.scroll_start = 0
+
+    def set_scroll_start(self, line: int) -> None:
+        if self.scroll_area is None:
+            raise RuntimeError("Scroll area is not defined")
+        self.scroll_start = line % self.scroll_area[1]
+
+    def screen(self) -> np.ndarray:
+        """The RGB565 pixels currently visible on the emulated panel."""
+        visible = self.memory.copy()
+        if self.scroll_area is not None and self.scroll_start:
+            top, height = self.scroll_area
+            visible[top : top + height] = np.roll(
+                self.memory[top : top + height], -self.scroll_start, axis=0
+            )
+        return visible
 
     def set_backlight(self, brightness: int) -> None:
         logger.info("[MOCK] Backlight -> %s%%", brightness)
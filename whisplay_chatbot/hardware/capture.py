@@ -0,0 +1,172 @@
+"""
+Always-armed microphone capture with a pre-roll ring buffer.
+
+One `arecord` process runs for the whole session. While nobody is talking the
+newest few hundred milliseconds are kept in a fixed-size ring; a button press
+starts a recording that begins with that pre-roll, so the first syllable
+spoken together with the press is not lost to process start-up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import wave
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_RATE = 16_000
+CAPTURE_BYTES_PER_SECOND = CAPTURE_RATE * 2
+DEFAULT_CAPTURE_CMD = [
+    "arecord",
+    "-q",
+    "-t",
+    "raw",
+    "-f",
+    "S16_LE",
+    "-c",
+    "1",
+    "-r",
+    str(CAPTURE_RATE),
+]
+# 20 ms reads: fine-grained enough for the ring, coarse enough to be cheap.
+CAPTURE_CHUNK_BYTES = CAPTURE_BYTES_PER_SECOND // 50
+
+
+def write_wav(path: Path, pcm: bytes, rate: int = CAPTURE_RATE) -> Path:
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm)
+    return path
+
+
+class Recording:
+    """PCM captured between a button press and its release, pre-roll included."""
+
+    def __init__(self, preroll: bytes, max_bytes: int):
+        self.preroll_bytes = len(preroll)
+        self.max_bytes = max_bytes
+        self._pcm = bytearray(preroll[-max_bytes:] if max_bytes else b"")
+        self._grew = asyncio.Event()
+        self.active = True
+
+    def append(self, chunk: bytes) -> None:
+        room = self.max_bytes - len(self._pcm)
+        if room > 0:
+            self._pcm += chunk[:room]
+            self._grew.set()
+
+    @property
+    def duration(self) -> float:
+        return len(self._pcm) / CAPTURE_BYTES_PER_SECOND
+
+    def stop(self) -> bytes:
+        self.active = False
+        self._grew.set()
+        return bytes(self._pcm)
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Yield the audio captured so far, then new audio as it arrives, until stopped."""
+        sent = 0
+        while True:
+            if sent < len(self._pcm):
+                chunk = bytes(self._pcm[sent:])
+                sent += len(chunk)
+                yield chunk
+            elif not self.active:
+                return
+            else:
+                self._grew.clear()
+                await self._grew.wait()
+
+
+class PcmCapture:
+    """
+    Keep a capture process running and the last `preroll_seconds` of audio in memory.
+
+    `start_recording()` hands out a `Recording` seeded with the ring's contents
+    that keeps receiving audio until stopped (or `max_seconds` is reached).
+    """
+
+    def __init__(self, cmd: Optional[list[str]] = None, preroll_seconds: float = 0.4):
+        self.cmd = cmd or DEFAULT_CAPTURE_CMD
+        # Whole chunks, so the ring always holds complete samples.
+        chunks = max(1, round(preroll_seconds * CAPTURE_BYTES_PER_SECOND / CAPTURE_CHUNK_BYTES))
+        self.preroll_bytes = chunks * CAPTURE_CHUNK_BYTES
+        self._ring = bytearray()
+        self._recording: Optional[Recording] = None
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+            self._reader = None
+        self._kill()
+
+    def start_recording(self, max_seconds: float) -> Recording:
+        if self._recording is not None:
+            self._recording.stop()
+        if not self.running:
+            logger.warning("Microphone capture is not running; recording will be empty")
+        max_bytes = int(max_seconds * CAPTURE_BYTES_PER_SECOND) // 2 * 2
+        self._recording = Recording(bytes(self._ring), max_bytes)
+        return self._recording
+
+    def feed(self, chunk: bytes) -> None:
+        """Take in freshly captured audio (called by the reader for every chunk)."""
+        recording = self._recording
+        if recording is not None and recording.active:
+            recording.append(chunk)
+        else:
+            self._recording = None
+        self._ring += chunk
+        del self._ring[: -self.preroll_bytes]
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                self._process = await asyncio.create_subprocess_exec(
+                    *self.cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+            except FileNotFoundError:
+                logger.warning("Capture command %s not found; microphone disabled", self.cmd[0])
+                return
+            logger.debug("Microphone capture running (pid=%s)", self._process.pid)
+            assert self._process.stdout is not None
+            try:
+                while True:
+                    self.feed(await self._process.stdout.readexactly(CAPTURE_CHUNK_BYTES))
+                    backoff = 1.0
+            except asyncio.IncompleteReadError:
+                logger.warning(
+                    "Microphone capture exited (code=%s); restarting", self._process.returncode
+                )
+            finally:
+                self._kill()
+            self._ring.clear()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _kill(self) -> None:
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            process.kill()
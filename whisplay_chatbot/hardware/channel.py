@@ -0,0 +1,125 @@
+"""
+Latest-value channel used to hand controller state from the chat flow to hardware loops.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelStats:
+    published: int
+    delivered: int
+    coalesced: int
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LatestValueChannel(Generic[T]):
+    """
+    Single-slot channel where a new value replaces any value not yet taken.
+
+    Producers never block and consumers always see the newest state, so a burst of
+    updates collapses into one instead of queueing behind a slow frame or animation.
+    Consumers can wait from a thread (`wait`) or from asyncio (`wait_async`);
+    `publish` is safe to call from either side.
+    """
+
+    def __init__(self, initial: Optional[T] = None):
+        self._latest: Optional[T] = initial
+        self._pending: Optional[T] = initial
+        self._closed = False
+        self._published = 0 if initial is None else 1
+        self._delivered = 0
+        self._coalesced = 0
+        self._cond = threading.Condition()
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def publish(self, value: T) -> None:
+        with self._cond:
+            if self._pending is not None:
+                self._coalesced += 1
+            self._latest = value
+            self._pending = value
+            self._published += 1
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        self._wake_async(waiters)
+
+    def peek(self) -> Optional[T]:
+        """The most recently published value, whether or not it was taken."""
+        return self._latest
+
+    def take(self) -> Optional[T]:
+        """Return the pending value, if any, and mark it delivered."""
+        with self._cond:
+            value, self._pending = self._pending, None
+            if value is not None:
+                self._delivered += 1
+            return value
+
+    def has_pending(self) -> bool:
+        return self._pending is not None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block the calling thread until a value is pending or the channel closes."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is not None or self._closed, timeout)
+
+    async def wait_async(self, timeout: Optional[float] = None) -> bool:
+        """Await until a value is pending or the channel closes; False on timeout."""
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            if self._pending is not None or self._closed:
+                return True
+            future = loop.create_future()
+            self._async_waiters.append((loop, future))
+        try:
+            await asyncio.wait((future,), timeout=timeout)
+        finally:
+            if not future.done():
+                future.cancel()
+                with self._cond:
+                    self._async_waiters = [
+                        waiter for waiter in self._async_waiters if waiter[1] is not future
+                    ]
+        return self._pending is not None or self._closed
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        self._wake_async(waiters)
+
+    def reopen(self) -> None:
+        with self._cond:
+            self._closed = False
+
+    def stats(self) -> ChannelStats:
+        with self._cond:
+            return ChannelStats(
+                published=self._published,
+                delivered=self._delivered,
+                coalesced=self._coalesced,
+            )
+
+    @staticmethod
+    def _wake_async(waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]]) -> None:
+        for loop, future in waiters:
+            if loop.is_closed():
+                continue
+            loop.call_soon_threadsafe(_resolve, future)
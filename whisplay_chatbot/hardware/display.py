@@ -5,16 +5,25 @@ High-level display controller that keeps the Whisplay LCD updated.
 from __future__ import annotations
 
 import asyncio
-import contextlib
 import logging
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, replace
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Optional
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
-from ..config import FONT_PATH, LOGO_PATH
-from ..ui_utils import ColorUtils, ImageUtils, TextUtils
-from .board import DisplayBoard
+from ..config import EMOJI_ATLAS_DIR, FONT_PATH, LOGO_PATH, SCREEN_CACHE_DIR
+from ..emoji_atlas import ATLAS_INDEX_FILE
+from ..render_cache import BoundedCache
+from ..screen_bundle import ScreenBundle, content_hash, file_fingerprint
+from ..ui_utils import ColorUtils, EmojiUtils, ImageUtils, TextStrip, TextUtils
+from .board import DisplayBoard, PixelFormat
+from .channel import LatestValueChannel
+from .framebuffer import FrameBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -30,26 +39,140 @@ class DisplayState:
     brightness: int = 90
     scroll_speed: int = 4
     persona_name: Optional[str] = None
+    # Text is still arriving: keep its tail in view instead of scrolling.
+    typewriter: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class RenderStats:
+    frames: int
+    fps: float
+    mean_frame_ms: float
+    max_frame_ms: float
+
+
+class FrameTimer:
+    """
+    Rolling frame-time and achieved-fps statistics over the last `window` seconds.
+
+    The render thread records frames while other threads read snapshots, so both
+    sides go through a lock.
+    """
+
+    def __init__(self, window: float = 2.0):
+        self.window = window
+        self.frames = 0
+        self._samples: deque[tuple[float, float]] = deque()
+        self._lock = threading.Lock()
+
+    def record(self, started: float, duration: float) -> None:
+        with self._lock:
+            self.frames += 1
+            self._samples.append((started, duration))
+            self._trim(started)
+
+    def restart_window(self) -> None:
+        """Drop samples from before an idle period so fps reflects the current burst."""
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self) -> RenderStats:
+        with self._lock:
+            self._trim(time.monotonic())
+            frames, samples = self.frames, list(self._samples)
+        if not samples:
+            return RenderStats(frames=frames, fps=0.0, mean_frame_ms=0.0, max_frame_ms=0.0)
+        durations = [duration for _, duration in samples]
+        span = samples[-1][0] - samples[0][0]
+        fps = (len(samples) - 1) / span if span > 0 else 0.0
+        return RenderStats(
+            frames=frames,
+            fps=fps,
+            mean_frame_ms=sum(durations) / len(durations) * 1000,
+            max_frame_ms=max(durations) * 1000,
+        )
+
+    def _trim(self, now: float) -> None:
+        while self._samples and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
 
 
 class DisplayController:
+    """
+    Renders `DisplayState` onto the panel only when something changes.
+
+    All drawing, RGB565 conversion and SPI traffic happen on a dedicated render
+    thread that composes into the framebuffer's back buffer and presents the
+    damage. The asyncio side only publishes the latest state, so a frame never
+    stalls button handling, audio pipes or API calls.
+
+    A frame is drawn when `update()` delivers a new state and, while the answer
+    text is scrolling, at `fps`. Once the text comes to rest the worker sleeps
+    until the next update and the display costs nothing.
+
+    With `hardware_scroll` the text area is a panel scroll region: each scroll step
+    writes only the rows it exposes into the panel memory rows that just went off
+    screen, then moves the scroll start address. The framebuffer then mirrors panel
+    memory rather than the screen, and is realigned (scroll start 0) whenever the
+    text area is redrawn normally.
+
+    With `pixel_format="rgb444"` the text area is sent at 12 bits per pixel whenever
+    the answer contains no emoji, cutting its SPI traffic by a quarter; the header,
+    boot logo and emoji text stay RGB565.
+
+    Screens that always look the same (see `prepare_screens`) are rendered once into
+    a memory-mapped `ScreenBundle`; when the text changes to one of them its first
+    frame is composed straight from the bundle with no PIL or text layout work.
+    """
+
+    HEADER_HEIGHT = 98
+    BOOT_SCREEN_KEY = "boot"
+
     def __init__(
         self,
         board: DisplayBoard,
         fps: int = 25,
         font_path=FONT_PATH,
         logo_path=LOGO_PATH,
+        header_cache_bytes: int = 512 * 1024,
+        boot_duration: float = 1.5,
+        hardware_scroll: bool = False,
+        pixel_format: PixelFormat = "rgb565",
     ):
         self.board = board
         self.fps = fps
         self.frame_interval = 1.0 / fps
+        self.boot_duration = boot_duration
         self.state = DisplayState()
-        self._queue: asyncio.Queue[DisplayState] = asyncio.Queue()
-        self._render_task: Optional[asyncio.Task] = None
+        self.states: LatestValueChannel[DisplayState] = LatestValueChannel(self.state)
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
         self._scroll_offset = 0
         self._last_text = self.state.text
+        # Set when the text changes: the next frame shows it from the top, unscrolled.
+        self._fresh_text = False
+        self.screens: Optional[ScreenBundle] = None
+        self._strip: Optional[TextStrip] = None
+        self._last_brightness: Optional[int] = None
+        self.hardware_scroll = hardware_scroll
+        self.pixel_format = pixel_format
+        self._scroll_defined = False
+        self._scroll_start = 0
+        # Strip held in the scroll region, the strip row stored in its first memory
+        # row, and the strip row currently shown at the top of the text area.
+        self._scroll_strip: Optional[TextStrip] = None
+        self._scroll_base = 0
+        self._scroll_position = 0
+        self.framebuffer = FrameBuffer(board.LCD_WIDTH, board.LCD_HEIGHT)
+        self._header_cache: BoundedCache[tuple, np.ndarray] = BoundedCache(header_cache_bytes)
+        self._last_header_key: Optional[tuple] = None
         self.logo_path = logo_path
+        self._frame_timer = FrameTimer()
+        # Fonts, text caches and the header cache are shared by the render thread and
+        # a screen bundle being built in the background; one of them draws at a time.
+        self._render_lock = threading.Lock()
 
+        self.font_path = Path(font_path)
         font_path = str(font_path)
         self.status_font = ImageFont.truetype(font_path, 28)
         self.emoji_font = ImageFont.truetype(font_path, 40)
@@ -64,58 +187,310 @@ class DisplayController:
             self.logo_image = Image.open(logo_path).convert("RGBA")
 
     async def start(self) -> None:
-        if self._render_task:
+        if self._worker:
             return
-        self._render_task = asyncio.create_task(self._render_loop())
+        self._stop_event.clear()
+        self.states.reopen()
+        self._worker = threading.Thread(
+            target=self._render_worker, name="whisplay-display", daemon=True
+        )
+        self._worker.start()
 
     async def stop(self) -> None:
-        if self._render_task:
-            self._render_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._render_task
-            self._render_task = None
+        worker = self._worker
+        if worker is None:
+            return
+        self._stop_event.set()
+        self.states.close()
+        await asyncio.to_thread(worker.join, 2.0)
+        self._worker = None
 
     async def update(self, **kwargs) -> None:
-        new_state = replace(self.state, **kwargs)
-        await self._queue.put(new_state)
+        self.publish(replace(self.states.peek() or self.state, **kwargs))
+
+    def publish(self, state: DisplayState) -> None:
+        """Hand a new state to the render thread; safe to call from any thread."""
+        self.states.publish(state)
+
+    def stats(self) -> RenderStats:
+        return self._frame_timer.snapshot()
+
+    @property
+    def animating(self) -> bool:
+        strip = self._strip
+        return (
+            bool(self.state.text)
+            and not self.state.typewriter
+            and self.state.scroll_speed > 0
+            and (strip is None or self._scroll_offset < strip.loop_height)
+        )
 
-    async def show_boot_screen(self, duration: float = 1.5) -> None:
-        if not self.logo_image:
-            return
-        # Render logo full screen
-        pixel_data = ImageUtils.image_to_rgb565(
-            self.logo_image, self.board.LCD_WIDTH, self.board.LCD_HEIGHT
+    async def load_screens(self, states: Iterable[DisplayState]) -> None:
+        """
+        Load (building on first use) the canned frames for `states` off the event loop.
+
+        Safe while the display is running: until the bundle is ready, every screen
+        is simply rendered live.
+        """
+        await asyncio.to_thread(self.prepare_screens, list(states))
+
+    def prepare_screens(
+        self, states: Iterable[DisplayState], directory: Path = SCREEN_CACHE_DIR
+    ) -> ScreenBundle:
+        """
+        Memory-map the screen bundle for `states` plus the boot logo.
+
+        Frames missing from the bundle on disk are rendered and the bundle rewritten;
+        this only happens on first boot or when fonts, logo, emoji or states change.
+        """
+
+        width, height = self.board.LCD_WIDTH, self.board.LCD_HEIGHT
+        # The atlas index carries a digest of the glyph data, so a rebuilt atlas
+        # changes the fingerprint without hashing the (much larger) data file.
+        atlas_index = EMOJI_ATLAS_DIR / ATLAS_INDEX_FILE
+        fingerprint = content_hash(
+            file_fingerprint((self.font_path, self.logo_path, atlas_index)),
+            width,
+            height,
+            self.HEADER_HEIGHT,
         )
-        self.board.draw_image(0, 0, self.board.LCD_WIDTH, self.board.LCD_HEIGHT, pixel_data)
-        await asyncio.sleep(duration)
+        wanted: dict[str, Optional[DisplayState]] = {}
+        if self.logo_image is not None:
+            wanted[self.BOOT_SCREEN_KEY] = None
+        for state in states:
+            wanted[self.screen_key(state)] = state
+
+        bundle = ScreenBundle.load(fingerprint, width, height, directory)
+        missing = [key for key in wanted if bundle is None or key not in bundle]
+        if missing:
+            started = time.monotonic()
+            frames = {
+                key: self._render_screen_locked(state) if key in missing else bundle.get(key)
+                for key, state in wanted.items()
+            }
+            bundle = ScreenBundle.write(fingerprint, frames, width, height, directory)
+            logger.info(
+                "Rendered %s canned screens in %.2fs", len(missing), time.monotonic() - started
+            )
+        self.screens = bundle
+        return bundle
 
-    async def _render_loop(self) -> None:
+    def screen_key(self, state: DisplayState) -> str:
+        return content_hash(*self._header_key(state), state.text)
+
+    def _draw_boot_screen(self) -> bool:
+        if not self.logo_image:
+            return False
+        frame = self.screens.get(self.BOOT_SCREEN_KEY) if self.screens is not None else None
+        if frame is None:
+            frame = self._render_screen(None)
+        if self._scroll_start:
+            self._set_scroll_start(0)
+        self._scroll_strip = None
+        self.framebuffer.flush(self.board, frame, 0, 0)
+        self._last_header_key = None
+        return True
+
+    def _render_screen_locked(self, state: Optional[DisplayState]) -> np.ndarray:
+        with self._render_lock:
+            return self._render_screen(state)
+
+    def _render_screen(self, state: Optional[DisplayState]) -> np.ndarray:
+        """A full first frame for `state`, or the boot logo when `state` is None."""
+        width, height = self.board.LCD_WIDTH, self.board.LCD_HEIGHT
+        if state is None:
+            logo_frame = ImageUtils.letterbox(self.logo_image, width, height)
+            return ImageUtils.image_to_rgb565_array(logo_frame)
+        frame = np.zeros((height, width), dtype=np.uint16)
+        frame[: self.HEADER_HEIGHT] = self._render_header(state)
+        if state.text:
+            layout = self.text_utils.layout_text(state.text, width - 24)
+            strip = self.text_utils.render_strip(layout, width, height - self.HEADER_HEIGHT)
+            frame[self.HEADER_HEIGHT :] = strip.viewport(0)
+        return frame
+
+    def _render_worker(self) -> None:
         try:
-            await self.show_boot_screen()
+            with self._render_lock:
+                shown = self._draw_boot_screen()
+            if shown:
+                self._stop_event.wait(self.boot_duration)
         except Exception:
             logger.debug("Boot screen not available", exc_info=True)
 
-        while True:
+        while not self._stop_event.is_set():
+            pending = self.states.take()
+            if pending is not None:
+                self._accept_state(pending)
+
+            was_animating = self.animating
+            started = time.monotonic()
             try:
-                try:
-                    self.state = self._queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    pass
-
-                if self.state.text != self._last_text:
-                    self._scroll_offset = 0
-                    self._last_text = self.state.text
-
-                self._render_frame(self.state)
-                await asyncio.sleep(self.frame_interval)
-            except asyncio.CancelledError:
-                break
+                with self._render_lock:
+                    self._render_frame(self.state)
             except Exception:
                 logger.exception("Error rendering display frame")
-                await asyncio.sleep(self.frame_interval)
+                self._repaint_all()
+                self._stop_event.wait(self.frame_interval)
+                continue
+            elapsed = time.monotonic() - started
+            self._frame_timer.record(started, elapsed)
+
+            if self.animating:
+                self.states.wait(max(0.0, self.frame_interval - elapsed))
+            else:
+                if was_animating:
+                    logger.debug(
+                        "Display at rest: %s (%s); text caches %s",
+                        self.stats(),
+                        self.states.stats(),
+                        self.text_utils.cache_stats(),
+                    )
+                self.states.wait()
+                self._frame_timer.restart_window()
+
+    def _repaint_all(self) -> None:
+        """
+        Resend the whole screen on the next frame.
+
+        After a failed frame the panel may hold part of it, so the framebuffer's
+        mirror can no longer be trusted.
+        """
+        self.framebuffer.invalidate()
+        self._last_header_key = None
+        self._scroll_strip = None
+
+    def _accept_state(self, state: DisplayState) -> None:
+        self.state = state
+        if state.text != self._last_text:
+            if not (state.typewriter and state.text.startswith(self._last_text)):
+                self._scroll_offset = 0
+                self._fresh_text = True
+            self._last_text = state.text
 
     def _render_frame(self, state: DisplayState) -> None:
-        header_height = 98
+        fresh, self._fresh_text = self._fresh_text, False
+        if fresh and self._show_canned_screen(state):
+            return
+
+        header_height = self.HEADER_HEIGHT
+        header_key = self._header_key(state)
+        if header_key != self._last_header_key:
+            header = self._header_cache.get_or_create(
+                header_key, lambda: self._render_header(state)
+            )
+            self.framebuffer.compose(header, 0, 0)
+            self._last_header_key = header_key
+
+        # Main text area
+        text_area_height = self.board.LCD_HEIGHT - header_height
+        strip = self._text_strip(state.text, text_area_height)
+        if strip is not None:
+            if state.typewriter:
+                self._scroll_offset = max(0, strip.layout.total_height - text_area_height)
+            elif not fresh:
+                self._scroll_offset = min(
+                    self._scroll_offset + state.scroll_speed, strip.loop_height
+                )
+            text_region = strip.viewport(self._scroll_offset)
+        else:
+            text_region = None
+
+        text_format: PixelFormat = "rgb565"
+        if self.pixel_format == "rgb444" and (strip is None or strip.monochrome):
+            text_format = "rgb444"
+        if not (
+            self.hardware_scroll and self._scroll_text(strip, self._scroll_offset, text_format)
+        ):
+            if self.hardware_scroll:
+                self._set_scroll_start(0)
+                self._scroll_strip = strip
+                self._scroll_base = self._scroll_position = self._scroll_offset
+            if text_region is None:
+                self.framebuffer.fill(
+                    self.board, 0, header_height, self.board.LCD_WIDTH, text_area_height
+                )
+            else:
+                self.framebuffer.compose(text_region, 0, header_height, text_format)
+        self.framebuffer.present(self.board)
+        self._apply_brightness(state)
+
+    def _show_canned_screen(self, state: DisplayState) -> bool:
+        frame = self.screens.get(self.screen_key(state)) if self.screens is not None else None
+        if frame is None:
+            return False
+        if self._scroll_start:
+            self._set_scroll_start(0)
+        self._scroll_strip = None
+        # The strip is only needed once scrolling starts; build it on the next frame.
+        self._strip = None
+        self.framebuffer.compose(frame, 0, 0)
+        self.framebuffer.present(self.board)
+        self._last_header_key = self._header_key(state)
+        self._apply_brightness(state)
+        return True
+
+    def _apply_brightness(self, state: DisplayState) -> None:
+        if state.brightness != self._last_brightness:
+            self.board.set_backlight(state.brightness)
+            self._last_brightness = state.brightness
+
+    def _scroll_text(
+        self, strip: Optional[TextStrip], offset: int, pixel_format: PixelFormat = "rgb565"
+    ) -> bool:
+        """
+        Move the text area to `offset` using the panel scroll registers.
+
+        Returns False when the step cannot be done by scrolling (new text, backwards
+        or a full viewport or more), in which case the caller redraws the area.
+        """
+
+        if strip is None or strip is not self._scroll_strip:
+            return False
+        height = strip.viewport_height
+        step = offset - self._scroll_position
+        if step == 0:
+            return True
+        if step < 0 or step >= height:
+            return False
+
+        # Strip rows scrolling into view replace the memory rows that just left it.
+        first = (self._scroll_position - self._scroll_base) % height
+        exposed = strip.pixels[self._scroll_position + height : offset + height]
+        head = min(step, height - first)
+        self.framebuffer.blit(
+            self.board, exposed[:head], 0, self.HEADER_HEIGHT + first, pixel_format
+        )
+        if head < step:
+            self.framebuffer.blit(self.board, exposed[head:], 0, self.HEADER_HEIGHT, pixel_format)
+        self._set_scroll_start((offset - self._scroll_base) % height)
+        self._scroll_position = offset
+        return True
+
+    def _set_scroll_start(self, line: int) -> None:
+        if not self._scroll_defined:
+            self.board.define_scroll_area(
+                self.HEADER_HEIGHT, self.board.LCD_HEIGHT - self.HEADER_HEIGHT
+            )
+            self._scroll_defined = True
+            self._scroll_start = 0
+        if line != self._scroll_start:
+            self.board.set_scroll_start(line)
+            self._scroll_start = line
+
+    @staticmethod
+    def _header_key(state: DisplayState) -> tuple:
+        return (
+            state.status,
+            state.emoji,
+            state.accent_color,
+            state.persona_name,
+            state.battery_level,
+            state.battery_color,
+        )
+
+    def _render_header(self, state: DisplayState) -> np.ndarray:
+        header_height = self.HEADER_HEIGHT
         header_img = Image.new("RGBA", (self.board.LCD_WIDTH, header_height), (0, 0, 0, 255))
         header_draw = ImageDraw.Draw(header_img)
 
@@ -142,49 +517,38 @@ class DisplayController:
 
         # Emoji
         emoji_text = state.emoji or "😊"
-        emoji_bbox = self.emoji_font.getbbox(emoji_text)
-        emoji_width = emoji_bbox[2] - emoji_bbox[0]
-        header_draw.text(
-            ((self.board.LCD_WIDTH - emoji_width) // 2, status_y + 10),
-            emoji_text,
-            font=self.emoji_font,
-            fill=(255, 255, 255),
-        )
+        emoji_image = EmojiUtils.get_emoji_image(emoji_text, self.emoji_font.size)
+        if emoji_image is not None:
+            header_img.paste(
+                emoji_image,
+                ((self.board.LCD_WIDTH - emoji_image.width) // 2, status_y + 10),
+                emoji_image,
+            )
+        else:
+            emoji_bbox = self.emoji_font.getbbox(emoji_text)
+            emoji_width = emoji_bbox[2] - emoji_bbox[0]
+            header_draw.text(
+                ((self.board.LCD_WIDTH - emoji_width) // 2, status_y + 10),
+                emoji_text,
+                font=self.emoji_font,
+                fill=(255, 255, 255),
+            )
 
         # Battery gauge
         if state.battery_level is not None:
             self._render_battery(header_draw, state)
 
-        header_rgb565 = ImageUtils.image_to_rgb565(header_img, header_img.width, header_img.height)
-        self.board.draw_image(0, 0, header_img.width, header_img.height, header_rgb565)
-
-        # Main text area
-        text_area_height = self.board.LCD_HEIGHT - header_height
-        text_image = Image.new("RGBA", (self.board.LCD_WIDTH, text_area_height), (0, 0, 0, 255))
-        text_draw = ImageDraw.Draw(text_image)
-
-        if state.text:
-            lines = self.text_utils.wrap_text(state.text, self.board.LCD_WIDTH - 24)
-            line_height = self.text_utils.get_line_height()
-            total_height = max(len(lines) * line_height, text_area_height)
-
-            self._scroll_offset = min(self._scroll_offset + state.scroll_speed, total_height)
-
-            offset = self._scroll_offset % max(total_height, 1)
-            y_cursor = -offset
-            for line in lines:
-                if -line_height <= y_cursor <= text_area_height:
-                    self.text_utils.draw_mixed_text(
-                        text_draw, text_image, line, (12, max(0, y_cursor))
-                    )
-                y_cursor += line_height
-
-        text_rgb565 = ImageUtils.image_to_rgb565(text_image, text_image.width, text_image.height)
-        self.board.draw_image(
-            0, header_height, text_image.width, text_image.height, text_rgb565
-        )
-
-        self.board.set_backlight(state.brightness)
+        return ImageUtils.image_to_rgb565_array(header_img)
+
+    def _text_strip(self, text: str, viewport_height: int) -> Optional[TextStrip]:
+        if not text:
+            return None
+        strip = self._strip
+        if strip is None or strip.layout.text != text or strip.viewport_height != viewport_height:
+            layout = self.text_utils.layout_text(text, self.board.LCD_WIDTH - 24)
+            strip = self.text_utils.render_strip(layout, self.board.LCD_WIDTH, viewport_height)
+            self._strip = strip
+        return strip
 
     def _render_battery(self, draw: ImageDraw.ImageDraw, state: DisplayState) -> None:
         battery_width = 36
@@ -0,0 +1,205 @@
+"""
+Double-buffered RGB565 mirror of the LCD used to push only the regions that changed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..ui_utils import ImageUtils
+from .board import DisplayBoard, PixelFormat
+
+
+@dataclass(frozen=True, slots=True)
+class Rect:
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @property
+    def area(self) -> int:
+        return self.width * self.height
+
+
+class FrameBuffer:
+    """
+    Back buffer for composing the next frame plus a front copy of what the panel shows.
+
+    Regions are written into `back` with `compose()`; `present()` diffs the rows that
+    were touched against `front`, sends the damaged rectangles and swaps the buffers.
+
+    Changed rows are grouped into horizontal bands (rows separated by fewer than
+    `merge_gap` unchanged rows share a band) and each band is trimmed to its changed
+    columns. When a frame produces more than `max_rects` bands they are collapsed
+    into a single bounding rectangle, since every window costs a CASET/RASET/RAMWR
+    round trip on the SPI bus.
+
+    Regions composed with `pixel_format="rgb444"` are sent at 12 bits per pixel when
+    a damaged rectangle lies entirely within such rows and has an even pixel count;
+    everything else goes out as RGB565.
+    """
+
+    def __init__(self, width: int, height: int, *, merge_gap: int = 8, max_rects: int = 4):
+        self.width = width
+        self.height = height
+        self.merge_gap = merge_gap
+        self.max_rects = max_rects
+        # The real board clears the panel to black during init, so start from zeros.
+        self.front = np.zeros((height, width), dtype=np.uint16)
+        self.back = np.zeros((height, width), dtype=np.uint16)
+        self._stale: np.ndarray | None = None
+        self._touched: tuple[int, int] | None = None
+        # Rows composed for reduced colour depth since the last present.
+        self._reduced_rows = np.zeros(height, dtype=bool)
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """What the panel currently shows."""
+        return self.front
+
+    def invalidate(self) -> None:
+        """Forget the mirrored contents so the next present resends every composed region."""
+        self._stale = np.ones((self.height, self.width), dtype=bool)
+
+    def compose(
+        self, region: np.ndarray, x: int, y: int, pixel_format: PixelFormat = "rgb565"
+    ) -> None:
+        height, width = region.shape
+        if x < 0 or y < 0 or x + width > self.width or y + height > self.height:
+            raise ValueError("Region exceeds framebuffer bounds")
+        self.back[y : y + height, x : x + width] = region
+        self._reduced_rows[y : y + height] = pixel_format == "rgb444"
+        if self._touched is None:
+            self._touched = (y, y + height)
+        else:
+            self._touched = (min(self._touched[0], y), max(self._touched[1], y + height))
+
+    def damage(self, region: np.ndarray, x: int, y: int) -> list[Rect]:
+        """Rectangles, in panel coordinates, where `region` differs from the front buffer."""
+        height, width = region.shape
+        changed = self.front[y : y + height, x : x + width] != region
+        if self._stale is not None:
+            changed |= self._stale[y : y + height, x : x + width]
+        rows = np.flatnonzero(changed.any(axis=1))
+        if rows.size == 0:
+            return []
+
+        breaks = np.flatnonzero(np.diff(rows) > self.merge_gap)
+        starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+        ends = np.concatenate((rows[breaks], [rows[-1]]))
+
+        if len(starts) > self.max_rects:
+            starts, ends = starts[:1], ends[-1:]
+
+        rects: list[Rect] = []
+        for start, end in zip(starts, ends):
+            cols = np.flatnonzero(changed[start : end + 1].any(axis=0))
+            rects.append(
+                Rect(
+                    x + int(cols[0]),
+                    y + int(start),
+                    int(cols[-1] - cols[0] + 1),
+                    int(end - start + 1),
+                )
+            )
+        return rects
+
+    def present(self, board: DisplayBoard) -> list[Rect]:
+        """
+        Send whatever changed in the back buffer since the last present, then swap.
+
+        Returns the rectangles that were written, in panel coordinates.
+        """
+
+        if self._touched is None:
+            return []
+        top, bottom = self._touched
+        self._touched = None
+
+        rects = self.damage(self.back[top:bottom], 0, top)
+        for rect in rects:
+            patch = self.back[rect.y : rect.y + rect.height, rect.x : rect.x + rect.width]
+            reduced = self._reduced_rows[rect.y : rect.y + rect.height].all()
+            self._send(board, patch, rect.x, rect.y, "rgb444" if reduced else "rgb565")
+        self._reduced_rows[top:bottom] = False
+
+        self.front, self.back = self.back, self.front
+        # Outside the damaged rectangles both buffers already agree, so only those
+        # need copying to keep composing on top of the frame that is now displayed.
+        for rect in rects:
+            rows = slice(rect.y, rect.y + rect.height)
+            cols = slice(rect.x, rect.x + rect.width)
+            self.back[rows, cols] = self.front[rows, cols]
+
+        if self._stale is not None:
+            self._stale[top:bottom] = False
+            if not self._stale.any():
+                self._stale = None
+        return rects
+
+    def blit(
+        self,
+        board: DisplayBoard,
+        region: np.ndarray,
+        x: int,
+        y: int,
+        pixel_format: PixelFormat = "rgb565",
+    ) -> None:
+        """
+        Send `region` straight to the panel and record it in both buffers.
+
+        Bypasses damage tracking for writes the caller knows are new, such as rows
+        exposed by hardware scrolling; anything composed but not yet presented in
+        that area is overwritten.
+        """
+
+        height, width = region.shape
+        if x < 0 or y < 0 or x + width > self.width or y + height > self.height:
+            raise ValueError("Region exceeds framebuffer bounds")
+        self._send(board, region, x, y, pixel_format)
+        self.front[y : y + height, x : x + width] = region
+        self.back[y : y + height, x : x + width] = region
+        if self._stale is not None:
+            self._stale[y : y + height, x : x + width] = False
+
+    def fill(
+        self, board: DisplayBoard, x: int, y: int, width: int, height: int, color: int = 0
+    ) -> list[Rect]:
+        """
+        Make a rectangle a solid colour using the board's fill, only where it differs.
+
+        Like `blit`, this writes through to the panel immediately and overwrites
+        anything composed but not yet presented in that area.
+        """
+
+        solid = np.broadcast_to(np.uint16(color), (height, width))
+        rects = self.damage(solid, x, y)
+        for rect in rects:
+            board.fill_rect(rect.x, rect.y, rect.width, rect.height, color)
+            rows = slice(rect.y, rect.y + rect.height)
+            cols = slice(rect.x, rect.x + rect.width)
+            self.front[rows, cols] = color
+            self.back[rows, cols] = color
+            if self._stale is not None:
+                self._stale[rows, cols] = False
+        return rects
+
+    @staticmethod
+    def _send(
+        board: DisplayBoard, region: np.ndarray, x: int, y: int, pixel_format: PixelFormat
+    ) -> None:
+        height, width = region.shape
+        if pixel_format == "rgb444" and region.size % 2 == 0:
+            pixel_data = ImageUtils.rgb565_array_to_rgb444_pixel_data(region)
+            board.draw_image(x, y, width, height, pixel_data, "rgb444")
+        else:
+            pixel_data = ImageUtils.rgb565_array_to_pixel_data(region)
+            board.draw_image(x, y, width, height, pixel_data)
+
+    def flush(self, board: DisplayBoard, region: np.ndarray, x: int, y: int) -> list[Rect]:
+        """Compose a single region and present it immediately."""
+        self.compose(region, x, y)
+        return self.present(board)
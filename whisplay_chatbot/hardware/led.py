@@ -7,12 +7,21 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import logging
+import math
+import random
 from dataclasses import dataclass
+from functools import lru_cache
 
 from .board import DisplayBoard
+from .channel import LatestValueChannel
 
 logger = logging.getLogger(__name__)
 
+Color = tuple[int, int, int]
+
+# Sparkle intensities are drawn once so every sparkle cycle is just a table walk.
+_SPARKLE_FACTORS = tuple(random.Random(0x5EED).uniform(0.6, 1.2) for _ in range(48))
+
 
 @dataclass
 class LedState:
@@ -20,12 +29,68 @@ class LedState:
     mode: str = "solid"  # solid | pulse | breathing | sparkle
 
 
+@dataclass(frozen=True, slots=True)
+class LedCurve:
+    """A precomputed colour lookup table played back at a fixed step."""
+
+    frames: tuple[Color, ...]
+    step: float
+    loop: bool = True
+
+
+def _scale(color: Color, factor: float) -> Color:
+    r, g, b = (max(0, min(255, int(c * factor))) for c in color)
+    return (r, g, b)
+
+
+def _lerp(start: Color, end: Color, t: float) -> Color:
+    r, g, b = (int(a + (b - a) * t) for a, b in zip(start, end))
+    return (r, g, b)
+
+
+@lru_cache(maxsize=32)
+def build_curve(mode: str, color: Color) -> LedCurve:
+    if mode == "solid":
+        return LedCurve(frames=(color,), step=0.0, loop=False)
+    if mode == "pulse":
+        scales = list(range(20, 101, 12)) + list(range(100, 19, -12))
+        return LedCurve(frames=tuple(_scale(color, s / 100) for s in scales), step=0.05)
+    if mode == "breathing":
+        # Raised cosine from 10% to 100% and back over a 6 s breath at 25 steps/s.
+        steps = 150
+        frames = tuple(
+            _scale(color, 0.1 + 0.9 * (1 - math.cos(2 * math.pi * i / steps)) / 2)
+            for i in range(steps)
+        )
+        return LedCurve(frames=frames, step=0.04)
+    if mode == "sparkle":
+        frames = tuple(_scale(color, factor) for factor in _SPARKLE_FACTORS)
+        return LedCurve(frames=frames, step=0.07)
+    raise ValueError(f"Unknown LED mode '{mode}'")
+
+
+def build_fade(start: Color, end: Color, duration: float = 0.12, step: float = 0.02) -> LedCurve:
+    steps = max(1, round(duration / step))
+    frames = tuple(_lerp(start, end, i / steps) for i in range(1, steps + 1))
+    return LedCurve(frames=frames, step=step, loop=False)
+
+
 class LedAnimator:
+    """
+    Plays LED curves from a single deadline-driven task on the event loop.
+
+    Each mode's colours come from a cached lookup table; the task only writes the
+    next entry and waits on the state channel until the next step is due, so a new
+    state preempts the animation immediately and nothing ever sleeps the loop.
+    Consecutive identical colours are not written to the PWM.
+    """
+
     def __init__(self, board: DisplayBoard):
         self.board = board
         self.state = LedState((0, 0, 0), mode="solid")
         self._task: asyncio.Task | None = None
-        self._queue: asyncio.Queue[LedState] = asyncio.Queue()
+        self.states: LatestValueChannel[LedState] = LatestValueChannel()
+        self._current: Color = (0, 0, 0)
 
     async def start(self) -> None:
         if self._task:
@@ -40,54 +105,56 @@ class LedAnimator:
             self._task = None
 
     async def set_state(self, color: tuple[int, int, int], mode: str = "solid") -> None:
-        await self._queue.put(LedState(color=color, mode=mode))
+        self.states.publish(LedState(color=color, mode=mode))
 
     async def _run(self) -> None:
         while True:
             try:
+                pending = self.states.take()
+                if pending is not None:
+                    self.state = pending
+
                 try:
-                    self.state = self._queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    pass
-
-                mode = self.state.mode
-                color = self.state.color
-
-                if mode == "solid":
-                    self.board.set_rgb(*color)
-                    await asyncio.sleep(0.2)
-                elif mode == "pulse":
-                    await self._pulse(color)
-                elif mode == "breathing":
-                    await self._breathing(color)
-                elif mode == "sparkle":
-                    await self._sparkle(color)
-                else:
-                    logger.debug("Unknown LED mode '%s'", mode)
-                    await asyncio.sleep(0.5)
+                    curve = build_curve(self.state.mode, tuple(self.state.color))
+                except ValueError:
+                    logger.debug("Unknown LED mode '%s'", self.state.mode)
+                    await self.states.wait_async(None)
+                    continue
+
+                if self._current != curve.frames[0] and await self._play(
+                    build_fade(self._current, curve.frames[0])
+                ):
+                    continue
+                if await self._play(curve):
+                    continue
+                if not curve.loop:
+                    await self.states.wait_async(None)
             except asyncio.CancelledError:
                 break
             except Exception:
                 logger.exception("LED animator error")
-                await asyncio.sleep(0.5)
-
-    async def _pulse(self, color: tuple[int, int, int]) -> None:
-        for scale in list(range(20, 101, 12)) + list(range(100, 19, -12)):
-            scaled = tuple(int(c * scale / 100) for c in color)
-            self.board.set_rgb(*scaled)
-            await asyncio.sleep(0.05)
-
-    async def _breathing(self, color: tuple[int, int, int]) -> None:
-        for scale in list(range(10, 101, 5)) + list(range(100, 9, -5)):
-            scaled = tuple(int(c * scale / 100) for c in color)
-            self.board.set_rgb_fade(*scaled, duration_ms=120)
-            await asyncio.sleep(0.08)
-
-    async def _sparkle(self, color: tuple[int, int, int]) -> None:
-        import random
-
-        for _ in range(12):
-            sparkle_color = tuple(min(255, int(c * random.uniform(0.6, 1.2))) for c in color)
-            self.board.set_rgb(*sparkle_color)
-            await asyncio.sleep(0.07)
+                await self.states.wait_async(0.5)
+
+    async def _play(self, curve: LedCurve) -> bool:
+        """Play one pass of `curve`; returns True if a new state interrupted it."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        for frame in curve.frames:
+            self._write(frame)
+            deadline += curve.step
+            delay = deadline - loop.time()
+            if delay < -curve.step:
+                # The loop was held up; resynchronise rather than replaying a burst.
+                deadline = loop.time()
+            if delay > 0:
+                if await self.states.wait_async(delay):
+                    return True
+            elif self.states.has_pending():
+                return True
+        return False
+
+    def _write(self, color: Color) -> None:
+        if color == self._current:
+            return
         self.board.set_rgb(*color)
+        self._current = color
@@ -0,0 +1,245 @@
+"""
+Long-lived PCM playback: one warm `aplay` process fed raw audio for the whole session.
+
+Spawning a player and opening the ALSA device per reply costs a noticeable
+fraction of a second on a Pi Zero 2 W, so the player is started once and clips
+are queued into it back to back. Audio is signed 16-bit little-endian mono at
+the rate the OpenAI TTS "pcm" format uses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PCM_RATE = 24_000
+PCM_BYTES_PER_SECOND = PCM_RATE * 2
+DEFAULT_PLAYER_CMD = ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", str(PCM_RATE)]
+# A chunk written this late after the previous audio ran out counts as an underrun.
+UNDERRUN_SLACK_SECONDS = 0.02
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerStats:
+    queued_chunks: int
+    # Audio accepted but not yet heard: the queue plus what the player is still playing.
+    queued_seconds: float
+    seconds_played: float
+    underruns: int
+    restarts: int
+
+
+def chime_pcm(
+    frequency: float = 880.0, duration: float = 0.35, fade: float = 0.02, volume: float = 0.35
+) -> bytes:
+    """A short sine tone with linear fades, as PCM."""
+    samples = int(duration * PCM_RATE)
+    t = np.arange(samples) / PCM_RATE
+    envelope = np.minimum(1.0, np.minimum(t, duration - t) / fade)
+    tone = np.sin(2 * np.pi * frequency * t) * envelope * volume
+    return (tone * 32767).astype("<i2").tobytes()
+
+
+class PcmPlayer:
+    """
+    Queue PCM chunks into a persistent player process (or a WAV file in simulation).
+
+    `write()` waits while `max_chunks` chunks are already queued, which passes
+    backpressure on to whoever is producing audio. `flush()` drops everything
+    queued or playing and restarts the player in the background. Playback
+    progress is estimated from the bytes written, which is what queue depth and
+    underrun counts are based on.
+    """
+
+    def __init__(
+        self,
+        cmd: Optional[list[str]] = None,
+        *,
+        sink_path: Optional[Path] = None,
+        max_chunks: int = 8,
+    ):
+        self.cmd = cmd or DEFAULT_PLAYER_CMD
+        self.sink_path = sink_path
+        self._queue: asyncio.Queue[tuple[bytes, bool, int]] = asyncio.Queue(max_chunks)
+        # Bumped by flush(); chunks written before it are dropped wherever they wait.
+        self._generation = 0
+        self._queued_bytes = 0
+        self._process: Optional[asyncio.subprocess.Process] = None
+        # Killed players not yet reaped; flush() can't wait for them, stop() does.
+        self._killed: list[asyncio.subprocess.Process] = []
+        self._sink: Optional[wave.Wave_write] = None
+        self._spawning: Optional[asyncio.Task[None]] = None
+        self._writer: Optional[asyncio.Task[None]] = None
+        self._drained_at = 0.0
+        self._bytes_played = 0
+        self._underruns = 0
+        self._restarts = 0
+
+    @property
+    def simulated(self) -> bool:
+        return self.sink_path is not None
+
+    async def start(self) -> None:
+        if self._writer is not None:
+            return
+        if self.simulated:
+            self.sink_path.parent.mkdir(parents=True, exist_ok=True)
+            # Open for the player's whole lifetime; stop() closes it.
+            self._sink = wave.open(str(self.sink_path), "wb")  # noqa: SIM115
+            self._sink.setnchannels(1)
+            self._sink.setsampwidth(2)
+            self._sink.setframerate(PCM_RATE)
+        else:
+            await self._spawn()
+        self._writer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._writer is not None:
+            self._writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer
+            self._writer = None
+        if self._spawning is not None:
+            self._spawning.cancel()
+            with contextlib.suppress(Exception, asyncio.CancelledError):
+                await self._spawning
+            self._spawning = None
+        self._kill()
+        for process in self._killed:
+            await process.wait()
+        self._killed.clear()
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    async def write(self, pcm: bytes, *, continues: bool = False) -> None:
+        """
+        Queue `pcm` after everything already queued.
+
+        `continues` marks a chunk that follows on from the previous one within a
+        clip, so arriving after the player ran dry counts as an underrun.
+        """
+        if not pcm:
+            return
+        generation = self._generation
+        if self._writer is None:
+            await self.start()
+        await self._queue.put((pcm, continues, generation))
+        self._queued_bytes += len(pcm)
+
+    async def wait_idle(self) -> None:
+        """Wait until everything queued has been handed over and (on hardware) played."""
+        await self._queue.join()
+        if not self.simulated:
+            await asyncio.sleep(max(0.0, self._drained_at - time.monotonic()))
+
+    def flush(self) -> None:
+        """Drop queued and playing audio immediately; the player restarts in the background."""
+        self._generation += 1
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+        self._queued_bytes = 0
+        self._drained_at = time.monotonic()
+        if self._process is not None:
+            self._kill()
+            self._respawn()
+
+    def stats(self) -> PlayerStats:
+        ahead = max(0.0, self._drained_at - time.monotonic())
+        return PlayerStats(
+            queued_chunks=self._queue.qsize(),
+            queued_seconds=self._queued_bytes / PCM_BYTES_PER_SECOND + ahead,
+            seconds_played=self._bytes_played / PCM_BYTES_PER_SECOND,
+            underruns=self._underruns,
+            restarts=self._restarts,
+        )
+
+    async def _spawn(self) -> None:
+        started = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self.cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            logger.warning("Player %s not found; audio output disabled", self.cmd[0])
+            return
+        # A flush() during an earlier restart may have raced us; keep only the newest.
+        self._kill()
+        self._process = process
+        logger.debug(
+            "Audio player ready (pid=%s) in %.0f ms",
+            process.pid,
+            (time.perf_counter() - started) * 1000,
+        )
+
+    def _respawn(self) -> None:
+        self._restarts += 1
+        self._spawning = asyncio.create_task(self._spawn())
+
+    def _kill(self) -> None:
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            process.kill()
+            self._killed = [p for p in self._killed if p.returncode is None]
+            self._killed.append(process)
+
+    async def _run(self) -> None:
+        while True:
+            pcm, continues, generation = await self._queue.get()
+            try:
+                self._queued_bytes -= len(pcm)
+                await self._play(pcm, continues, generation)
+            except (BrokenPipeError, ConnectionResetError):
+                # Killed by flush() (already respawning) or died on its own.
+                if self._spawning is None:
+                    logger.warning("Audio player exited; restarting it")
+                    self._respawn()
+            except Exception:
+                # Keep draining the queue whatever happens, or writers and wait_idle() hang.
+                logger.exception("Audio player failed; restarting it")
+                if self._spawning is None:
+                    self._kill()
+                    self._respawn()
+            finally:
+                self._queue.task_done()
+
+    async def _play(self, pcm: bytes, continues: bool, generation: int) -> None:
+        spawning = self._spawning
+        if spawning is not None:
+            try:
+                await spawning
+            finally:
+                if self._spawning is spawning:
+                    self._spawning = None
+        if generation != self._generation:
+            return  # flushed while this chunk waited for a put or a restart
+        process = self._process
+        if self._sink is None and (process is None or process.stdin is None):
+            return
+
+        now = time.monotonic()
+        if continues and now > self._drained_at + UNDERRUN_SLACK_SECONDS:
+            self._underruns += 1
+            logger.debug("Playback underrun (%.0f ms gap)", (now - self._drained_at) * 1000)
+        self._drained_at = max(now, self._drained_at) + len(pcm) / PCM_BYTES_PER_SECOND
+        self._bytes_played += len(pcm)
+
+        if self._sink is not None:
+            self._sink.writeframes(pcm)
+            return
+        process.stdin.write(pcm)
+        await process.stdin.drain()
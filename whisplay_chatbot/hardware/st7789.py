@@ -0,0 +1,439 @@
+"""
+ST7789 command encoding shared by the real board and the emulator.
+
+`ST7789Commands` turns drawing calls into the controller's command/data stream;
+subclasses only supply the transport (`_write_command` / `_send_data`).
+`ST7789Emulator` decodes that same stream into frame memory, and `EmulatedBoard`
+wires the two together so display code can run and be measured without a Pi.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from PIL import Image
+
+from ..ui_utils import ImageUtils
+from .board import PixelData, PixelFormat
+
+logger = logging.getLogger(__name__)
+
+SLPOUT = 0x11
+INVON = 0x21
+DISPON = 0x29
+CASET = 0x2A
+RASET = 0x2B
+RAMWR = 0x2C
+VSCRDEF = 0x33
+MADCTL = 0x36
+VSCSAD = 0x37
+COLMOD = 0x3A
+
+# MADCTL row/column address order: host addresses are mirrored into frame memory.
+MADCTL_MY = 0x80
+MADCTL_MX = 0x40
+# Row/column exchange and vertical refresh order, which the emulator does not model.
+MADCTL_MV_ML = 0x30
+
+COLMOD_RGB444 = 0x03
+COLMOD_RGB565 = 0x05
+_COLMODS: dict[str, int] = {"rgb444": COLMOD_RGB444, "rgb565": COLMOD_RGB565}
+
+FRAME_MEMORY_WIDTH = 240
+FRAME_MEMORY_ROWS = 320
+
+# Porch, gate, VCOM, power and gamma settings for the Whisplay panel.
+_PANEL_SETUP: tuple[tuple[int, ...], ...] = (
+    (0xB2, 0x0C, 0x0C, 0x00, 0x33, 0x33),
+    (0xB7, 0x35),
+    (0xBB, 0x32),
+    (0xC2, 0x01),
+    (0xC3, 0x15),
+    (0xC4, 0x20),
+    (0xC6, 0x0F),
+    (0xD0, 0xA4, 0xA1),
+    (0xE0, 0xD0, 0x08, 0x0E, 0x09, 0x09, 0x05, 0x31, 0x33, 0x48, 0x17, 0x14, 0x15, 0x31, 0x34),
+    (0xE1, 0xD0, 0x08, 0x0E, 0x09, 0x09, 0x15, 0x31, 0x33, 0x48, 0x17, 0x14, 0x15, 0x31, 0x34),
+)
+
+
+def _u16(value: int) -> tuple[int, int]:
+    return value >> 8, value & 0xFF
+
+
+@lru_cache(maxsize=4)
+def _solid_pixels(color: int, nbytes: int) -> bytes:
+    """Big-endian RGB565 `color` repeated to `nbytes`; fills send slices of it."""
+    return bytes((color >> 8 & 0xFF, color & 0xFF)) * (nbytes // 2)
+
+
+class ST7789Commands(ABC):
+    """Drawing and scrolling for a 240x280 ST7789 panel, expressed as controller commands."""
+
+    LCD_WIDTH = 240
+    LCD_HEIGHT = 280
+    CornerHeight = 20
+    # The 280-row panel sits 20 rows into the controller's 320-row frame memory.
+    FRAME_MEMORY_ROWS = FRAME_MEMORY_ROWS
+    ROW_OFFSET = 20
+
+    _madctl = 0
+    _scroll_area: Optional[tuple[int, int]] = None
+    _pixel_format: PixelFormat = "rgb565"
+
+    @abstractmethod
+    def _write_command(self, cmd: int) -> None: ...
+
+    @abstractmethod
+    def _send_data(self, data) -> None: ...
+
+    def _delay(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def _send_command(self, cmd, *args):
+        self._write_command(cmd)
+        if args:
+            self._send_data(bytes(args))
+
+    def _init_display(self):
+        self._send_command(SLPOUT)
+        self._delay(0.12)
+        USE_HORIZONTAL = 1
+        direction = {0: 0x00, 1: 0xC0, 2: 0x70, 3: 0xA0}.get(USE_HORIZONTAL, 0x00)
+        self._send_command(MADCTL, direction)
+        self._madctl = direction
+        self._send_command(COLMOD, COLMOD_RGB565)
+        self._pixel_format = "rgb565"
+        for cmd, *args in _PANEL_SETUP:
+            self._send_command(cmd, *args)
+        self._send_command(INVON)
+        self._send_command(DISPON)
+
+    def set_window(self, x0, y0, x1, y1, use_horizontal=0):
+        if use_horizontal in (0, 1):
+            self._send_command(CASET, *_u16(x0), *_u16(x1))
+            self._send_command(RASET, *_u16(y0 + self.ROW_OFFSET), *_u16(y1 + self.ROW_OFFSET))
+        elif use_horizontal in (2, 3):
+            self._send_command(CASET, *_u16(x0 + self.ROW_OFFSET), *_u16(x1 + self.ROW_OFFSET))
+            self._send_command(RASET, *_u16(y0), *_u16(y1))
+        self._send_command(RAMWR)
+
+    def set_pixel_format(self, pixel_format: PixelFormat) -> None:
+        """Switch the interface colour depth (COLMOD); a no-op if already selected."""
+        if pixel_format != self._pixel_format:
+            self._send_command(COLMOD, _COLMODS[pixel_format])
+            self._pixel_format = pixel_format
+
+    def draw_image(self, x, y, width, height, pixel_data, pixel_format="rgb565"):
+        if (x + width > self.LCD_WIDTH) or (y + height > self.LCD_HEIGHT):
+            raise ValueError("Image size exceeds screen bounds")
+        self.set_pixel_format(pixel_format)
+        self.set_window(x, y, x + width - 1, y + height - 1)
+        self._send_data(pixel_data)
+
+    def fill_rect(self, x, y, width, height, color):
+        if (x + width > self.LCD_WIDTH) or (y + height > self.LCD_HEIGHT):
+            raise ValueError("Fill exceeds screen bounds")
+        self.set_pixel_format("rgb565")
+        self.set_window(x, y, x + width - 1, y + height - 1)
+        solid = _solid_pixels(color, self.LCD_WIDTH * self.LCD_HEIGHT * 2)
+        self._send_data(memoryview(solid)[: width * height * 2])
+
+    def fill_screen(self, color):
+        self.fill_rect(0, 0, self.LCD_WIDTH, self.LCD_HEIGHT, color)
+
+    def define_scroll_area(self, top, height):
+        if top < 0 or height <= 0 or top + height > self.LCD_HEIGHT:
+            raise ValueError("Scroll area exceeds screen bounds")
+        # Top fixed, scrolling and bottom fixed areas must cover all frame memory rows.
+        top_fixed = top + self.ROW_OFFSET
+        bottom_fixed = self.FRAME_MEMORY_ROWS - top_fixed - height
+        if self._madctl & MADCTL_MY:
+            # The scroll registers count frame memory rows, which MY stores bottom-up.
+            top_fixed, bottom_fixed = bottom_fixed, top_fixed
+        self._send_command(VSCRDEF, *_u16(top_fixed), *_u16(height), *_u16(bottom_fixed))
+        self._scroll_area = (top_fixed, height)
+        self.set_scroll_start(0)
+
+    def set_scroll_start(self, line):
+        """Show the scrolling area's content from `line` rows down at its top."""
+        if self._scroll_area is None:
+            raise RuntimeError("Scroll area is not defined")
+        top_fixed, height = self._scroll_area
+        # Frame memory row shown at the top of the scrolling area; with MY the
+        # content moves up the screen by moving down frame memory.
+        step = -line if self._madctl & MADCTL_MY else line
+        self._send_command(VSCSAD, *_u16(top_fixed + step % height))
+
+
+@dataclass(frozen=True, slots=True)
+class BusStats:
+    bytes: int
+    command_bytes: int
+    data_bytes: int
+    transactions: int
+    ram_writes: int
+    frames: int
+    fps: float
+
+
+class ST7789Emulator:
+    """
+    Decodes an ST7789 command/data stream into frame memory.
+
+    Models the address space the host writes to (CASET/RASET windows, RAMWR with
+    pointer wrap, COLMOD, VSCRDEF/VSCSAD scrolling). MADCTL MY/MX mirror host rows
+    and columns into frame memory, while the scroll registers address frame memory
+    directly, as on the controller; MV and ML are not simulated. `screen()` shows
+    the glass in host orientation. Every command or data burst counts as one SPI
+    transaction. Bursts of RAMWR/VSCSAD closer together than `frame_gap`
+    seconds are counted as a single frame, which matches one present() per frame.
+    """
+
+    def __init__(
+        self,
+        width: int = FRAME_MEMORY_WIDTH,
+        rows: int = FRAME_MEMORY_ROWS,
+        *,
+        frame_gap: float = 0.005,
+    ):
+        self.width = width
+        self.rows = rows
+        self.frame_gap = frame_gap
+        self.memory = np.zeros((rows, width), dtype=np.uint16)
+        self.madctl = 0
+        self.colmod = COLMOD_RGB565
+        self.sleeping = True
+        self.display_on = False
+        self.scroll: Optional[tuple[int, int, int]] = None
+        self.scroll_start = 0
+        self._columns = (0, width - 1)
+        self._rows = (0, rows - 1)
+        self._pointer: Optional[int] = None
+        self._pending = b""
+        self._command: Optional[int] = None
+        self._args = bytearray()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self._command_bytes = 0
+        self._data_bytes = 0
+        self._transactions = 0
+        self._ram_writes = 0
+        self._frames = 0
+        self._first_frame: Optional[float] = None
+        self._last_update: Optional[float] = None
+
+    def stats(self) -> BusStats:
+        elapsed = (
+            self._last_update - self._first_frame
+            if self._first_frame is not None and self._last_update is not None
+            else 0.0
+        )
+        return BusStats(
+            bytes=self._command_bytes + self._data_bytes,
+            command_bytes=self._command_bytes,
+            data_bytes=self._data_bytes,
+            transactions=self._transactions,
+            ram_writes=self._ram_writes,
+            frames=self._frames,
+            fps=(self._frames - 1) / elapsed if elapsed > 0 else 0.0,
+        )
+
+    def command(self, cmd: int) -> None:
+        self._finish_command()
+        self._transactions += 1
+        self._command_bytes += 1
+        self._command = cmd
+        self._args.clear()
+        if cmd == RAMWR:
+            self._pointer = 0
+            self._pending = b""
+            self._mark_update()
+        elif cmd == SLPOUT:
+            self.sleeping = False
+        elif cmd == DISPON:
+            self.display_on = True
+
+    def data(self, data: Union[PixelData, Sequence[int]]) -> None:
+        payload = bytes(data) if isinstance(data, list) else memoryview(data).cast("B")
+        self._transactions += 1
+        if self._command == RAMWR:
+            self._data_bytes += len(payload)
+            self._write_pixels(payload)
+        else:
+            self._command_bytes += len(payload)
+            self._args.extend(payload)
+            self._apply_args()
+
+    def _finish_command(self) -> None:
+        self._pointer = None
+        self._command = None
+
+    def _apply_args(self) -> None:
+        cmd, args = self._command, self._args
+        if cmd == CASET and len(args) >= 4:
+            self._columns = (args[0] << 8 | args[1], args[2] << 8 | args[3])
+        elif cmd == RASET and len(args) >= 4:
+            self._rows = (args[0] << 8 | args[1], args[2] << 8 | args[3])
+        elif cmd == COLMOD and args:
+            self.colmod = args[0] & 0x07
+            if self.colmod not in (COLMOD_RGB444, COLMOD_RGB565):
+                logger.warning("Emulator cannot decode pixels for COLMOD 0x%02x", args[0])
+        elif cmd == MADCTL and args:
+            self.madctl = args[0]
+            if self.madctl & MADCTL_MV_ML:
+                logger.warning("Emulator ignores MADCTL MV/ML in 0x%02x", self.madctl)
+        elif cmd == VSCRDEF and len(args) >= 6:
+            top, height, bottom = (args[i] << 8 | args[i + 1] for i in (0, 2, 4))
+            if top + height + bottom != self.rows:
+                logger.warning("VSCRDEF areas sum to %s, not %s", top + height + bottom, self.rows)
+            self.scroll = (top, height, bottom)
+        elif cmd == VSCSAD and len(args) >= 2:
+            self.scroll_start = args[0] << 8 | args[1]
+            self._mark_update()
+
+    def _write_pixels(self, payload) -> None:
+        if self._pointer is None or self.colmod not in (COLMOD_RGB444, COLMOD_RGB565):
+            return
+        # Transfers can split a pixel (or an RGB444 pixel pair); carry the remainder.
+        unit = 3 if self.colmod == COLMOD_RGB444 else 2
+        raw = self._pending + bytes(payload)
+        usable = len(raw) - len(raw) % unit
+        raw, self._pending = raw[:usable], raw[usable:]
+        if self.colmod == COLMOD_RGB444:
+            pixels = ImageUtils.rgb444_pixel_data_to_rgb565_array(raw)
+        else:
+            pixels = np.frombuffer(raw, dtype=">u2")
+
+        x0, x1 = self._columns
+        y0, y1 = self._rows
+        width, height = x1 - x0 + 1, y1 - y0 + 1
+        if width <= 0 or height <= 0:
+            return
+        index, remaining = 0, pixels.size
+        while remaining:
+            # Writes past the end of the window wrap back to its first pixel.
+            row, col = divmod(self._pointer % (width * height), width)
+            if col or remaining < width:
+                run = min(remaining, width - col)
+                block = pixels[index : index + run].reshape(1, run)
+            else:
+                full_rows = min(remaining // width, height - row)
+                run = full_rows * width
+                block = pixels[index : index + run].reshape(full_rows, width)
+            self._store(y0 + row, x0 + col, block)
+            index += run
+            remaining -= run
+            self._pointer += run
+
+    def _store(self, y: int, x: int, block: np.ndarray) -> None:
+        height, width = block.shape
+        rows = min(height, self.rows - y)
+        cols = min(width, self.width - x)
+        if rows <= 0 or cols <= 0:
+            return
+        block = block[:rows, :cols]
+        if self.madctl & MADCTL_MY:
+            y, block = self.rows - y - rows, block[::-1]
+        if self.madctl & MADCTL_MX:
+            x, block = self.width - x - cols, block[:, ::-1]
+        self.memory[y : y + rows, x : x + cols] = block
+
+    def _mark_update(self) -> None:
+        now = time.monotonic()
+        if self._command == RAMWR:
+            self._ram_writes += 1
+        if self._last_update is None or now - self._last_update > self.frame_gap:
+            self._frames += 1
+            if self._first_frame is None:
+                self._first_frame = now
+        self._last_update = now
+
+    def displayed_rows(self) -> np.ndarray:
+        """Frame memory row shown on each gate line (top of the glass first), after scrolling."""
+        rows = np.arange(self.rows)
+        if self.scroll is not None:
+            top, height, _ = self.scroll
+            start = self.scroll_start if top <= self.scroll_start < top + height else top
+            rows[top : top + height] = top + (start - top + np.arange(height)) % height
+        return rows
+
+    def screen(self, row_offset: int = 0, height: Optional[int] = None) -> np.ndarray:
+        """Visible RGB565 pixels for the host rows starting at `row_offset`."""
+        rows = self.displayed_rows()
+        if self.madctl & MADCTL_MY:
+            rows = rows[::-1]
+        pixels = self.memory[rows[row_offset : row_offset + (height or self.rows)]]
+        return pixels[:, ::-1] if self.madctl & MADCTL_MX else pixels
+
+    def snapshot(self, row_offset: int = 0, height: Optional[int] = None) -> Image.Image:
+        pixels = self.screen(row_offset, height)
+        rgb = np.empty(pixels.shape + (3,), dtype=np.uint8)
+        rgb[..., 0] = ((pixels >> 11) & 0x1F) * 255 // 31
+        rgb[..., 1] = ((pixels >> 5) & 0x3F) * 255 // 63
+        rgb[..., 2] = (pixels & 0x1F) * 255 // 31
+        return Image.fromarray(rgb, "RGB")
+
+
+class EmulatedBoard(ST7789Commands):
+    """
+    Board that runs the real command encoding against an `ST7789Emulator`.
+
+    LEDs, backlight and buttons behave like `MockBoard`; the display side can be
+    inspected with `screen()`, saved with `save_snapshot()` and measured with `stats()`.
+    """
+
+    def __init__(self, emulator: Optional[ST7789Emulator] = None):
+        self.emulator = emulator or ST7789Emulator()
+        self.backlight = 100
+        self.rgb = (0, 0, 0)
+        self._init_display()
+        self.fill_screen(0)
+        self.emulator.reset_stats()
+
+    def _write_command(self, cmd: int) -> None:
+        self.emulator.command(cmd)
+
+    def _send_data(self, data) -> None:
+        self.emulator.data(data)
+
+    def _delay(self, seconds: float) -> None:
+        pass
+
+    def screen(self) -> np.ndarray:
+        return self.emulator.screen(self.ROW_OFFSET, self.LCD_HEIGHT)
+
+    def save_snapshot(self, path: Path) -> Path:
+        self.emulator.snapshot(self.ROW_OFFSET, self.LCD_HEIGHT).save(path)
+        return path
+
+    def stats(self) -> BusStats:
+        return self.emulator.stats()
+
+    def set_backlight(self, brightness: int) -> None:
+        self.backlight = brightness
+
+    def set_rgb(self, r: int, g: int, b: int) -> None:
+        self.rgb = (r, g, b)
+
+    def set_rgb_fade(
+        self, r_target: int, g_target: int, b_target: int, duration_ms: int = 100
+    ) -> None:
+        self.set_rgb(r_target, g_target, b_target)
+
+    def on_button_press(self, callback) -> None:
+        logger.debug("[EMULATOR] on_button_press registered %s", callback)
+
+    def on_button_release(self, callback) -> None:
+        logger.debug("[EMULATOR] on_button_release registered %s", callback)
+
+    def cleanup(self) -> None:
+        logger.info("[EMULATOR] cleanup: %s", self.stats())
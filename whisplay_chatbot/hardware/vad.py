@@ -0,0 +1,164 @@
+"""
+Energy / zero-crossing voice activity detection over captured PCM.
+
+Audio is cut into 20 ms frames. A frame is speech when it is well above the
+noise floor (the quietest frame of the last few seconds), or somewhat above it
+with a high zero-crossing rate (unvoiced sounds like "s" and "f" carry little
+energy). Speech starts after a short run of speech frames; a little audio is
+kept either side of it and the rest of the silence is dropped. A recording
+without such a run has no speech at all, and is never uploaded.
+
+Until speech starts, the first frames are re-judged whenever the floor drops.
+Without pre-roll (the first press after capture starts) a recording can open
+with speech, which would otherwise set the floor itself and be lost; the first
+pause then reveals the real floor and the opening words are kept.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import AsyncIterator, Optional
+
+import numpy as np
+
+from .capture import CAPTURE_RATE
+
+FRAME_SECONDS = 0.02
+
+
+def frame_features(pcm: bytes, frame_bytes: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame energy (dBFS) and zero-crossing rate for the whole frames in `pcm`."""
+    count = len(pcm) // frame_bytes
+    samples = np.frombuffer(pcm, dtype="<i2", count=count * frame_bytes // 2)
+    frames = samples.reshape(count, -1).astype(np.float32) / 32768.0
+    energy = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return energy, zcr
+
+
+class _Gate:
+    """Frame-by-frame speech gating, shared by the offline and streaming paths."""
+
+    def __init__(self, vad: VoiceActivityDetector):
+        self.vad = vad
+        self.recent: deque[float] = deque(maxlen=vad.floor_frames)
+        self.started = False
+        # Frames before speech starts, with their features, so they can be re-judged.
+        lead_frames = max(vad.seed_frames, vad.pad_frames + vad.onset_frames)
+        self.lead: deque[tuple[bytes, float, float]] = deque(maxlen=lead_frames)
+        # Verdicts for the lead frames and the floor they were reached against.
+        self.verdicts: deque[bool] = deque(maxlen=lead_frames)
+        self.judged_floor: Optional[float] = None
+        self.held: list[bytes] = []
+
+    def is_speech(self, energy: float, zcr: float, floor: Optional[float] = None) -> bool:
+        vad = self.vad
+        above = energy - (min(self.recent) if floor is None else floor)
+        return energy >= vad.min_energy_db and (
+            above >= vad.margin_db or (above >= vad.margin_db / 2 and zcr >= vad.fricative_zcr)
+        )
+
+    def push(self, frame: bytes, energy: float, zcr: float) -> list[bytes]:
+        self.recent.append(energy)
+        if not self.started:
+            self.lead.append((frame, energy, zcr))
+            return self._start()
+        speech = self.is_speech(energy, zcr)
+        if not speech:
+            self.held.append(frame)
+            return []
+        out, self.held = [*self.held, frame], []
+        return out
+
+    def _start(self) -> list[bytes]:
+        """Look for an onset among the lead frames against the current floor."""
+        floor = min(self.recent)
+        _, energy, zcr = self.lead[-1]
+        if floor == self.judged_floor:
+            self.verdicts.append(self.is_speech(energy, zcr, floor))
+        else:
+            self.verdicts.clear()
+            self.verdicts.extend(self.is_speech(e, z, floor) for _, e, z in self.lead)
+            self.judged_floor = floor
+        speech = self.verdicts
+        onset_frames, run = self.vad.onset_frames, 0
+        for index, is_speech in enumerate(speech):
+            run = run + 1 if is_speech else 0
+            if run == onset_frames:
+                break
+        else:
+            return []
+        self.started = True
+        first = max(0, index + 1 - onset_frames - self.vad.pad_frames)
+        last = max(i for i, is_speech in enumerate(speech) if is_speech)
+        frames = [frame for frame, _, _ in self.lead]
+        self.lead.clear()
+        self.verdicts.clear()
+        # Silence after the last speech frame is held back like any later pause.
+        self.held = frames[last + 1 :]
+        return frames[first : last + 1]
+
+    def finish(self) -> list[bytes]:
+        return self.held[: self.vad.pad_frames] if self.started else []
+
+
+class VoiceActivityDetector:
+    def __init__(
+        self,
+        rate: int = CAPTURE_RATE,
+        *,
+        margin_db: float = 12.0,
+        min_energy_db: float = -55.0,
+        fricative_zcr: float = 0.3,
+        floor_ms: int = 3000,
+        onset_ms: int = 100,
+        pad_ms: int = 200,
+        seed_ms: int = 1000,
+    ):
+        self.frame_bytes = int(rate * FRAME_SECONDS) * 2
+        self.margin_db = margin_db
+        self.min_energy_db = min_energy_db
+        self.fricative_zcr = fricative_zcr
+        self.floor_frames = max(1, round(floor_ms / 1000 / FRAME_SECONDS))
+        self.onset_frames = max(1, round(onset_ms / 1000 / FRAME_SECONDS))
+        self.pad_frames = round(pad_ms / 1000 / FRAME_SECONDS)
+        # How far back the opening frames are re-judged while the floor settles.
+        self.seed_frames = round(seed_ms / 1000 / FRAME_SECONDS)
+
+    def trim(self, pcm: bytes) -> Optional[bytes]:
+        """`pcm` without leading/trailing silence, or None if it holds no speech."""
+        gate = _Gate(self)
+        out = self._push_all(gate, pcm)
+        out += gate.finish()
+        return b"".join(out) if gate.started else None
+
+    async def gate(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Pass through only the speech in a live stream.
+
+        Nothing is yielded before speech starts, and silence is held back until
+        more speech follows it, so a press without speech yields nothing.
+        """
+        gate = _Gate(self)
+        pending = b""
+        async for chunk in chunks:
+            pending += chunk
+            whole = len(pending) - len(pending) % self.frame_bytes
+            out = self._push_all(gate, pending[:whole])
+            pending = pending[whole:]
+            if out:
+                yield b"".join(out)
+        out = gate.finish()
+        if out:
+            yield b"".join(out)
+
+    def _push_all(self, gate: _Gate, pcm: bytes) -> list[bytes]:
+        if len(pcm) < self.frame_bytes:
+            return []
+        energy, zcr = frame_features(pcm, self.frame_bytes)
+        out: list[bytes] = []
+        for index, (frame_energy, frame_zcr) in enumerate(zip(energy.tolist(), zcr.tolist())):
+            frame = pcm[index * self.frame_bytes : (index + 1) * self.frame_bytes]
+            out.extend(gate.push(frame, frame_energy, frame_zcr))
+        return out
@@ -12,7 +12,7 @@ from typing import Optional
 import typer
 
 from .app import run_chatbot
-from .config import get_settings
+from .config import EMOJI_ATLAS_DIR, EMOJI_DIR, get_settings
 
 app = typer.Typer(add_completion=False, rich_markup_mode="markdown")
 
@@ -89,5 +89,20 @@ def simulate(
     _run_async(simulate=True, log_level=log_level, log_file=log_file)
 
 
+@app.command("build-emoji-atlas")
+def build_emoji_atlas_command(
+    emoji_dir: Path = typer.Option(EMOJI_DIR, help="Directory of emoji SVGs to rasterise."),
+    output_dir: Path = typer.Option(EMOJI_ATLAS_DIR, help="Where to write the atlas."),
+) -> None:
+    """
+    Pre-render the emoji SVG set into the memory-mapped atlas used at runtime.
+    """
+
+    from .emoji_atlas import build_emoji_atlas
+
+    built = build_emoji_atlas(emoji_dir=emoji_dir, output_dir=output_dir)
+    typer.echo(f"Emoji atlas written to {built}")
+
+
 def main() -> None:
     app()
@@ -30,12 +30,20 @@ def build_runtime(settings: ChatbotSettings) -> RuntimeArtifacts:
     board = create_board(force_mock=settings.enable_simulation)
     using_mock_board = isinstance(board, MockBoard)
 
-    display = DisplayController(board)
+    display = DisplayController(
+        board,
+        fps=settings.display_fps,
+        hardware_scroll=settings.display_hardware_scroll,
+        pixel_format=settings.display_text_pixel_format,
+    )
     led = LedAnimator(board)
     simulate_controls = settings.enable_simulation or using_mock_board
     controls = ControlManager(board, simulate=simulate_controls)
-    audio = AudioManager(simulate=settings.enable_simulation or using_mock_board)
-    transcriber = OpenAITranscriber()
+    audio = AudioManager(
+        simulate=settings.enable_simulation or using_mock_board,
+        preroll_seconds=settings.record_preroll_ms / 1000,
+    )
+    transcriber = OpenAITranscriber(upload_format=settings.upload_format)
     llm = OpenAIChatModel()
     tts = OpenAITts()
     persona_manager = PersonaManager()
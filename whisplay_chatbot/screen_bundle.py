@@ -0,0 +1,122 @@
+"""
+Pre-rendered full-screen RGB565 frames, cached on disk and memory-mapped at startup.
+
+Frames are keyed by a hash of what they show; a bundle file is named after a
+fingerprint of everything that affects rendering (fonts, logo, emoji atlas,
+layout), so a change to any of them simply produces a new bundle.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Mapping, Optional, Union
+
+import numpy as np
+
+from .config import SCREEN_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+SCREEN_BUNDLE_VERSION = 1
+
+
+def content_hash(*parts: Union[str, bytes, int, None]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(json.dumps(part, ensure_ascii=False).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_fingerprint(paths: Iterable[Optional[Path]]) -> str:
+    """Content hash of the given files; missing files hash as absent."""
+    return content_hash(
+        SCREEN_BUNDLE_VERSION,
+        *(path.read_bytes() if path is not None and path.exists() else None for path in paths),
+    )
+
+
+class ScreenBundle:
+    """Fixed-size RGB565 frames stored back to back, looked up by content key."""
+
+    def __init__(self, frames: np.ndarray, index: dict[str, int], fingerprint: str):
+        self._frames = frames
+        self._index = index
+        self.fingerprint = fingerprint
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """The frame as a read-only (height, width) view, or None."""
+        slot = self._index.get(key)
+        return None if slot is None else self._frames[slot]
+
+    @staticmethod
+    def _paths(directory: Path, fingerprint: str) -> tuple[Path, Path]:
+        stem = f"screens-{fingerprint[:16]}"
+        return directory / f"{stem}.rgb565", directory / f"{stem}.json"
+
+    @classmethod
+    def load(
+        cls, fingerprint: str, width: int, height: int, directory: Path = SCREEN_CACHE_DIR
+    ) -> Optional["ScreenBundle"]:
+        data_path, index_path = cls._paths(directory, fingerprint)
+        if not data_path.exists() or not index_path.exists():
+            return None
+        try:
+            raw = json.loads(index_path.read_text())
+        except json.JSONDecodeError:
+            logger.warning("Ignoring corrupt screen bundle index at %s", index_path)
+            return None
+        if raw.get("fingerprint") != fingerprint or raw.get("shape") != [height, width]:
+            return None
+        index = raw["frames"]
+        if not index:
+            return cls(np.zeros((0, height, width), dtype=np.uint16), {}, fingerprint)
+        frames = np.memmap(data_path, dtype=np.uint16, mode="r", shape=(len(index), height, width))
+        return cls(frames, index, fingerprint)
+
+    @classmethod
+    def write(
+        cls,
+        fingerprint: str,
+        frames: Mapping[str, np.ndarray],
+        width: int,
+        height: int,
+        directory: Path = SCREEN_CACHE_DIR,
+    ) -> "ScreenBundle":
+        """Write `frames` as this fingerprint's bundle, replacing stale bundles."""
+        directory.mkdir(parents=True, exist_ok=True)
+        data_path, index_path = cls._paths(directory, fingerprint)
+        tmp_path = data_path.with_suffix(".tmp")
+        index: dict[str, int] = {}
+        with tmp_path.open("wb") as handle:
+            for slot, (key, frame) in enumerate(frames.items()):
+                if frame.shape != (height, width):
+                    raise ValueError(f"Frame {key} is {frame.shape}, expected {(height, width)}")
+                handle.write(np.ascontiguousarray(frame, dtype=np.uint16).tobytes())
+                index[key] = slot
+        tmp_path.replace(data_path)
+        index_path.write_text(
+            json.dumps({"fingerprint": fingerprint, "shape": [height, width], "frames": index})
+        )
+
+        for stale in directory.glob("screens-*"):
+            if stale not in (data_path, index_path):
+                stale.unlink(missing_ok=True)
+        logger.info(
+            "Wrote screen bundle with %s frames (%s bytes)", len(index), data_path.stat().st_size
+        )
+        return cls.load(fingerprint, width, height, directory) or cls(
+            np.zeros((0, height, width), dtype=np.uint16), {}, fingerprint
+        )
@@ -1,12 +1,13 @@
 """Service adapters for cloud integrations."""
 
-from .openai_client import get_openai_client
+from .openai_client import get_async_openai_client, get_openai_client
 from .asr import OpenAITranscriber
 from .llm import OpenAIChatModel
 from .tts import OpenAITts
 
 __all__ = [
     "get_openai_client",
+    "get_async_openai_client",
     "OpenAITranscriber",
     "OpenAIChatModel",
     "OpenAITts",
@@ -5,22 +5,95 @@ Speech-to-text helpers backed by OpenAI.
 from __future__ import annotations
 
 import asyncio
+import uuid
 from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import httpx
 
 from ..config import get_settings
-from .openai_client import get_openai_client
+from .openai_client import get_async_openai_client, get_openai_client
+from .upload_codec import UploadFormat, encode_stream, get_stream_codec
 
 
 class OpenAITranscriber:
-    def __init__(self, *, model: str | None = None):
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        upload_format: UploadFormat = "flac",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         settings = get_settings()
         self.client = get_openai_client()
         self.model = model or settings.openai_settings.stt_model
+        self.stream_codec = get_stream_codec(upload_format)
+        # Streaming uploads go through httpx directly: the SDK wants the whole file
+        # up front. `transport` lets tests stand in for the API.
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+
+    @property
+    def can_stream(self) -> bool:
+        return self.stream_codec is not None
 
     async def transcribe(self, audio_path: Path) -> str:
         audio_path = audio_path.expanduser()
         return await asyncio.to_thread(self._transcribe_sync, audio_path)
 
+    async def transcribe_stream(self, pcm: AsyncIterator[bytes]) -> str:
+        """
+        Transcribe 16 kHz 16-bit mono PCM while it is still being captured.
+
+        The request body is a chunked multipart upload that forwards audio as
+        `pcm` yields it, encoded as FLAC or Ogg Opus (see `get_stream_codec`),
+        so only the tail is left to send once capture ends.
+        """
+        codec = self.stream_codec
+        if codec is None:
+            raise RuntimeError("No encoder installed to stream speech with")
+        api = get_async_openai_client()
+        boundary = uuid.uuid4().hex
+
+        async def body() -> AsyncIterator[bytes]:
+            for name, value in (("model", self.model), ("response_format", "text")):
+                yield (
+                    f"--{boundary}\r\n"
+                    f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                    f"{value}\r\n"
+                ).encode()
+            yield (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="{codec.filename}"\r\n'
+                f"Content-Type: {codec.content_type}\r\n\r\n"
+            ).encode()
+            async for chunk in encode_stream(codec, pcm):
+                yield chunk
+            yield f"\r\n--{boundary}--\r\n".encode()
+
+        response = await self._client().post(
+            str(api.base_url).rstrip("/") + "/audio/transcriptions",
+            content=body(),
+            headers={
+                "Authorization": f"Bearer {api.api_key}",
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+            },
+        )
+        response.raise_for_status()
+        return response.text.strip()
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                transport=self._transport, timeout=httpx.Timeout(30.0, connect=5.0)
+            )
+        return self._http
+
     def _transcribe_sync(self, audio_path: Path) -> str:
         with audio_path.open("rb") as audio_file:
             response = self.client.audio.transcriptions.create(
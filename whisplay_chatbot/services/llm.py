@@ -5,16 +5,17 @@ LLM chat helpers for GPT-5-mini.
 from __future__ import annotations
 
 import asyncio
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 
 from ..config import get_settings
-from .openai_client import get_openai_client
+from .openai_client import get_async_openai_client, get_openai_client
 
 
 class OpenAIChatModel:
     def __init__(self, *, model: str | None = None, temperature: float | None = None):
         settings = get_settings()
         self.client = get_openai_client()
+        self.async_client = get_async_openai_client()
         self.model = model or settings.openai_settings.llm_model
         self.temperature = temperature or settings.openai_settings.response_temperature
 
@@ -28,3 +29,19 @@ class OpenAIChatModel:
         )
         content = response.choices[0].message.content
         return content.strip() if content else ""
+
+    async def stream(self, messages: Iterable[dict]) -> AsyncIterator[str]:
+        """Yield the reply's text deltas as they arrive."""
+        stream = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=list(messages),
+            temperature=self.temperature,
+            stream=True,
+        )
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
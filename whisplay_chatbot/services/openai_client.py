@@ -6,7 +6,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from ..config import get_settings
 
@@ -18,3 +18,12 @@ def get_openai_client() -> OpenAI:
         api_key=settings.openai_api_key,
         base_url=settings.openai_base_url,
     )
+
+
+@lru_cache
+def get_async_openai_client() -> AsyncOpenAI:
+    settings = get_settings()
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url,
+    )
@@ -1,19 +1,27 @@
 """
 Text-to-speech helper for GPT-5-mini voice.
+
+Audio defaults to raw 24 kHz 16-bit mono PCM, which the persistent player
+consumes directly.
 """
 
 from __future__ import annotations
 
 import asyncio
+from typing import AsyncIterator
 
 from ..config import get_settings
-from .openai_client import get_openai_client
+from .openai_client import get_async_openai_client, get_openai_client
+
+# Small enough that the player gets its first frames after a few kilobytes.
+STREAM_CHUNK_BYTES = 4096
 
 
 class OpenAITts:
-    def __init__(self, *, model: str | None = None, voice: str | None = None, format: str = "mp3"):
+    def __init__(self, *, model: str | None = None, voice: str | None = None, format: str = "pcm"):
         settings = get_settings()
         self.client = get_openai_client()
+        self.async_client = get_async_openai_client()
         self.model = model or settings.openai_settings.tts_model
         self.voice = voice or settings.openai_settings.tts_voice
         self.format = format
@@ -21,12 +29,23 @@ class OpenAITts:
     async def synthesize(self, text: str) -> bytes:
         return await asyncio.to_thread(self._synthesize_sync, text)
 
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        """Yield the encoded audio for `text` as it arrives, without buffering it whole."""
+        async with self.async_client.audio.speech.with_streaming_response.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format=self.format,
+        ) as response:
+            async for chunk in response.iter_bytes(STREAM_CHUNK_BYTES):
+                yield chunk
+
     def _synthesize_sync(self, text: str) -> bytes:
         response = self.client.audio.speech.create(
             model=self.model,
             voice=self.voice,
             input=text,
-            format=self.format,
+            response_format=self.format,
         )
         if hasattr(response, "read"):
             return response.read()
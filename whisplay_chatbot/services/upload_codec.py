@@ -0,0 +1,111 @@
+"""
+Encoders for speech uploads: 16 kHz mono PCM in, an uploadable file stream out.
+
+FLAC (lossless, roughly half the size of WAV) and Opus in Ogg (lossy, a few KB
+per second of speech) run the `flac` / `opusenc` command-line encoders as a
+pipe, so audio is encoded and uploaded as it is captured. Both formats leave
+the length of a stream open (FLAC records zero total samples when the encoder
+can't seek back). A WAV header has to state the size of the data before any
+of it, so WAV is uploaded as a finished file after release instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import shutil
+from dataclasses import dataclass
+from typing import AsyncIterator, Literal, Optional
+
+logger = logging.getLogger(__name__)
+
+UploadFormat = Literal["wav", "flac", "opus"]
+UPLOAD_RATE = 16_000
+OPUS_BITRATE_KBPS = 16
+ENCODER_READ_BYTES = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class UploadCodec:
+    name: UploadFormat
+    filename: str
+    content_type: str
+    # Reads raw s16le mono PCM on stdin, writes the encoded stream to stdout.
+    cmd: Optional[tuple[str, ...]] = None
+
+
+CODECS: dict[str, UploadCodec] = {
+    "wav": UploadCodec("wav", "speech.wav", "audio/wav"),
+    "flac": UploadCodec(
+        "flac",
+        "speech.flac",
+        "audio/flac",
+        (
+            "flac", "--silent", "--stdout", "--force-raw-format", "--endian=little",
+            "--sign=signed", "--channels=1", "--bps=16", f"--sample-rate={UPLOAD_RATE}", "-",
+        ),
+    ),
+    "opus": UploadCodec(
+        "opus",
+        "speech.ogg",
+        "audio/ogg",
+        (
+            "opusenc", "--quiet", "--raw", "--raw-bits", "16", "--raw-rate", str(UPLOAD_RATE),
+            "--raw-chan", "1", "--bitrate", str(OPUS_BITRATE_KBPS), "-", "-",
+        ),
+    ),
+}  # fmt: skip
+
+
+def get_stream_codec(name: str) -> Optional[UploadCodec]:
+    """The codec called `name` to stream with, or None to upload a finished WAV instead."""
+    codec = CODECS[name]
+    if codec.cmd is None:
+        return None
+    if shutil.which(codec.cmd[0]) is None:
+        logger.warning("%s not found; uploading speech as WAV instead of %s", codec.cmd[0], name)
+        return None
+    return codec
+
+
+async def encode_stream(codec: UploadCodec, pcm: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Encode 16 kHz mono PCM as it arrives, through the codec's encoder."""
+    if codec.cmd is None:
+        raise ValueError(f"{codec.name} has no encoder to stream through")
+
+    process = await asyncio.create_subprocess_exec(
+        *codec.cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    assert process.stdin is not None and process.stdout is not None
+
+    async def feed() -> None:
+        try:
+            async for chunk in pcm:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        finally:
+            process.stdin.close()
+
+    feeder = asyncio.create_task(feed())
+    try:
+        while chunk := await process.stdout.read(ENCODER_READ_BYTES):
+            yield chunk
+        await feeder
+        if await process.wait() != 0:
+            stderr = await process.stderr.read() if process.stderr else b""
+            raise RuntimeError(
+                f"{codec.cmd[0]} exited with code {process.returncode}: "
+                f"{stderr.decode(errors='ignore').strip()}"
+            )
+    finally:
+        if not feeder.done():
+            feeder.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await feeder
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
@@ -4,17 +4,18 @@ Helpers for rendering text and emoji on the Whisplay LCD.
 
 from __future__ import annotations
 
-import unicodedata
-from functools import lru_cache
-from io import BytesIO
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Optional
 
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
-import cairosvg
+from PIL import Image, ImageDraw
 
-from .config import EMOJI_DIR
+from .emoji_atlas import get_emoji_atlas, is_emoji
+from .glyph_atlas import GlyphAtlas, rgb_to_rgb565
+from .render_cache import BoundedCache, CacheStats
 
 
 class ColorUtils:
@@ -54,77 +55,166 @@ class ColorUtils:
 
 class ImageUtils:
     @staticmethod
-    def image_to_rgb565(image: Image.Image, width: int, height: int) -> list[int]:
+    def letterbox(image: Image.Image, width: int, height: int) -> Image.Image:
         image = image.convert("RGB")
+        if image.size == (width, height):
+            return image
         image.thumbnail((width, height), Image.LANCZOS)
         bg = Image.new("RGB", (width, height), (0, 0, 0))
         x = (width - image.width) // 2
         y = (height - image.height) // 2
         bg.paste(image, (x, y))
+        return bg
 
-        np_img = np.array(bg)
-        r = (np_img[:, :, 0] >> 3).astype(np.uint16)
-        g = (np_img[:, :, 1] >> 2).astype(np.uint16)
-        b = (np_img[:, :, 2] >> 3).astype(np.uint16)
+    @staticmethod
+    def image_to_rgb565_array(image: Image.Image) -> np.ndarray:
+        return rgb_to_rgb565(np.asarray(image.convert("RGB")))
 
-        rgb565 = (r << 11) | (g << 5) | b
-        high_byte = (rgb565 >> 8).astype(np.uint8)
-        low_byte = (rgb565 & 0xFF).astype(np.uint8)
-        interleaved = np.dstack((high_byte, low_byte)).flatten().tolist()
-        return interleaved
+    @staticmethod
+    def rgb565_array_to_pixel_data(array: np.ndarray) -> memoryview:
+        """
+        Expose an RGB565 array as the big-endian byte stream the panel expects.
 
+        At most one C-level copy is made (byte swap / packing a sub-rectangle); the
+        result is handed to the SPI driver as a buffer, never as a Python list.
+        """
+
+        packed = np.ascontiguousarray(array, dtype=">u2")
+        return memoryview(packed.view(np.uint8).reshape(-1))
 
-class EmojiUtils:
     @staticmethod
-    @lru_cache(maxsize=512)
-    def emoji_to_filename(char: str) -> Path:
-        return EMOJI_DIR / ("-".join(f"{ord(c):x}" for c in char) + ".svg")
+    def rgb565_array_to_rgb444_pixel_data(array: np.ndarray) -> memoryview:
+        """
+        Pack an RGB565 array as 12-bit RGB444, two pixels in three bytes.
+
+        This is the stream the panel expects after COLMOD 0x03; the pixel count
+        must be even since the last byte would otherwise be half empty.
+        """
+
+        pixels = np.ascontiguousarray(array, dtype=np.uint16).reshape(-1)
+        if pixels.size % 2:
+            raise ValueError("RGB444 packing needs an even number of pixels")
+        rgb444 = ((pixels >> 4) & 0xF00) | ((pixels >> 3) & 0x0F0) | ((pixels >> 1) & 0x00F)
+        first, second = rgb444[0::2], rgb444[1::2]
+        packed = np.empty((pixels.size // 2, 3), dtype=np.uint8)
+        packed[:, 0] = first >> 4
+        packed[:, 1] = ((first & 0xF) << 4) | (second >> 8)
+        packed[:, 2] = second & 0xFF
+        return memoryview(packed.reshape(-1))
 
     @staticmethod
-    def get_local_emoji_svg_image(char: str, size: int) -> Image.Image | None:
-        if not EMOJI_DIR.exists():
-            return None
-        path = EmojiUtils.emoji_to_filename(char)
-        if not path.exists():
-            return None
-        try:
-            png_bytes = cairosvg.svg2png(url=str(path), output_width=size, output_height=size)
-            return Image.open(BytesIO(png_bytes)).convert("RGBA")
-        except Exception:
+    def rgb444_pixel_data_to_rgb565_array(data: bytes | bytearray | memoryview) -> np.ndarray:
+        """Unpack RGB444 pixel data into RGB565, widening channels like the panel does."""
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.uint16)
+        rgb444 = np.empty(packed.shape[0] * 2, dtype=np.uint16)
+        rgb444[0::2] = (packed[:, 0] << 4) | (packed[:, 1] >> 4)
+        rgb444[1::2] = ((packed[:, 1] & 0xF) << 8) | packed[:, 2]
+        r, g, b = rgb444 >> 8, (rgb444 >> 4) & 0xF, rgb444 & 0xF
+        return ((r << 1 | r >> 3) << 11) | ((g << 2 | g >> 2) << 5) | (b << 1 | b >> 3)
+
+
+class EmojiUtils:
+    @staticmethod
+    def get_emoji_image(char: str, size: int) -> Image.Image | None:
+        """Emoji glyph from the prebuilt atlas (see `emoji_atlas`), or None if unavailable."""
+        atlas = get_emoji_atlas()
+        if atlas is None:
             return None
+        return atlas.image(char, size)
 
     @staticmethod
     def is_emoji(char: str) -> bool:
-        return unicodedata.category(char) in {"So", "Sk"} or ord(char) > 0x1F000
+        return is_emoji(char)
+
+
+@dataclass(frozen=True, slots=True)
+class TextLayout:
+    """Line breaks and metrics for one piece of text at a given font and width."""
+
+    text: str
+    max_width: int
+    line_height: int
+    lines: tuple[str, ...]
+    line_widths: tuple[int, ...]
+    # Offset of each line's first character in `text`.
+    line_starts: tuple[int, ...] = ()
+
+    @property
+    def total_height(self) -> int:
+        return len(self.lines) * self.line_height
+
+    @property
+    def nbytes(self) -> int:
+        # Text is stored twice (whole and split into lines) plus two ints per line.
+        return 2 * len(self.text.encode()) + 96 * len(self.lines) + 128
+
+
+@dataclass(frozen=True, slots=True)
+class TextStrip:
+    """
+    A whole layout pre-rendered as one tall RGB565 image.
 
+    `pixels` holds `loop_height` rows of content followed by a copy of the first
+    `viewport_height` rows, so the viewport at any offset is a contiguous slice
+    (a view, not a copy) even when it wraps past the end of the text.
+    """
 
-@lru_cache(maxsize=2048)
-def _get_char_size(font_hash: Tuple[str, int], char: str) -> tuple[int, int]:
-    font = ImageFont.truetype(font_hash[0], font_hash[1])
-    if EmojiUtils.is_emoji(char):
-        emoji_img = EmojiUtils.get_local_emoji_svg_image(char, size=font.size)
-        if emoji_img:
-            return emoji_img.width, emoji_img.height
-    bbox = font.getbbox(char)
-    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+    layout: TextLayout
+    pixels: np.ndarray
+    loop_height: int
+    viewport_height: int
+    # Only single-colour text, no emoji: safe to send at reduced colour depth.
+    monochrome: bool = True
+
+    def viewport(self, offset: int) -> np.ndarray:
+        offset %= self.loop_height
+        return self.pixels[offset : offset + self.viewport_height]
 
 
 class TextUtils:
-    def __init__(self, font_path: str | Path, font_size: int):
+    """
+    Text measurement, wrapping and rendering for one font and size.
+
+    Every cache is owned by the instance and bounded in bytes, so memory use is
+    fixed per font however long the device runs; see `cache_stats()`.
+    """
+
+    LAYOUT_CACHE_SIZE = 32
+
+    def __init__(
+        self,
+        font_path: str | Path,
+        font_size: int,
+        *,
+        glyph_cache_bytes: int = 256 * 1024,
+        line_cache_bytes: int = 512 * 1024,
+        layout_cache_bytes: int = 64 * 1024,
+    ):
         self.font_path = Path(font_path)
         self.font_size = font_size
-        self.font = ImageFont.truetype(str(self.font_path), font_size)
+        self.glyphs = GlyphAtlas(self.font_path, font_size, cache_bytes=glyph_cache_bytes)
+        self.font = self.glyphs.font
+        self._line_images: BoundedCache[str, Image.Image] = BoundedCache(line_cache_bytes)
+        self._layouts: BoundedCache[tuple[str, int], TextLayout] = BoundedCache(
+            layout_cache_bytes,
+            max_entries=self.LAYOUT_CACHE_SIZE,
+            sizeof=lambda layout: layout.nbytes,
+        )
+        self._last_layout: Optional[TextLayout] = None
 
     def get_char_size(self, char: str) -> tuple[int, int]:
-        return _get_char_size((str(self.font_path), self.font_size), char)
+        return self.glyphs.char_size(char)
 
     def draw_mixed_text(self, draw: ImageDraw.ImageDraw, image: Image.Image, text: str, start_xy):
         x, y = start_xy
         line_image = self.get_line_image(text)
         image.paste(line_image, (x, y), line_image)
 
-    @lru_cache(maxsize=1024)
     def get_line_image(self, text: str) -> Image.Image:
+        """PIL rendering of one line; `render_strip` composes from the glyph atlas instead."""
+        return self._line_images.get_or_create(text, lambda: self._draw_line_image(text))
+
+    def _draw_line_image(self, text: str) -> Image.Image:
         ascent, descent = self.font.getmetrics()
         baseline = ascent
         line_height = ascent + descent
@@ -134,7 +224,7 @@ class TextUtils:
         cursor_x = 0
         for char in text:
             if EmojiUtils.is_emoji(char):
-                emoji_img = EmojiUtils.get_local_emoji_svg_image(char, size=self.font.size)
+                emoji_img = EmojiUtils.get_emoji_image(char, size=self.font.size)
                 if emoji_img:
                     emoji_y = baseline - emoji_img.height
                     img.paste(emoji_img, (cursor_x, emoji_y), emoji_img)
@@ -144,25 +234,120 @@ class TextUtils:
             cursor_x += self.get_char_size(char)[0]
         return img
 
-    def wrap_text(self, text: str, max_width: int) -> list[str]:
+    def layout_text(self, text: str, max_width: int) -> TextLayout:
+        key = (text, max_width)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            return layout
+
         lines: list[str] = []
-        current_line = ""
-        current_width = 0
+        widths: list[int] = []
+        starts: list[int] = []
+        resume = 0
+        previous = self._last_layout
+        if (
+            previous is not None
+            and previous.max_width == max_width
+            and previous.line_starts
+            and text.startswith(previous.text)
+        ):
+            # Appending text (a streamed reply) can only change the last line, so
+            # keep the others and re-break from where that line starts.
+            lines.extend(previous.lines[:-1])
+            widths.extend(previous.line_widths[:-1])
+            starts.extend(previous.line_starts[:-1])
+            resume = previous.line_starts[-1]
 
-        for char in text:
-            char_width = self.get_char_size(char)[0]
-            if current_width + char_width <= max_width:
-                current_line += char
-                current_width += char_width
+        offset = resume
+        for paragraph in text[resume:].split("\n"):
+            self._break_paragraph(paragraph, offset, max_width, lines, widths, starts)
+            offset += len(paragraph) + 1
+
+        layout = TextLayout(
+            text=text,
+            max_width=max_width,
+            line_height=self.get_line_height(),
+            lines=tuple(lines),
+            line_widths=tuple(widths),
+            line_starts=tuple(starts),
+        )
+        self._layouts.put(key, layout)
+        self._last_layout = layout
+        return layout
+
+    def _break_paragraph(
+        self,
+        paragraph: str,
+        offset: int,
+        max_width: int,
+        lines: list[str],
+        widths: list[int],
+        starts: list[int],
+    ) -> None:
+        if not paragraph:
+            lines.append("")
+            widths.append(0)
+            starts.append(offset)
+            return
+
+        # prefix[i] is the pen position before paragraph[i]; a run [a, b) is
+        # prefix[b] - prefix[a] wide, so each break is a bisect instead of a scan.
+        prefix = list(accumulate((self.get_char_size(ch)[0] for ch in paragraph), initial=0))
+        length = len(paragraph)
+        start = 0
+        while start < length:
+            end = bisect_right(prefix, prefix[start] + max_width) - 1
+            if end >= length:
+                line_end = next_start = length
             else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = char
-                current_width = char_width
-        if current_line:
-            lines.append(current_line)
-        return lines
+                space = paragraph.rfind(" ", start, end + 1)
+                if space > start:
+                    line_end, next_start = space, space + 1
+                else:
+                    # A single word wider than the line: split it where it overflows.
+                    line_end = next_start = max(end, start + 1)
+
+            while line_end > start and paragraph[line_end - 1] == " ":
+                line_end -= 1
+            lines.append(paragraph[start:line_end])
+            widths.append(prefix[line_end] - prefix[start])
+            starts.append(offset + start)
+
+            start = next_start
+            while start < length and paragraph[start] == " ":
+                start += 1
+
+    def wrap_text(self, text: str, max_width: int) -> list[str]:
+        return list(self.layout_text(text, max_width).lines)
+
+    def render_strip(
+        self, layout: TextLayout, width: int, viewport_height: int, margin_x: int = 12
+    ) -> TextStrip:
+        loop_height = max(layout.total_height, viewport_height, 1)
+        content = self.glyphs.compose(
+            (
+                (line, margin_x, index * layout.line_height)
+                for index, line in enumerate(layout.lines)
+                if line
+            ),
+            width,
+            loop_height,
+        )
+        pixels = np.concatenate((content, content[:viewport_height]))
+        return TextStrip(
+            layout=layout,
+            pixels=pixels,
+            loop_height=loop_height,
+            viewport_height=viewport_height,
+            monochrome=not any(is_emoji(char) for char in layout.text),
+        )
 
     def get_line_height(self) -> int:
-        ascent, descent = self.font.getmetrics()
-        return ascent + descent
+        return self.glyphs.line_height
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        return {
+            "glyphs": self.glyphs.cache_stats(),
+            "lines": self._line_images.stats(),
+            "layouts": self._layouts.stats(),
+        }